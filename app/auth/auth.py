@@ -1,8 +1,9 @@
 """Модуль для аутентификации и работы с JWT токенами."""
 
 # Стандартные библиотеки
+from contextvars import ContextVar
 from datetime import datetime, timedelta, timezone
-from typing import Annotated
+from typing import Annotated, Optional, Union
 
 # Сторонние библиотеки
 from fastapi import Depends, HTTPException, status
@@ -24,6 +25,12 @@ oauth2_scheme = OAuth2PasswordBearer(
     scheme_name="JWT"
 )
 
+# Результат единственной проверки токена для подзапросов POST /batch:
+# пользователь или ошибка аутентификации (см. app.core.batch).
+resolved_user: ContextVar[Optional[Union[User, HTTPException]]] = ContextVar(
+    "resolved_user", default=None
+)
+
 
 def get_password_hash(password: str) -> str:
     """Генерирует хеш пароля.
@@ -95,6 +102,12 @@ def get_current_user(
     Raises:
         HTTPException: Если токен невалидный или пользователь не найден
     """
+    resolved = resolved_user.get()
+    if isinstance(resolved, HTTPException):
+        raise resolved
+    if resolved is not None:
+        return resolved
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -10,6 +10,57 @@ class Settings(BaseSettings):
     algo: str = "HS256"
     access_token_expire_minutes: int = 30
     database_url: str = "sqlite:///./test.db"
+    status_scheduler_enabled: bool = True
+    status_scheduler_batch_size: int = 500
+    status_scheduler_max_sleep_seconds: int = 3600
+    composer_match_threshold: float = 0.45
+    event_history_size: int = 1000
+    event_queue_size: int = 100
+    event_heartbeat_seconds: float = 15.0
+    outbox_batch_size: int = 100
+    outbox_poll_seconds: int = 30
+    rate_limit_enabled: bool = True
+    rate_limit_max_keys: int = 10000
+    rate_limit_trust_forwarded: bool = False
+    rate_limit_burst_seconds: float = 60.0
+    rate_limit_auth_per_minute: int = 20
+    rate_limit_search_per_minute: int = 120
+    rate_limit_write_per_minute: int = 60
+    rate_limit_read_per_minute: int = 600
+    max_concurrent_requests: int = 64
+    queue_budget_ms: int = 500
+    idempotency_ttl_seconds: int = 86400
+    idempotency_lock_seconds: int = 60
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_zstd_level: int = 3
+    cache_sync_interval_seconds: float = 1.0
+    cache_changes_retention_seconds: int = 3600
+    coalesce_timeout_seconds: float = 5.0
+    profiling_token: str = ""
+    profiling_sample_rate: float = 0.0
+    profiling_interval_ms: int = 5
+    profiling_keep: int = 20
+    loop_monitor_enabled: bool = True
+    loop_lag_threshold_ms: int = 250
+    archive_enabled: bool = True
+    archive_after_days: int = 365
+    archive_batch_size: int = 500
+    archive_interval_seconds: int = 86400
+    similar_concerts_top_k: int = 50
+    similar_composer_weight: float = 2.0
+    similar_instrument_weight: float = 1.0
+    similar_refresh_seconds: int = 60
+    popularity_shards: int = 16
+    popularity_flush_seconds: int = 10
+    popularity_flush_max_keys: int = 10000
+    popularity_half_life_hours: float = 72.0
+    calendar_event_minutes: int = 120
+    calendar_feed_batch_size: int = 200
+    calendar_feed_cache_size: int = 256
+    nearby_max_radius_km: float = 50.0
+    batch_max_concurrency: int = 4
 
 
 
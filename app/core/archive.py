@@ -0,0 +1,256 @@
+"""Архив завершённых и отменённых концертов прошлых сезонов.
+
+Концерты со статусом completed или cancelled, прошедшие больше
+archive_after_days дней назад, переносятся вместе со связями в таблицы
+concerts_archive, concert_composers_archive и concert_instruments_archive
+пачками по archive_batch_size. Каждая пачка переносится одной транзакцией:
+INSERT ... SELECT в архив, DELETE из горячих таблиц (закладки и
+уведомления о прошедших концертах удаляются) и пересборка модели чтения (строки
+удаляются, счётчики уменьшаются), поэтому горячие таблицы, модель чтения
+и живые счётчики описывают только неархивные концерты. Вклад концертов в
+статистику организации переносится в архивные счётчики
+(counters.archived_deltas).
+
+Чтения обращаются к архиву, только если запрошен диапазон дат, который
+начинается не позже самого позднего архивного концерта, а чтение по ID -
+только если концерта нет в горячей таблице.
+
+Ручной запуск переноса:
+    python -m app.core.archive
+"""
+
+# Стандартные библиотеки
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+# Сторонние библиотеки
+from sqlalchemy import DateTime, delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+# Локальные модули
+from app.config import settings
+from app.core import cache, counters
+from app.core.background import BackgroundWorker
+from app.core.read_model import delete_bookmarks, sync_concerts
+from app.models.models import (ArchivedConcert, ArchivedConcertComposer,
+                               ArchivedConcertInstrument, Composer, Concert,
+                               ConcertComposer, ConcertInstrument, ConcertReadModel,
+                               ConcertStatus, Instrument, Notification)
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_STATUSES = (ConcertStatus.COMPLETED.value, ConcertStatus.CANCELLED.value)
+
+_LINKS = (
+    (ConcertComposer, ArchivedConcertComposer, "composer_id"),
+    (ConcertInstrument, ArchivedConcertInstrument, "instrument_id"),
+)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def archive_old_concerts(
+        db: Session,
+        now: Optional[datetime] = None,
+        batch_size: Optional[int] = None
+) -> int:
+    """Переносит старые завершённые и отменённые концерты в архив.
+
+    INSERT OR IGNORE и DELETE по списку ID делают перенос идемпотентным,
+    поэтому его можно одновременно запускать в нескольких воркерах.
+
+    Args:
+        db (Session): Сессия базы данных
+        now (datetime | None): Текущее время
+        batch_size (int | None): Размер пачки
+
+    Returns:
+        int: Количество перенесённых концертов
+    """
+    now = now or datetime.now(timezone.utc)
+    batch_size = batch_size or settings.archive_batch_size
+    cutoff = now - timedelta(days=settings.archive_after_days)
+    concert_columns = [column.name for column in Concert.__table__.columns]
+    total = 0
+
+    while True:
+        batch_ids = db.scalars(
+            select(Concert.id)
+            .where(Concert.current_status.in_(ARCHIVED_STATUSES), Concert.date < cutoff)
+            .order_by(Concert.id)
+            .limit(batch_size)
+        ).all()
+        if not batch_ids:
+            break
+
+        connection = db.connection()
+        connection.execute(
+            insert(ArchivedConcert).prefix_with("OR IGNORE").from_select(
+                concert_columns + ["archived_at"],
+                select(*Concert.__table__.columns,
+                       literal(now, DateTime).label("archived_at"))
+                .where(Concert.id.in_(batch_ids))
+            )
+        )
+        for model, archive_model, column in _LINKS:
+            connection.execute(
+                insert(archive_model).prefix_with("OR IGNORE").from_select(
+                    ["concert_id", column],
+                    select(model.concert_id, getattr(model, column))
+                    .where(model.concert_id.in_(batch_ids))
+                )
+            )
+            connection.execute(delete(model).where(model.concert_id.in_(batch_ids)))
+        connection.execute(delete(Notification).where(Notification.concert_id.in_(batch_ids)))
+        delete_bookmarks(connection, batch_ids)
+        moved = connection.execute(
+            delete(Concert)
+            .where(Concert.id.in_(batch_ids), Concert.current_status.in_(ARCHIVED_STATUSES))
+            .returning(Concert.id)
+        ).scalars().all()
+        # Статистика организаций не должна меняться от архивирования.
+        counters.apply_deltas(connection, counters.archived_deltas(connection.execute(
+            select(ConcertReadModel.organization_id, ConcertReadModel.current_status,
+                   ConcertReadModel.date, ConcertReadModel.composer_ids)
+            .where(ConcertReadModel.id.in_(moved))
+        ).mappings().all()))
+        sync_concerts(connection, moved)
+        db.commit()
+        total += len(moved)
+        if len(batch_ids) < batch_size:
+            break
+
+    if total:
+        db.expire_all()
+        cache.invalidate("concerts")
+        logger.info("Перенесено в архив концертов: %s", total)
+    return total
+
+
+def archive_horizon(db: Session) -> Optional[datetime]:
+    """Возвращает дату самого позднего архивного концерта (в UTC)."""
+    horizon = db.scalar(select(func.max(ArchivedConcert.date)))
+    return _as_utc(horizon) if horizon is not None else None
+
+
+def covers(db: Session, date_from: Optional[datetime]) -> bool:
+    """Проверяет, попадает ли диапазон дат, начинающийся с date_from, в архив.
+
+    Args:
+        db (Session): Сессия базы данных
+        date_from (datetime | None): Начало диапазона; None - без диапазона
+
+    Returns:
+        bool: True, если архив нужно читать
+    """
+    if date_from is None:
+        return False
+    horizon = archive_horizon(db)
+    return horizon is not None and _as_utc(date_from) <= horizon
+
+
+def archived_query(
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        status: Optional[str] = None
+) -> Select:
+    """Строит запрос к архиву по диапазону дат и статусу по возрастанию ID."""
+    query = select(ArchivedConcert.__table__)
+    if date_from is not None:
+        query = query.where(ArchivedConcert.date >= date_from)
+    if date_to is not None:
+        query = query.where(ArchivedConcert.date <= date_to)
+    if status is not None:
+        query = query.where(ArchivedConcert.current_status == status)
+    return query.order_by(ArchivedConcert.id)
+
+
+def count_archived(db: Session, query: Select) -> int:
+    """Возвращает количество архивных концертов по запросу archived_query."""
+    return db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+
+
+def load_archived(db: Session, query: Select) -> List[dict]:
+    """Загружает архивные концерты в формате ConcertRead.
+
+    Композиторы и инструменты загружаются двумя запросами на всю страницу.
+
+    Args:
+        db (Session): Сессия базы данных
+        query (Select): Запрос archived_query (с limit при необходимости)
+
+    Returns:
+        List[dict]: Концерты в порядке запроса
+    """
+    rows = db.execute(query).mappings().all()
+    ids = [row["id"] for row in rows]
+    if not ids:
+        return []
+
+    composers = defaultdict(list)
+    for row in db.execute(
+        select(ArchivedConcertComposer.concert_id, Composer.id, Composer.name,
+               Composer.birth_year, Composer.death_year)
+        .join(Composer, Composer.id == ArchivedConcertComposer.composer_id)
+        .where(ArchivedConcertComposer.concert_id.in_(ids))
+        .order_by(Composer.id)
+    ):
+        composers[row.concert_id].append({
+            "id": row.id,
+            "name": row.name,
+            "birth_year": row.birth_year,
+            "death_year": row.death_year
+        })
+
+    instruments = defaultdict(list)
+    for row in db.execute(
+        select(ArchivedConcertInstrument.concert_id, Instrument.id, Instrument.name)
+        .join(Instrument, Instrument.id == ArchivedConcertInstrument.instrument_id)
+        .where(ArchivedConcertInstrument.concert_id.in_(ids))
+        .order_by(Instrument.id)
+    ):
+        instruments[row.concert_id].append({"id": row.id, "name": row.name})
+
+    concerts = []
+    for row in rows:
+        concert = {key: value for key, value in row.items() if key != "archived_at"}
+        concert["composers"] = composers[row["id"]]
+        concert["instruments"] = instruments[row["id"]]
+        concerts.append(concert)
+    return concerts
+
+
+def get_archived(db: Session, concert_id: int) -> Optional[dict]:
+    """Возвращает архивный концерт по ID в формате ConcertRead или None."""
+    rows = load_archived(db, select(ArchivedConcert.__table__)
+                         .where(ArchivedConcert.id == concert_id))
+    return rows[0] if rows else None
+
+
+class ConcertArchiver(BackgroundWorker):
+    """Фоновая задача, раз в archive_interval_seconds переносящая концерты в архив."""
+
+    name = "concert-archiver"
+
+    def run_once(self, db: Session) -> Optional[float]:
+        archive_old_concerts(db)
+        return None
+
+
+concert_archiver = ConcertArchiver(max_sleep=settings.archive_interval_seconds)
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal, init_database
+
+    init_database()
+    session = SessionLocal()
+    try:
+        print(f"Перенесено в архив концертов: {archive_old_concerts(session)}")
+    finally:
+        session.close()
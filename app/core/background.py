@@ -0,0 +1,101 @@
+"""Базовый класс фоновых asyncio-задач приложения."""
+
+# Стандартные библиотеки
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+# Сторонние библиотеки
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+# Локальные модули
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundWorker(ABC):
+    """Задача, которая выполняет run_once() и спит до следующего запуска.
+
+    run_once() выполняется в потоке пула с собственной сессией и возвращает
+    паузу до следующего запуска в секундах (не больше max_sleep). notify()
+    будит задачу досрочно и безопасно вызывается из синхронных роутеров.
+    """
+
+    name = "background-worker"
+
+    def __init__(
+            self,
+            max_sleep: float,
+            session_factory: Callable[[], Session] = SessionLocal
+    ):
+        self._session_factory = session_factory
+        self._max_sleep = max_sleep
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @abstractmethod
+    def run_once(self, db: Session) -> Optional[float]:
+        """Выполняет одну итерацию работы.
+
+        Args:
+            db (Session): Сессия базы данных
+
+        Returns:
+            float | None: Пауза до следующего запуска; None означает max_sleep
+        """
+
+    def start(self) -> None:
+        """Запускает фоновую задачу в текущем цикле событий."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def notify(self) -> None:
+        """Будит задачу; безопасно вызывать из потоков пула."""
+        if self._loop is None or self._wakeup is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _tick(self) -> Optional[float]:
+        db = self._session_factory()
+        try:
+            return self.run_once(db)
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            delay = self._max_sleep
+            try:
+                next_delay = await asyncio.to_thread(self._tick)
+                if next_delay is not None:
+                    delay = min(max(next_delay, 0.0), self._max_sleep)
+            except OperationalError:
+                logger.warning("%s: база данных занята, повтор через минуту",
+                               self.name, exc_info=True)
+                delay = min(60.0, self._max_sleep)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("%s: ошибка фоновой задачи", self.name)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,182 @@
+"""Выполнение пакета подзапросов (POST /batch) внутри процесса.
+
+Подзапросы передаются маршрутизатору приложения как обычные ASGI-запросы,
+минуя middleware: сжатие и профилирование применяются к пакету целиком.
+Лимит частоты проверяется для каждого подзапроса по его классу маршрута
+(app.core.ratelimit.charge), поэтому пакет не обходит лимиты записи и
+входа; подзапрос сверх лимита получает 429. Заголовок Authorization
+пакета передаётся каждому подзапросу, а результат единственной проверки
+токена подставляется в get_current_user (app.auth.auth.resolved_user).
+
+Подзапросы выполняются по порядку в общей сессии пакета
+(app.database.shared_session). Подряд идущие чтения (GET, HEAD) не
+зависят друг от друга и выполняются одновременно, не больше
+batch_max_concurrency сразу; изменяющий запрос ждёт завершения
+предыдущих и сам задерживает следующие. Сессия SQLAlchemy не
+потокобезопасна, поэтому одновременные чтения получают собственные
+сессии из пула; одиночное чтение использует общую сессию.
+"""
+
+# Стандартные библиотеки
+import asyncio
+import json
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import unquote
+
+# Сторонние библиотеки
+from sqlalchemy.orm import Session
+
+# Локальные модули
+from app.config import settings
+from app.core import ratelimit
+from app.core.metrics import metrics
+from app.database import shared_session
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = ("GET", "HEAD")
+# Вложенные пакеты и бесконечные потоки событий в пакете не выполняются.
+_FORBIDDEN_PREFIXES = ("/batch", "/concerts/stream")
+_FORWARDED_HEADERS = (b"authorization", b"accept-language", b"user-agent")
+_SCOPE_KEYS = ("asgi", "http_version", "scheme", "server", "client", "root_path", "app",
+               "starlette.exception_handlers")
+
+
+@dataclass(frozen=True)
+class SubRequest:
+    """Подзапрос пакета."""
+
+    id: Optional[str]
+    method: str
+    path: str
+    body: Any = None
+
+
+def _result(item: SubRequest, status_code: int, headers: Dict[str, str], body: Any) -> dict:
+    return {"id": item.id, "status": status_code, "headers": headers, "body": body}
+
+
+def _scope(outer: dict, item: SubRequest, body: bytes) -> dict:
+    path, _, query = item.path.partition("?")
+    headers = [(key, value) for key, value in outer.get("headers", ())
+               if key in _FORWARDED_HEADERS]
+    if item.body is not None:
+        headers += [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode())]
+    scope = {key: outer[key] for key in _SCOPE_KEYS if key in outer}
+    scope.update({
+        "type": "http",
+        "method": item.method,
+        "path": unquote(path),
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+        "state": {},
+    })
+    return scope
+
+
+def _decode(headers: Dict[str, str], body: bytes) -> Any:
+    if not body:
+        return None
+    if headers.get("content-type", "").startswith("application/json"):
+        return json.loads(body)
+    return body.decode("utf-8", errors="replace")
+
+
+async def run_one(app, outer: dict, item: SubRequest) -> dict:
+    """Выполняет один подзапрос и собирает ответ.
+
+    Args:
+        app: ASGI-приложение (маршрутизатор)
+        outer (dict): ASGI scope пакетного запроса
+        item (SubRequest): Подзапрос
+
+    Returns:
+        dict: id, status, headers и body подзапроса
+    """
+    if item.path.startswith(_FORBIDDEN_PREFIXES):
+        return _result(item, 400, {}, {"detail": "Этот путь недоступен в пакетном запросе"})
+    if settings.rate_limit_enabled:
+        retry_after = ratelimit.charge(outer, ratelimit.route_class(item.method, item.path))
+        if retry_after:
+            return _result(item, 429, {"retry-after": str(max(1, math.ceil(retry_after)))},
+                           {"detail": "Слишком много запросов, повторите позже"})
+
+    body = json.dumps(item.body).encode() if item.body is not None else b""
+    request_sent = False
+    status_code, headers, chunks = 500, {}, []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Клиент подзапроса не отключается: ждём, пока ответ не будет отправлен.
+        await asyncio.Future()
+
+    async def send(message):
+        nonlocal status_code, headers
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            headers = {key.decode("latin-1"): value.decode("latin-1")
+                       for key, value in message.get("headers", ())}
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await app(_scope(outer, item, body), receive, send)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception("Ошибка подзапроса %s %s", item.method, item.path)
+        session = shared_session.get()
+        if session is not None:
+            session.rollback()
+        return _result(item, 500, {}, {"detail": "Internal Server Error"})
+    headers.pop("content-length", None)
+    return _result(item, status_code, headers, _decode(headers, b"".join(chunks)))
+
+
+async def run_batch(app, outer: dict, items: Sequence[SubRequest],
+                    session: Session, concurrent_reads: bool = True) -> List[dict]:
+    """Выполняет подзапросы пакета.
+
+    Args:
+        app: ASGI-приложение (маршрутизатор)
+        outer (dict): ASGI scope пакетного запроса
+        items (Sequence[SubRequest]): Подзапросы в порядке выполнения
+        session (Session): Общая сессия пакета
+        concurrent_reads (bool): Выполнять подряд идущие чтения одновременно
+
+    Returns:
+        List[dict]: Ответы в порядке подзапросов
+    """
+    limiter = asyncio.Semaphore(settings.batch_max_concurrency)
+
+    async def isolated(item: SubRequest) -> dict:
+        # Задача gather работает в копии контекста: сброс не виден другим.
+        shared_session.set(None)
+        async with limiter:
+            return await run_one(app, outer, item)
+
+    results: List[dict] = []
+    token = shared_session.set(session)
+    try:
+        index = 0
+        while index < len(items):
+            end = index + 1
+            if concurrent_reads and items[index].method in READ_METHODS:
+                while end < len(items) and items[end].method in READ_METHODS:
+                    end += 1
+            if end - index > 1:
+                metrics.inc("batch_concurrent_reads_total", end - index)
+                results += await asyncio.gather(*(isolated(item) for item in items[index:end]))
+            else:
+                results.append(await run_one(app, outer, items[index]))
+            index = end
+    finally:
+        shared_session.reset(token)
+    metrics.inc("batch_subrequests_total", len(items))
+    return results
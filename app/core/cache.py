@@ -0,0 +1,110 @@
+"""Модуль внутрипроцессных кэшей с инвалидацией по пространствам имён."""
+
+# Стандартные библиотеки
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Потокобезопасный LRU-кэш с ограниченным временем жизни записей.
+
+    Attributes:
+        name (str): Пространство имён кэша
+        ttl (float): Время жизни записи в секундах
+        maxsize (int): Максимальное количество записей
+    """
+
+    def __init__(self, name: str, ttl: float = 60.0, maxsize: int = 1024):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Возвращает значение по ключу или default, если запись устарела.
+
+        Args:
+            key (Hashable): Ключ записи
+            default (Any): Значение по умолчанию
+
+        Returns:
+            Any: Закэшированное значение
+        """
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Сохраняет значение, вытесняя самые старые записи при переполнении.
+
+        Args:
+            key (Hashable): Ключ записи
+            value (Any): Значение
+            ttl (float | None): Индивидуальное время жизни записи
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Удаляет запись по ключу, если она есть."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очищает кэш полностью."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_caches: Dict[str, TTLCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_cache(name: str, ttl: float = 60.0, maxsize: int = 1024) -> TTLCache:
+    """Возвращает кэш с указанным именем, создавая его при первом обращении.
+
+    Args:
+        name (str): Пространство имён (например, "concerts")
+        ttl (float): Время жизни записей для нового кэша
+        maxsize (int): Размер нового кэша
+
+    Returns:
+        TTLCache: Экземпляр кэша
+    """
+    with _registry_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = TTLCache(name, ttl=ttl, maxsize=maxsize)
+            _caches[name] = cache
+        return cache
+
+
+def invalidate(*names: str) -> None:
+    """Очищает кэши указанных пространств имён.
+
+    Args:
+        *names (str): Имена кэшей; несуществующие игнорируются
+    """
+    with _registry_lock:
+        caches = [_caches[name] for name in names if name in _caches]
+    for cache in caches:
+        cache.clear()
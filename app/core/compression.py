@@ -0,0 +1,223 @@
+"""Сжатие ответов по Accept-Encoding (zstd, если установлен zstandard, и gzip).
+
+CompressionMiddleware - чистое ASGI-middleware:
+
+* Ответ, пришедший одним куском, сжимается целиком, если он больше
+  compression_min_size и имеет сжимаемый Content-Type. Сжатые варианты
+  хранятся в LRU-кэше по хешу исходного тела и кодировке, поэтому горячие
+  страницы (одинаковые тела) сжимаются один раз, а не на каждый запрос.
+* Потоковый ответ сжимается по частям с flush после каждой части, чтобы
+  клиент получал данные без задержки. Server-Sent Events не сжимаются.
+"""
+
+# Стандартные библиотеки
+import gzip
+import hashlib
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+# Локальные модули
+from app.config import settings
+from app.core import cache
+from app.core.metrics import metrics
+
+try:
+    import zstandard
+except ImportError:  # необязательная зависимость
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript",
+                       "application/xml", "text/calendar")
+_NEVER_COMPRESS_TYPES = ("text/event-stream",)
+
+
+def available_encodings() -> List[str]:
+    """Возвращает поддерживаемые кодировки в порядке предпочтения."""
+    return [ZSTD, GZIP] if zstandard is not None else [GZIP]
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Выбирает кодировку по заголовку Accept-Encoding.
+
+    Args:
+        accept_encoding (str | None): Значение заголовка
+
+    Returns:
+        str | None: Выбранная кодировка или None, если сжатие не нужно
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for encoding in available_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Сжимает тело целиком."""
+    if encoding == ZSTD:
+        return zstandard.ZstdCompressor(level=settings.compression_zstd_level).compress(body)
+    return gzip.compress(body, compresslevel=settings.compression_gzip_level, mtime=0)
+
+
+def _gzip_compressobj():
+    return zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+class StreamCompressor:
+    """Потоковый компрессор с flush после каждой части."""
+
+    def __init__(self, encoding: str):
+        if encoding == ZSTD:
+            self._compressor = zstandard.ZstdCompressor(
+                level=settings.compression_zstd_level).compressobj()
+            self._sync_flush = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            self._compressor = _gzip_compressobj()
+            self._sync_flush = zlib.Z_SYNC_FLUSH
+
+    def chunk(self, data: bytes) -> bytes:
+        """Сжимает часть и сбрасывает буфер, чтобы её можно было отправить."""
+        return self._compressor.compress(data) + self._compressor.flush(self._sync_flush)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Сжимает последнюю часть и завершает поток."""
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+compressed_cache = cache.get_cache("compressed", ttl=3600, maxsize=256)
+
+
+def compress_cached(body: bytes, encoding: str) -> bytes:
+    """Сжимает тело, переиспользуя ранее сжатый вариант такого же тела."""
+    key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+    compressed = compressed_cache.get(key)
+    if compressed is None:
+        compressed = compress(body, encoding)
+        compressed_cache.set(key, compressed)
+    else:
+        metrics.inc("compression_cache_hits_total", encoding=encoding)
+    return compressed
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[str]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _compressible(headers: List[Tuple[bytes, bytes]]) -> bool:
+    if _header(headers, b"content-encoding"):
+        return False
+    content_type = (_header(headers, b"content-type") or "").lower()
+    if content_type.startswith(_NEVER_COMPRESS_TYPES):
+        return False
+    return content_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+def _with_encoding(headers, encoding: str, length: Optional[int]) -> list:
+    headers = [(key, value) for key, value in _add_vary(headers)
+               if key.lower() != b"content-length"]
+    headers.append((b"content-encoding", encoding.encode("latin-1")))
+    if length is not None:
+        headers.append((b"content-length", str(length).encode("latin-1")))
+    return headers
+
+
+def _header_values(headers, name: bytes) -> List[str]:
+    return [value.decode("latin-1") for key, value in headers if key.lower() == name]
+
+
+def _add_vary(headers) -> list:
+    vary = _header_values(headers, b"vary")
+    if "Accept-Encoding" in vary:
+        return list(headers)
+    headers = [(key, value) for key, value in headers if key.lower() != b"vary"]
+    headers.append((b"vary", ", ".join(vary + ["Accept-Encoding"]).encode("latin-1")))
+    return headers
+
+
+class CompressionMiddleware:
+    """ASGI-middleware сжатия ответов."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD" or not settings.compression_enabled:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(_header(scope.get("headers", []), b"accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(send, encoding))
+
+
+class _CompressingSend:
+    """Обёртка send, решающая о сжатии по первой части тела."""
+
+    def __init__(self, send, encoding: str):
+        self._send = send
+        self._encoding = encoding
+        self._start: Optional[dict] = None
+        self._stream: Optional[StreamCompressor] = None
+        self._passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._start is not None:
+            start, self._start = self._start, None
+            headers = list(start.get("headers", []))
+            if not _compressible(headers):
+                self._passthrough = True
+            elif not more_body:
+                await self._send_whole(start, headers, body)
+                return
+            else:
+                self._stream = StreamCompressor(self._encoding)
+                await self._send({**start, "headers": _with_encoding(headers, self._encoding, None)})
+            if self._passthrough:
+                await self._send(start)
+
+        if self._stream is None:
+            await self._send(message)
+            return
+        data = self._stream.chunk(body) if more_body else self._stream.finish(body)
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _send_whole(self, start: dict, headers: list, body: bytes) -> None:
+        if len(body) < settings.compression_min_size:
+            await self._send({**start, "headers": _add_vary(headers)})
+            await self._send({"type": "http.response.body", "body": body})
+            return
+        compressed = compress_cached(body, self._encoding)
+        metrics.inc("compression_bytes_in_total", len(body), encoding=self._encoding)
+        metrics.inc("compression_bytes_out_total", len(compressed), encoding=self._encoding)
+        await self._send({**start, "headers": _with_encoding(headers, self._encoding, len(compressed))})
+        await self._send({"type": "http.response.body", "body": compressed})
@@ -0,0 +1,240 @@
+"""Инкрементальные счётчики концертов.
+
+Модель чтения при пересборке строки вычитает вклад старой версии концерта
+и добавляет вклад новой, поэтому счётчики остаются точными для любых
+путей записи без полной агрегации.
+
+Счётчики ведутся в области организации и в общей области GLOBAL_SCOPE;
+в общей области также хранятся размеры справочников композиторов и
+инструментов (метрика CATALOG), из которых берутся X-Total-Count списков.
+
+Закладки учитываются в области пользователя (метрика BOOKMARKS по статусу
+концерта) и в общей области (метрика BOOKMARKED по ID концерта). При смене
+статуса концерта модель чтения переносит вклад его закладок между
+статусами (bookmark_status_deltas).
+
+Архивирование удаляет концерты из модели чтения и из живых счётчиков
+(по ним считается X-Total-Count горячих списков), но статистика
+организации описывает всю её историю. Поэтому вклад архивируемых
+концертов в STATUS и COMPOSER организации переносится в метрики
+ARCHIVED_STATUS и ARCHIVED_COMPOSER (archived_deltas), а read_history
+складывает живые и архивные значения.
+"""
+
+# Стандартные библиотеки
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Сторонние библиотеки
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+# Локальные модули
+from app.models.models import Bookmark, ConcertCounter, ConcertStatus
+
+CounterKey = Tuple[str, str, str]
+
+STATUS = "status"
+UPCOMING_MONTH = "upcoming_month"
+COMPOSER = "composer"
+CATALOG = "catalog"
+BOOKMARKS = "bookmarks"
+BOOKMARKED = "bookmarked"
+ARCHIVED_STATUS = "archived_status"
+ARCHIVED_COMPOSER = "archived_composer"
+
+_ARCHIVED_METRICS = {STATUS: ARCHIVED_STATUS, COMPOSER: ARCHIVED_COMPOSER}
+
+GLOBAL_SCOPE = "all"
+COMPOSERS_KEY = "composers"
+INSTRUMENTS_KEY = "instruments"
+
+
+def organization_scope(organization_id: Optional[int]) -> str:
+    """Возвращает область счётчиков организации."""
+    return f"org:{organization_id}"
+
+
+def user_scope(user_id: int) -> str:
+    """Возвращает область счётчиков пользователя."""
+    return f"user:{user_id}"
+
+
+def _parse_ids(encoded: str) -> List[str]:
+    return [item for item in (encoded or "").split(",") if item]
+
+
+def concert_counter_keys(row: Mapping) -> List[CounterKey]:
+    """Возвращает ключи счётчиков, в которые вносит вклад концерт.
+
+    Args:
+        row (Mapping): Строка модели чтения
+
+    Returns:
+        List[CounterKey]: Ключи (область, метрика, значение)
+    """
+    status = row["current_status"]
+    keys = []
+    for scope in (organization_scope(row["organization_id"]), GLOBAL_SCOPE):
+        keys.append((scope, STATUS, status))
+        if status == ConcertStatus.UPCOMING.value:
+            keys.append((scope, UPCOMING_MONTH, f"{row['date']:%Y-%m}"))
+        if status != ConcertStatus.CANCELLED.value:
+            keys.extend((scope, COMPOSER, composer_id)
+                        for composer_id in _parse_ids(row["composer_ids"]))
+    return keys
+
+
+def concert_deltas(old_rows: Iterable[Mapping], new_rows: Iterable[Mapping]) -> Counter:
+    """Вычисляет изменения счётчиков при замене старых строк новыми.
+
+    Args:
+        old_rows (Iterable[Mapping]): Строки модели чтения до изменения
+        new_rows (Iterable[Mapping]): Строки модели чтения после изменения
+
+    Returns:
+        Counter: Ненулевые приращения по ключам
+    """
+    deltas: Counter = Counter()
+    for row in old_rows:
+        for key in concert_counter_keys(row):
+            deltas[key] -= 1
+    for row in new_rows:
+        for key in concert_counter_keys(row):
+            deltas[key] += 1
+    return Counter({key: delta for key, delta in deltas.items() if delta})
+
+
+def archived_deltas(rows: Iterable[Mapping]) -> Counter:
+    """Вычисляет вклад архивируемых концертов в архивные счётчики организаций.
+
+    Args:
+        rows (Iterable[Mapping]): Строки концертов (organization_id,
+            current_status, date, composer_ids)
+
+    Returns:
+        Counter: Приращения метрик ARCHIVED_STATUS и ARCHIVED_COMPOSER
+    """
+    deltas: Counter = Counter()
+    for row in rows:
+        scope = organization_scope(row["organization_id"])
+        for key_scope, metric, key in concert_counter_keys(row):
+            if key_scope == scope and metric in _ARCHIVED_METRICS:
+                deltas[(scope, _ARCHIVED_METRICS[metric], key)] += 1
+    return deltas
+
+
+def bookmark_status_deltas(
+        connection: Connection,
+        old_rows: Iterable[Mapping],
+        new_rows: Iterable[Mapping]
+) -> Counter:
+    """Переносит вклад закладок концертов, у которых сменился статус.
+
+    Args:
+        connection (Connection): Соединение текущей транзакции
+        old_rows (Iterable[Mapping]): Строки модели чтения до изменения (с id)
+        new_rows (Iterable[Mapping]): Строки модели чтения после изменения
+
+    Returns:
+        Counter: Приращения счётчиков закладок пользователей
+    """
+    old_status = {row["id"]: row["current_status"] for row in old_rows}
+    new_status = {row["id"]: row["current_status"] for row in new_rows}
+    changed = [concert_id for concert_id in old_status.keys() | new_status.keys()
+               if old_status.get(concert_id) != new_status.get(concert_id)]
+    deltas: Counter = Counter()
+    if not changed:
+        return deltas
+    for user_id, concert_id in connection.execute(
+        select(Bookmark.user_id, Bookmark.concert_id).where(Bookmark.concert_id.in_(changed))
+    ):
+        if concert_id in old_status:
+            deltas[(user_scope(user_id), BOOKMARKS, old_status[concert_id])] -= 1
+        if concert_id in new_status:
+            deltas[(user_scope(user_id), BOOKMARKS, new_status[concert_id])] += 1
+    return deltas
+
+
+def apply_deltas(connection: Connection, deltas: Mapping[CounterKey, int]) -> None:
+    """Применяет приращения одним UPSERT на ключ в текущей транзакции.
+
+    Args:
+        connection (Connection): Соединение текущей транзакции
+        deltas (Mapping[CounterKey, int]): Приращения счётчиков
+    """
+    if not deltas:
+        return
+    statement = insert(ConcertCounter)
+    statement = statement.on_conflict_do_update(
+        index_elements=[ConcertCounter.scope, ConcertCounter.metric, ConcertCounter.key],
+        set_={"value": ConcertCounter.value + statement.excluded.value}
+    )
+    connection.execute(statement, [
+        {"scope": scope, "metric": metric, "key": key, "value": delta}
+        for (scope, metric, key), delta in deltas.items()
+    ])
+
+
+def read_counters(
+        db: Session,
+        scope: str,
+        metric: str,
+        keys: Optional[Iterable[str]] = None
+) -> Dict[str, int]:
+    """Читает положительные счётчики метрики в области.
+
+    Args:
+        db (Session): Сессия базы данных
+        scope (str): Область счётчиков
+        metric (str): Метрика
+        keys (Iterable[str] | None): Ключи; None - все ключи метрики
+
+    Returns:
+        Dict[str, int]: Значения счётчиков по ключам
+    """
+    query = select(ConcertCounter.key, ConcertCounter.value).where(
+        ConcertCounter.scope == scope,
+        ConcertCounter.metric == metric,
+        ConcertCounter.value > 0
+    )
+    if keys is not None:
+        query = query.where(ConcertCounter.key.in_(list(keys)))
+    return dict(db.execute(query).all())
+
+
+def read_history(db: Session, scope: str, metric: str) -> Dict[str, int]:
+    """Читает счётчики STATUS или COMPOSER вместе с архивными.
+
+    Args:
+        db (Session): Сессия базы данных
+        scope (str): Область счётчиков организации
+        metric (str): STATUS или COMPOSER
+
+    Returns:
+        Dict[str, int]: Значения по ключам с учётом архива
+    """
+    totals = Counter(read_counters(db, scope, metric))
+    totals.update(read_counters(db, scope, _ARCHIVED_METRICS[metric]))
+    return dict(totals)
+
+
+def read_total(db: Session, metric: str, keys: Optional[Iterable[str]] = None) -> int:
+    """Суммирует счётчики метрики в общей области.
+
+    Args:
+        db (Session): Сессия базы данных
+        metric (str): Метрика
+        keys (Iterable[str] | None): Ключи; None - все ключи метрики
+
+    Returns:
+        int: Сумма счётчиков
+    """
+    query = select(func.coalesce(func.sum(ConcertCounter.value), 0)).where(
+        ConcertCounter.scope == GLOBAL_SCOPE, ConcertCounter.metric == metric
+    )
+    if keys is not None:
+        query = query.where(ConcertCounter.key.in_(list(keys)))
+    return db.scalar(query)
@@ -0,0 +1,178 @@
+"""Внутрипроцессная шина событий об изменениях концертов.
+
+Роутеры публикуют события после фиксации транзакции, а подписчики
+(SSE и WebSocket) получают их через собственные ограниченные очереди.
+Последние события хранятся в кольцевом буфере, чтобы клиент мог
+переподключиться с заголовком Last-Event-ID и получить пропущенное.
+
+ID события имеет вид "<boot>-<seq>": boot меняется при перезапуске
+процесса, seq монотонно растёт. Если клиент передал ID из другого запуска
+или слишком старый ID, вместо догоняющих событий он получает событие
+reset и должен перечитать список концертов.
+"""
+
+# Стандартные библиотеки
+import asyncio
+import json
+import threading
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, List, Optional, Set, Tuple
+
+# Локальные модули
+from app.config import settings
+
+CREATED = "created"
+UPDATED = "updated"
+CANCELLED = "cancelled"
+DELETED = "deleted"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """Событие изменения концерта.
+
+    Attributes:
+        id (str): Идентификатор события для возобновления
+        type (str): Тип события: created, updated, cancelled, deleted
+        concert_id (int): ID концерта
+        data (dict | None): Актуальное представление концерта (кроме deleted)
+    """
+
+    id: str
+    type: str
+    concert_id: int
+    data: Optional[dict] = None
+
+    def as_dict(self) -> dict:
+        """Возвращает событие в виде словаря для JSON."""
+        return asdict(self)
+
+    def to_sse(self) -> str:
+        """Форматирует событие для text/event-stream."""
+        payload = json.dumps(self.as_dict(), ensure_ascii=False, default=str)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+EVICTED = object()
+
+
+class Subscriber:
+    """Подписчик шины с ограниченной очередью.
+
+    Если подписчик не успевает читать и очередь переполняется, он
+    отключается: очередь очищается и в неё кладётся маркер EVICTED.
+    Клиент переподключается с последним полученным ID.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.evicted = False
+
+    def offer(self, event: Any) -> None:
+        """Кладёт событие в очередь; вызывается в цикле событий подписчика."""
+        if self.evicted:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.evicted = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(EVICTED)
+
+    async def get(self, timeout: float) -> Any:
+        """Ждёт следующее событие не дольше timeout секунд.
+
+        Returns:
+            Any: Событие, EVICTED или None по таймауту
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    """Шина событий с буфером истории и веерной рассылкой подписчикам."""
+
+    def __init__(self, history_size: int, queue_size: int):
+        self.boot = uuid.uuid4().hex[:8]
+        self._queue_size = queue_size
+        self._history: Deque[Tuple[int, ChangeEvent]] = deque(maxlen=history_size)
+        self._subscribers: Set[Subscriber] = set()
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def publish(self, event_type: str, concert_id: int, data: Optional[dict] = None) -> ChangeEvent:
+        """Публикует событие; безопасно вызывать из потоков пула.
+
+        Args:
+            event_type (str): Тип события
+            concert_id (int): ID концерта
+            data (dict | None): Представление концерта
+
+        Returns:
+            ChangeEvent: Опубликованное событие
+        """
+        with self._lock:
+            self._seq += 1
+            event = ChangeEvent(f"{self.boot}-{self._seq}", event_type, concert_id, data)
+            self._history.append((self._seq, event))
+            for subscriber in list(self._subscribers):
+                if subscriber.loop.is_closed():
+                    self._subscribers.discard(subscriber)
+                    continue
+                subscriber.loop.call_soon_threadsafe(subscriber.offer, event)
+        return event
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Tuple[Subscriber, Optional[List[ChangeEvent]]]:
+        """Регистрирует подписчика в текущем цикле событий.
+
+        Args:
+            last_event_id (str | None): ID последнего полученного клиентом события
+
+        Returns:
+            Tuple[Subscriber, List[ChangeEvent] | None]: Подписчик и пропущенные
+            события; None означает, что пропущенное восстановить нельзя
+        """
+        subscriber = Subscriber(asyncio.get_running_loop(), self._queue_size)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            backlog = self._backlog(last_event_id)
+        return subscriber, backlog
+
+    def _backlog(self, last_event_id: Optional[str]) -> Optional[List[ChangeEvent]]:
+        if not last_event_id:
+            return []
+        boot, _, seq = last_event_id.partition("-")
+        if boot != self.boot or not seq.isdigit():
+            return None
+        last_seq = int(seq)
+        oldest_seq = self._history[0][0] if self._history else self._seq + 1
+        if last_seq < oldest_seq - 1:
+            return None
+        return [event for event_seq, event in self._history if event_seq > last_seq]
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Удаляет подписчика."""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    @property
+    def subscriber_count(self) -> int:
+        """Количество активных подписчиков."""
+        return len(self._subscribers)
+
+    def history(self) -> List[ChangeEvent]:
+        """Возвращает копию буфера последних событий."""
+        with self._lock:
+            return [event for _, event in self._history]
+
+
+concert_events = EventBus(
+    history_size=settings.event_history_size,
+    queue_size=settings.event_queue_size,
+)
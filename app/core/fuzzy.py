@@ -0,0 +1,224 @@
+"""Нечёткое сопоставление имён композиторов с учётом транслитерации.
+
+Имена приводятся к общему латинскому "фонетическому ключу": кириллица
+транслитерируется, а типичные варианты латинского написания сворачиваются
+(tch -> ch, y -> i, kh -> h, ts -> z, удвоенные буквы, оглушение конечной
+v и т.д.). Так "Чайковский" и "Tchaikovsky" дают один и тот же ключ
+"chaikovski".
+
+Сходство считается по триграммам (коэффициент Жаккара) для двух ключей
+имени: полного имени и фамилии (последнего слова). Инвертированный индекс
+триграмм позволяет сравнивать запрос только с кандидатами, у которых есть
+общие триграммы.
+"""
+
+# Стандартные библиотеки
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Сторонние библиотеки
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+# Локальные модули
+from app.config import settings
+from app.models.models import Composer
+
+_CYRILLIC = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ж": "zh",
+    "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n",
+    "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f",
+    "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch", "ъ": "",
+    "ы": "y", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+}
+
+_LATIN_FOLDS = (
+    ("tch", "ch"), ("tsch", "ch"), ("sch", "sh"), ("ph", "f"), ("kh", "h"),
+    ("ck", "k"), ("tz", "z"), ("ts", "z"), ("w", "v"), ("x", "ks"), ("q", "k"),
+    ("j", "y"), ("y", "i"),
+)
+_NON_WORD = re.compile(r"[^\w]+")
+_C_NOT_CH = re.compile(r"c(?!h)")
+_DOUBLES = re.compile(r"(.)\1+")
+_WORD_ENDINGS = ((re.compile(r"ch\b"), "h"), (re.compile(r"v\b"), "f"))
+
+Key = Tuple[int, str]
+
+
+def normalize(text: str) -> str:
+    """Приводит строку к виду для сравнения: регистр, 'ё', пунктуация, пробелы.
+
+    Args:
+        text (str): Исходная строка
+
+    Returns:
+        str: Нормализованная строка
+    """
+    text = text.casefold().replace("ё", "е")
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def transliterate(text: str) -> str:
+    """Транслитерирует кириллицу в латиницу после нормализации строки.
+
+    Args:
+        text (str): Исходная строка
+
+    Returns:
+        str: Строка латиницей
+    """
+    return "".join(_CYRILLIC.get(char, char) for char in normalize(text))
+
+
+def phonetic_key(text: str, word_endings: bool = True) -> str:
+    """Строит фонетический ключ, общий для кириллического и латинского написаний.
+
+    Args:
+        text (str): Имя в любом написании
+        word_endings (bool): Сворачивать окончания слов (v -> f в конце слова);
+            для недописанного слова замены на конце искажают префикс
+
+    Returns:
+        str: Ключ для сравнения
+    """
+    key = transliterate(text)
+    for source, target in _LATIN_FOLDS:
+        key = key.replace(source, target)
+    key = _DOUBLES.sub(r"\1", _C_NOT_CH.sub("k", key))
+    if word_endings:
+        for pattern, target in _WORD_ENDINGS:
+            key = pattern.sub(target, key)
+    return key
+
+
+def trigrams(key: str) -> FrozenSet[str]:
+    """Возвращает множество триграмм ключа (по словам, с отступами как в pg_trgm).
+
+    Args:
+        key (str): Фонетический ключ
+
+    Returns:
+        FrozenSet[str]: Множество триграмм
+    """
+    grams = set()
+    for word in key.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def _name_variants(name: str) -> List[str]:
+    key = phonetic_key(name)
+    words = key.split()
+    if len(words) > 1:
+        return [key, words[-1]]
+    return [key]
+
+
+class TrigramIndex:
+    """Инвертированный индекс триграмм по фонетическим ключам композиторов."""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[Key]] = defaultdict(set)
+        self._grams: Dict[Key, FrozenSet[str]] = {}
+        self._lock = threading.RLock()
+        self.loaded = False
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Строит индекс по таблице композиторов, если он ещё не построен.
+
+        Args:
+            db (Session): Сессия базы данных
+        """
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            for composer_id, name in db.execute(select(Composer.id, Composer.name)):
+                self._add(composer_id, name)
+            self.loaded = True
+
+    def reset(self) -> None:
+        """Сбрасывает индекс; следующий запрос построит его заново."""
+        with self._lock:
+            self._postings = defaultdict(set)
+            self._grams = {}
+            self.loaded = False
+
+    def _add(self, composer_id: int, name: str) -> None:
+        for variant in _name_variants(name):
+            key = (composer_id, variant)
+            grams = trigrams(variant)
+            self._grams[key] = grams
+            for gram in grams:
+                self._postings[gram].add(key)
+
+    def add(self, composer_id: int, name: str) -> None:
+        """Добавляет композитора в уже построенный индекс.
+
+        Args:
+            composer_id (int): ID композитора
+            name (str): Имя композитора
+        """
+        with self._lock:
+            if self.loaded:
+                self._add(composer_id, name)
+
+    def remove(self, composer_id: int) -> None:
+        """Удаляет композитора из индекса.
+
+        Args:
+            composer_id (int): ID композитора
+        """
+        with self._lock:
+            for key in [key for key in self._grams if key[0] == composer_id]:
+                for gram in self._grams.pop(key):
+                    self._postings[gram].discard(key)
+
+    def match(self, query: str, threshold: Optional[float] = None) -> Dict[int, float]:
+        """Находит композиторов, похожих на запрос.
+
+        Args:
+            query (str): Имя в произвольном написании
+            threshold (float | None): Минимальное сходство (0..1)
+
+        Returns:
+            Dict[int, float]: ID композитора и лучшее сходство
+        """
+        threshold = settings.composer_match_threshold if threshold is None else threshold
+        scores: Dict[int, float] = {}
+        with self._lock:
+            for variant in _name_variants(query):
+                query_grams = trigrams(variant)
+                if not query_grams:
+                    continue
+                candidates: Set[Key] = set()
+                for gram in query_grams:
+                    candidates |= self._postings.get(gram, set())
+                for candidate in candidates:
+                    grams = self._grams[candidate]
+                    similarity = len(query_grams & grams) / len(query_grams | grams)
+                    composer_id = candidate[0]
+                    if similarity >= threshold and similarity > scores.get(composer_id, 0.0):
+                        scores[composer_id] = similarity
+        return scores
+
+    def resolve(self, queries: Iterable[str]) -> Set[int]:
+        """Сопоставляет список запросов с множеством ID композиторов.
+
+        Args:
+            queries (Iterable[str]): Имена в произвольном написании
+
+        Returns:
+            Set[int]: ID всех подходящих композиторов
+        """
+        composer_ids: Set[int] = set()
+        for query in queries:
+            composer_ids.update(self.match(query))
+        return composer_ids
+
+
+composer_matcher = TrigramIndex()
@@ -0,0 +1,311 @@
+"""Ленты предстоящих концертов в формате iCalendar (RFC 5545).
+
+Лента организации или сохранённого поиска генерируется лениво: концерты
+читаются из модели чтения порциями по calendar_feed_batch_size, и каждый
+VEVENT отправляется клиенту сразу после формирования. Отрисованная лента
+сохраняется в FeedCache и отдаётся из памяти, пока не изменится
+относящийся к ней концерт: уже входящий в ленту или предстоящий концерт
+этой организации (подходящий под этот поиск). Изменения приходят из
+журнала инвалидации (app.core.invalidation), как и для остальных кэшей.
+
+Last-Modified ленты - время её отрисовки; запрос с If-Modified-Since не
+раньше этого времени получает 304 без тела.
+"""
+
+# Стандартные библиотеки
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, FrozenSet, Iterator, List, Mapping, Optional, Set, Tuple
+
+# Сторонние библиотеки
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+# Локальные модули
+from app.config import settings
+from app.core.matching import SearchEntry
+from app.database import SessionLocal
+from app.models.models import ConcertReadModel, ConcertReadModelItem, ConcertStatus
+
+MEDIA_TYPE = "text/calendar; charset=utf-8"
+ORGANIZATION = "organization"
+SEARCH = "search"
+
+FeedKey = Tuple[str, int]
+
+_HEADER = ("BEGIN:VCALENDAR\r\n"
+           "VERSION:2.0\r\n"
+           "PRODID:-//fast_api_project//Concerts//RU\r\n"
+           "CALSCALE:GREGORIAN\r\n"
+           "METHOD:PUBLISH\r\n")
+_FOOTER = "END:VCALENDAR\r\n"
+
+_FEED_COLUMNS = (ConcertReadModel.id, ConcertReadModel.title, ConcertReadModel.date,
+                 ConcertReadModel.description, ConcertReadModel.location,
+                 ConcertReadModel.composers)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _parse_ids(encoded: Optional[str]) -> Set[int]:
+    return {int(item) for item in (encoded or "").split(",") if item}
+
+
+def _escape(text: str) -> str:
+    """Экранирует текстовое значение свойства."""
+    return (text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _fold(line: str) -> str:
+    """Переносит строку длиннее 75 байт, не разрывая символы UTF-8."""
+    parts, current, size = [], "", 0
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > 75:
+            parts.append(current)
+            current, size = " ", 1
+        current += char
+        size += width
+    parts.append(current)
+    return "\r\n".join(parts) + "\r\n"
+
+
+def _format_dt(value: datetime) -> str:
+    return _as_utc(value).strftime("%Y%m%dT%H%M%SZ")
+
+
+def vevent(row: Mapping, stamp: datetime) -> str:
+    """Формирует VEVENT концерта.
+
+    Args:
+        row (Mapping): Строка модели чтения (id, title, date, description, location, composers)
+        stamp (datetime): Время формирования ленты (DTSTAMP)
+
+    Returns:
+        str: Компонент VEVENT со строками, разделёнными CRLF
+    """
+    description = row["description"] or ""
+    composers = ", ".join(item["name"] for item in row["composers"] or ())
+    if composers:
+        description = f"{description}\n\nКомпозиторы: {composers}".strip()
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:concert-{row['id']}@fast-api-project",
+        f"DTSTAMP:{_format_dt(stamp)}",
+        f"DTSTART:{_format_dt(row['date'])}",
+        f"DURATION:PT{settings.calendar_event_minutes}M",
+        f"SUMMARY:{_escape(row['title'])}",
+        f"LOCATION:{_escape(row['location'])}",
+    ]
+    if description:
+        lines.append(f"DESCRIPTION:{_escape(description)}")
+    lines += ["STATUS:CONFIRMED", "END:VEVENT"]
+    return "".join(_fold(line) for line in lines)
+
+
+def feed_query(organization_id: Optional[int] = None, search: Optional[SearchEntry] = None) -> Select:
+    """Строит запрос предстоящих концертов ленты по возрастанию даты.
+
+    Условия поиска повторяют SearchEntry.matches.
+
+    Args:
+        organization_id (int | None): ID организации
+        search (SearchEntry | None): Сохранённый поиск
+
+    Returns:
+        Select: Запрос к модели чтения
+    """
+    query = select(*_FEED_COLUMNS).where(
+        ConcertReadModel.current_status == ConcertStatus.UPCOMING.value
+    )
+    if organization_id is not None:
+        query = query.where(ConcertReadModel.organization_id == organization_id)
+    if search is not None:
+        members = [
+            ConcertReadModel.id.in_(
+                select(ConcertReadModelItem.concert_id)
+                .where(ConcertReadModelItem.kind == kind,
+                       ConcertReadModelItem.item_id.in_(sorted(item_ids)))
+            )
+            for kind, item_ids in ((ConcertReadModelItem.COMPOSER, search.composer_ids),
+                                   (ConcertReadModelItem.INSTRUMENT, search.instrument_ids))
+            if item_ids
+        ]
+        if members:
+            query = query.where(or_(*members))
+        if search.date_from is not None:
+            query = query.where(ConcertReadModel.date >= search.date_from)
+        if search.date_to is not None:
+            query = query.where(ConcertReadModel.date <= search.date_to)
+        if search.max_price is not None:
+            query = query.where(or_(ConcertReadModel.price_amount.is_(None),
+                                    ConcertReadModel.price_amount <= search.max_price))
+    return query.order_by(ConcertReadModel.date, ConcertReadModel.id)
+
+
+@dataclass(frozen=True)
+class Feed:
+    """Отрисованная лента."""
+
+    body: bytes
+    last_modified: datetime
+    concert_ids: FrozenSet[int]
+    search: Optional[SearchEntry] = None
+
+
+class FeedCache:
+    """LRU-кэш отрисованных лент с инвалидацией по изменившимся концертам."""
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = maxsize or settings.calendar_feed_cache_size
+        self._feeds: "OrderedDict[FeedKey, Feed]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Номер поколения; растёт при каждой инвалидации."""
+        return self._version
+
+    def get(self, key: FeedKey) -> Optional[Feed]:
+        """Возвращает ленту из кэша или None."""
+        with self._lock:
+            feed = self._feeds.get(key)
+            if feed is not None:
+                self._feeds.move_to_end(key)
+            return feed
+
+    def store(self, key: FeedKey, feed: Feed, version: int) -> bool:
+        """Сохраняет ленту, если с начала её отрисовки не было инвалидаций.
+
+        Args:
+            key (FeedKey): Ключ ленты
+            feed (Feed): Отрисованная лента
+            version (int): Поколение на момент начала отрисовки
+
+        Returns:
+            bool: True, если лента сохранена
+        """
+        with self._lock:
+            if version != self._version:
+                return False
+            self._feeds[key] = feed
+            self._feeds.move_to_end(key)
+            while len(self._feeds) > self.maxsize:
+                self._feeds.popitem(last=False)
+            return True
+
+    def clear(self) -> None:
+        """Очищает кэш полностью."""
+        with self._lock:
+            self._version += 1
+            self._feeds.clear()
+
+    def invalidate(self, db: Session, concert_ids: Optional[Set[str]]) -> int:
+        """Вытесняет ленты, к которым относятся изменившиеся концерты.
+
+        Args:
+            db (Session): Сессия базы данных
+            concert_ids (Set[str] | None): ID изменившихся концертов; None - все
+
+        Returns:
+            int: Количество вытесненных лент
+        """
+        if concert_ids is None:
+            self.clear()
+            return 0
+        ids = {int(concert_id) for concert_id in concert_ids}
+        with self._lock:
+            self._version += 1
+            if not self._feeds:
+                return 0
+        rows = db.execute(
+            select(ConcertReadModel.organization_id, ConcertReadModel.date,
+                   ConcertReadModel.price_amount, ConcertReadModel.composer_ids,
+                   ConcertReadModel.instrument_ids)
+            .where(ConcertReadModel.id.in_(ids),
+                   ConcertReadModel.current_status == ConcertStatus.UPCOMING.value)
+        ).all()
+        organizations = {row.organization_id for row in rows}
+        concerts = [(_parse_ids(row.composer_ids), _parse_ids(row.instrument_ids),
+                     _as_utc(row.date), row.price_amount) for row in rows]
+
+        with self._lock:
+            stale: List[FeedKey] = [
+                key for key, feed in self._feeds.items()
+                if feed.concert_ids & ids
+                or (key[0] == ORGANIZATION and key[1] in organizations)
+                or (feed.search is not None
+                    and any(feed.search.matches(*concert) for concert in concerts))
+            ]
+            for key in stale:
+                del self._feeds[key]
+        return len(stale)
+
+
+calendar_feeds = FeedCache()
+
+
+def render_feed(key: FeedKey, query: Select, search: Optional[SearchEntry], stamp: datetime,
+                version: int, session_factory: Callable[[], Session] = SessionLocal
+                ) -> Iterator[bytes]:
+    """Лениво отрисовывает ленту и сохраняет её в кэш после отправки.
+
+    Тело читается уже после возврата из обработчика, когда сессия из
+    get_session закрыта, поэтому лента открывает собственную сессию и
+    закрывает её, даже если клиент не дочитал ответ.
+
+    Args:
+        key (FeedKey): Ключ ленты
+        query (Select): Запрос feed_query
+        search (SearchEntry | None): Сохранённый поиск ленты поиска
+        stamp (datetime): Время отрисовки (DTSTAMP и Last-Modified)
+        version (int): calendar_feeds.version до начала отрисовки
+        session_factory (Callable[[], Session]): Фабрика сессий
+
+    Yields:
+        bytes: Части тела ленты
+    """
+    parts = [_HEADER.encode()]
+    concert_ids = set()
+    yield parts[0]
+    db = session_factory()
+    try:
+        for rows in db.execute(query.execution_options(yield_per=settings.calendar_feed_batch_size)) \
+                .mappings().partitions():
+            chunk = "".join(vevent(row, stamp) for row in rows).encode()
+            concert_ids.update(row["id"] for row in rows)
+            parts.append(chunk)
+            yield chunk
+    finally:
+        db.close()
+    parts.append(_FOOTER.encode())
+    yield parts[-1]
+    # Лента сохраняется, только если клиент дочитал её до конца.
+    calendar_feeds.store(key, Feed(b"".join(parts), stamp, frozenset(concert_ids), search), version)
+
+
+def http_date(value: datetime) -> str:
+    """Форматирует время для заголовка Last-Modified."""
+    return format_datetime(value, usegmt=True)
+
+
+def not_modified(if_modified_since: Optional[str], last_modified: datetime) -> bool:
+    """Проверяет, не изменилась ли лента с момента из If-Modified-Since.
+
+    Некорректный заголовок игнорируется.
+    """
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return _as_utc(since) >= last_modified
@@ -0,0 +1,290 @@
+"""Идемпотентные повторы запросов создания по заголовку Idempotency-Key.
+
+Первый запрос с ключом занимает запись в таблице idempotency_keys
+(INSERT ... ON CONFLICT DO NOTHING), выполняется и сохраняет ответ на
+idempotency_ttl_seconds. Повтор с тем же ключом получает сохранённый ответ
+без повторного выполнения. Повтор, пришедший пока первый запрос ещё
+выполняется, ждёт его завершения; если владелец ключа пропал (упал воркер),
+блокировка истекает через idempotency_lock_seconds и ключ занимается заново.
+
+Ключ действует в пределах метода, пути и пользователя. Повтор с тем же
+ключом, но другим телом запроса отклоняется с 422. Ответы 5xx не
+сохраняются: клиент может повторить запрос.
+"""
+
+# Стандартные библиотеки
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+
+# Сторонние библиотеки
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+# Локальные модули
+from app.config import settings
+from app.core.metrics import metrics
+from app.core.ratelimit import token_subject
+from app.database import SessionLocal
+from app.models.models import IdempotencyRecord
+
+HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+
+IDEMPOTENT_ROUTES: FrozenSet[Tuple[str, str]] = frozenset({
+    ("POST", "/auth/signup"),
+    ("POST", "/concerts/"),
+    ("POST", "/composers/"),
+    ("POST", "/instruments/"),
+})
+
+_POLL_SECONDS = 0.1
+_PURGE_INTERVAL_SECONDS = 600
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """Снимок записи idempotency_keys."""
+
+    request_hash: str
+    status_code: Optional[int]
+    content_type: Optional[str]
+    body: Optional[bytes]
+
+
+def claim(
+        db: Session,
+        scope: str,
+        key: str,
+        request_hash: str,
+        now: Optional[datetime] = None
+) -> Optional[StoredResponse]:
+    """Пытается занять ключ.
+
+    Args:
+        db (Session): Сессия базы данных
+        scope (str): Область действия ключа
+        key (str): Значение Idempotency-Key
+        request_hash (str): Хеш тела запроса
+        now (datetime | None): Текущее время
+
+    Returns:
+        StoredResponse | None: None, если ключ занят этим запросом, иначе
+        существующая запись
+    """
+    now = now or datetime.now(timezone.utc)
+    db.execute(
+        delete(IdempotencyRecord)
+        .where(IdempotencyRecord.scope == scope,
+               IdempotencyRecord.key == key,
+               IdempotencyRecord.expires_at < now)
+    )
+    inserted = db.execute(
+        sqlite_insert(IdempotencyRecord)
+        .values(scope=scope, key=key, request_hash=request_hash,
+                expires_at=now + timedelta(seconds=settings.idempotency_lock_seconds))
+        .on_conflict_do_nothing()
+    ).rowcount
+    db.commit()
+    if inserted:
+        return None
+    record = db.get(IdempotencyRecord, (scope, key))
+    if record is None:
+        return claim(db, scope, key, request_hash, now)
+    return StoredResponse(record.request_hash, record.status_code, record.content_type, record.body)
+
+
+def complete(
+        db: Session,
+        scope: str,
+        key: str,
+        status_code: int,
+        content_type: Optional[str],
+        body: bytes
+) -> None:
+    """Сохраняет ответ для занятого ключа на idempotency_ttl_seconds."""
+    db.execute(
+        update(IdempotencyRecord)
+        .where(IdempotencyRecord.scope == scope, IdempotencyRecord.key == key)
+        .values(status_code=status_code, content_type=content_type, body=body,
+                expires_at=datetime.now(timezone.utc)
+                + timedelta(seconds=settings.idempotency_ttl_seconds))
+    )
+    db.commit()
+
+
+def release(db: Session, scope: str, key: str) -> None:
+    """Освобождает ключ, если ответ не был сохранён."""
+    db.execute(
+        delete(IdempotencyRecord)
+        .where(IdempotencyRecord.scope == scope,
+               IdempotencyRecord.key == key,
+               IdempotencyRecord.status_code.is_(None))
+    )
+    db.commit()
+
+
+def purge_expired(db: Session, now: Optional[datetime] = None) -> int:
+    """Удаляет истёкшие записи.
+
+    Returns:
+        int: Количество удалённых записей
+    """
+    now = now or datetime.now(timezone.utc)
+    deleted = db.execute(
+        delete(IdempotencyRecord).where(IdempotencyRecord.expires_at < now)
+    ).rowcount
+    db.commit()
+    return deleted
+
+
+def _header(scope: dict, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def _send_json(send, status_code: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}, ensure_ascii=False).encode()
+    await _send_body(send, status_code, "application/json", body, [])
+
+
+async def _send_body(send, status_code: int, content_type: Optional[str],
+                     body: bytes, extra_headers: list) -> None:
+    headers = [(b"content-length", str(len(body)).encode())] + extra_headers
+    if content_type:
+        headers.append((b"content-type", content_type.encode("latin-1")))
+    await send({"type": "http.response.start", "status": status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+class IdempotencyMiddleware:
+    """ASGI-middleware, обрабатывающее Idempotency-Key для маршрутов создания."""
+
+    def __init__(
+            self,
+            app,
+            routes: FrozenSet[Tuple[str, str]] = IDEMPOTENT_ROUTES,
+            session_factory: Callable[[], Session] = SessionLocal
+    ):
+        self.app = app
+        self.routes = routes
+        self.session_factory = session_factory
+        self._in_flight: Dict[Tuple[str, str], asyncio.Event] = {}
+        self._next_purge = 0.0
+
+    def _run(self, func, *args):
+        db = self.session_factory()
+        try:
+            if time.monotonic() >= self._next_purge:
+                self._next_purge = time.monotonic() + _PURGE_INTERVAL_SECONDS
+                purge_expired(db)
+            return func(db, *args)
+        finally:
+            db.close()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (scope["method"], scope["path"]) not in self.routes:
+            await self.app(scope, receive, send)
+            return
+        key = _header(scope, HEADER)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _send_json(send, 400, f"Idempotency-Key должен содержать от 1 до {MAX_KEY_LENGTH} символов")
+            return
+
+        body, receive = await _buffer_request(receive)
+        request_hash = hashlib.sha256(body).hexdigest()
+        record_scope = f"{scope['method']} {scope['path']} {token_subject(scope) or '-'}"
+        ident = (record_scope, key)
+
+        deadline = time.monotonic() + settings.idempotency_lock_seconds + 1
+        while True:
+            stored = await asyncio.to_thread(self._run, claim, record_scope, key, request_hash)
+            if stored is None:
+                break
+            if stored.request_hash != request_hash:
+                await _send_json(send, 422, "Idempotency-Key уже использован с другим телом запроса")
+                return
+            if stored.status_code is not None:
+                metrics.inc("idempotency_replays_total")
+                await _send_body(send, stored.status_code, stored.content_type, stored.body or b"",
+                                 [(b"idempotent-replayed", b"true")])
+                return
+            if time.monotonic() >= deadline:
+                await _send_json(send, 409, "Запрос с этим Idempotency-Key ещё выполняется")
+                return
+            metrics.inc("idempotency_waits_total")
+            await self._wait(ident)
+
+        event = self._in_flight.setdefault(ident, asyncio.Event())
+        response = {"status": 500, "content_type": None}
+        chunks = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["content_type"] = next(
+                    (value.decode("latin-1") for name, value in message.get("headers", ())
+                     if name.lower() == b"content-type"), None)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            try:
+                await self.app(scope, receive, capture)
+            except BaseException:
+                await asyncio.to_thread(self._run, release, record_scope, key)
+                raise
+            if response["status"] < 500:
+                await asyncio.to_thread(self._run, complete, record_scope, key, response["status"],
+                                        response["content_type"], b"".join(chunks))
+            else:
+                await asyncio.to_thread(self._run, release, record_scope, key)
+        finally:
+            event.set()
+            self._in_flight.pop(ident, None)
+
+    async def _wait(self, ident: Tuple[str, str]) -> None:
+        # Владелец ключа в этом процессе будит ожидающих сразу, владельца
+        # из другого воркера ждём опросом таблицы.
+        event = self._in_flight.get(ident)
+        if event is None:
+            await asyncio.sleep(_POLL_SECONDS)
+            return
+        try:
+            await asyncio.wait_for(event.wait(), timeout=settings.idempotency_lock_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _buffer_request(receive):
+    """Читает тело запроса целиком и возвращает его и receive для приложения."""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    body = b"".join(chunks)
+    sent = False
+
+    async def replay():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return body, replay
@@ -0,0 +1,214 @@
+"""Инвалидация внутрипроцессных кэшей между воркерами.
+
+Каждое изменение концертов, композиторов и инструментов записывает строки
+в журнал cache_changes в той же транзакции (модель чтения вызывает
+record из sync_concerts, а record_catalog из after_flush).
+ID журнала монотонно растёт, поэтому воркер помнит последний прочитанный
+ID и не чаще раза в cache_sync_interval_seconds читает только новые строки
+одним запросом по первичному ключу. Для затронутых ключей вытесняются
+записи кэшей: перечитываются изменённые композиторы и инструменты в
+индексах подсказок, пересчитывается их популярность по изменённым
+концертам, сбрасываются агрегаты кэша концертов и ленты iCalendar, к
+которым относятся изменённые концерты (app.core.ical), а изменённые
+концерты передаются индексу похожих концертов (app.core.similarity).
+Устаревание кэша в чужом воркере ограничено интервалом опроса.
+
+Строки старше cache_changes_retention_seconds удаляются; воркер, не
+опрашивавший журнал дольше этого срока, сбрасывает кэши полностью.
+"""
+
+# Стандартные библиотеки
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Set
+
+# Сторонние библиотеки
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+# Локальные модули
+from app.config import settings
+from app.core import cache
+from app.core.background import BackgroundWorker
+from app.core.fuzzy import composer_matcher
+from app.core.ical import calendar_feeds
+from app.core.similarity import similar_concerts, similarity_refresher
+from app.core.suggest import composer_index, composer_item, instrument_index, instrument_item
+from app.models.models import CacheChange, Composer, Instrument
+
+CONCERTS = "concerts"
+COMPOSERS = "composers"
+INSTRUMENTS = "instruments"
+
+# Больше ключей одним изменением записываем как изменение всего пространства.
+_MAX_KEYS = 500
+
+
+def record(connection: Connection, namespace: str, keys: Iterable) -> None:
+    """Записывает изменения ключей в журнал в текущей транзакции.
+
+    Args:
+        connection (Connection): Соединение текущей транзакции
+        namespace (str): Пространство имён
+        keys (Iterable): Изменившиеся ключи
+    """
+    keys = sorted({str(key) for key in keys if key is not None})
+    if not keys:
+        return
+    if len(keys) > _MAX_KEYS:
+        connection.execute(insert(CacheChange), [{"namespace": namespace, "key": None}])
+        return
+    connection.execute(insert(CacheChange), [
+        {"namespace": namespace, "key": key} for key in keys
+    ])
+
+
+def record_catalog(session: Session) -> None:
+    """Записывает изменения композиторов и инструментов текущего flush."""
+    changed: Dict[str, Set[int]] = defaultdict(set)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Composer):
+            changed[COMPOSERS].add(obj.id)
+        elif isinstance(obj, Instrument):
+            changed[INSTRUMENTS].add(obj.id)
+    for namespace, keys in changed.items():
+        record(session.connection(), namespace, keys)
+
+
+def _evict_concerts(db: Session, keys: Optional[Set[str]]) -> None:
+    # В кэше концертов лежат агрегаты (фасеты, количества), зависящие от
+    # любого концерта, поэтому любое изменение вытесняет их все.
+    cache.invalidate(CONCERTS)
+    calendar_feeds.invalidate(db, keys)
+    similar_concerts.invalidate(keys)
+    similarity_refresher.notify()
+    # Популярность в подсказках пересчитывается только по изменённым
+    # концертам, в том числе удалённым и архивированным.
+    if keys is None:
+        composer_index.reset()
+        instrument_index.reset()
+        return
+    concert_ids = [int(key) for key in keys]
+    composer_index.sync_concerts(db, concert_ids)
+    instrument_index.sync_concerts(db, concert_ids)
+
+
+def _reload_composers(db: Session, keys: Optional[Set[str]]) -> None:
+    if keys is None:
+        composer_index.reset()
+        composer_matcher.reset()
+        return
+    ids = [int(key) for key in keys]
+    current = {composer.id: composer for composer in
+               db.scalars(select(Composer).where(Composer.id.in_(ids)))}
+    for composer_id in ids:
+        composer_index.remove(composer_id)
+        composer_matcher.remove(composer_id)
+        composer = current.get(composer_id)
+        if composer is not None:
+            composer_index.add(composer_item(composer))
+            composer_matcher.add(composer.id, composer.name)
+
+
+def _reload_instruments(db: Session, keys: Optional[Set[str]]) -> None:
+    if keys is None:
+        instrument_index.reset()
+        return
+    ids = [int(key) for key in keys]
+    current = {instrument.id: instrument for instrument in
+               db.scalars(select(Instrument).where(Instrument.id.in_(ids)))}
+    for instrument_id in ids:
+        instrument_index.remove(instrument_id)
+        instrument = current.get(instrument_id)
+        if instrument is not None:
+            instrument_index.add(instrument_item(instrument))
+
+
+_HANDLERS = {
+    CONCERTS: _evict_concerts,
+    COMPOSERS: _reload_composers,
+    INSTRUMENTS: _reload_instruments,
+}
+
+
+class CacheSync(BackgroundWorker):
+    """Фоновая задача, применяющая журнал изменений к кэшам воркера."""
+
+    name = "cache-sync"
+
+    def __init__(self, **kwargs):
+        super().__init__(max_sleep=settings.cache_sync_interval_seconds, **kwargs)
+        self.last_id: Optional[int] = None
+        self._last_poll: Optional[float] = None
+        self._next_prune = 0.0
+
+    def run_once(self, db: Session) -> Optional[float]:
+        self.poll(db)
+        if time.monotonic() >= self._next_prune:
+            self._next_prune = time.monotonic() + settings.cache_changes_retention_seconds / 10
+            prune(db)
+        return None
+
+    def poll(self, db: Session) -> int:
+        """Применяет новые строки журнала.
+
+        Args:
+            db (Session): Сессия базы данных
+
+        Returns:
+            int: Количество прочитанных строк
+        """
+        now = time.monotonic()
+        missed = (self._last_poll is not None
+                  and now - self._last_poll > settings.cache_changes_retention_seconds)
+        self._last_poll = now
+        if self.last_id is None or missed:
+            # При старте кэши пусты; после долгого перерыва строки могли
+            # быть удалены, поэтому сбрасываем всё и начинаем с текущей версии.
+            if missed:
+                for handler in _HANDLERS.values():
+                    handler(db, None)
+            self.last_id = db.scalar(select(func.max(CacheChange.id))) or 0
+            return 0
+
+        rows = db.execute(
+            select(CacheChange.id, CacheChange.namespace, CacheChange.key)
+            .where(CacheChange.id > self.last_id)
+            .order_by(CacheChange.id)
+        ).all()
+        if not rows:
+            return 0
+
+        changed: Dict[str, Optional[Set[str]]] = {}
+        for row in rows:
+            if row.key is None:
+                changed[row.namespace] = None
+            elif changed.get(row.namespace, set()) is not None:
+                changed.setdefault(row.namespace, set()).add(row.key)
+        for namespace, keys in changed.items():
+            handler = _HANDLERS.get(namespace)
+            if handler is not None:
+                handler(db, keys)
+        self.last_id = rows[-1].id
+        return len(rows)
+
+
+def prune(db: Session, now: Optional[datetime] = None) -> int:
+    """Удаляет строки журнала старше срока хранения.
+
+    Returns:
+        int: Количество удалённых строк
+    """
+    now = now or datetime.now(timezone.utc)
+    deleted = db.execute(
+        delete(CacheChange).where(
+            CacheChange.created_at < now - timedelta(seconds=settings.cache_changes_retention_seconds)
+        )
+    ).rowcount
+    db.commit()
+    return deleted
+
+
+cache_sync = CacheSync()
@@ -0,0 +1,214 @@
+"""Сопоставление новых концертов с сохранёнными поисками слушателей.
+
+Поиск подходит концерту, если у них есть общий композитор или общий
+инструмент (или поиск не ограничивает состав), и выполнены условия по
+дате и цене. Поиски индексируются в памяти по ID композиторов и
+инструментов, поэтому для нового концерта кандидатами становятся только
+поиски из списков его композиторов и инструментов и поиски без
+ограничений по составу; условия по дате и цене проверяются у кандидатов.
+
+Индекс догружает поиски с ID больше последнего загруженного одним
+запросом по первичному ключу, поэтому видит поиски, созданные в других
+воркерах. Удалённые поиски отсеиваются проверкой существования кандидатов.
+"""
+
+# Стандартные библиотеки
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+# Сторонние библиотеки
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+# Локальные модули
+from app.models.models import Notification, SavedSearch
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+@dataclass(frozen=True)
+class SearchEntry:
+    """Сохранённый поиск в индексе."""
+
+    id: int
+    user_id: int
+    composer_ids: FrozenSet[int]
+    instrument_ids: FrozenSet[int]
+    date_from: Optional[datetime]
+    date_to: Optional[datetime]
+    max_price: Optional[int]
+
+    @classmethod
+    def from_model(cls, search: SavedSearch) -> "SearchEntry":
+        """Создаёт запись индекса из модели."""
+        return cls(
+            id=search.id,
+            user_id=search.user_id,
+            composer_ids=frozenset(search.composer_ids or ()),
+            instrument_ids=frozenset(search.instrument_ids or ()),
+            date_from=_as_utc(search.date_from),
+            date_to=_as_utc(search.date_to),
+            max_price=search.max_price,
+        )
+
+    def matches(
+            self,
+            composer_ids: Set[int],
+            instrument_ids: Set[int],
+            date: datetime,
+            price_amount: Optional[int]
+    ) -> bool:
+        """Проверяет все условия поиска для концерта."""
+        if (self.composer_ids or self.instrument_ids) and not (
+                self.composer_ids & composer_ids or self.instrument_ids & instrument_ids):
+            return False
+        if self.date_from and date < self.date_from:
+            return False
+        if self.date_to and date > self.date_to:
+            return False
+        if self.max_price is not None and (price_amount or 0) > self.max_price:
+            return False
+        return True
+
+
+class SubscriptionIndex:
+    """Инвертированный индекс сохранённых поисков по композиторам и инструментам."""
+
+    def __init__(self):
+        self._entries: Dict[int, SearchEntry] = {}
+        self._by_composer: Dict[int, Set[int]] = defaultdict(set)
+        self._by_instrument: Dict[int, Set[int]] = defaultdict(set)
+        self._unrestricted: Set[int] = set()
+        self._max_id = 0
+        self._lock = threading.RLock()
+
+    def reset(self) -> None:
+        """Очищает индекс; следующий вызов refresh() загрузит его заново."""
+        with self._lock:
+            self._entries = {}
+            self._by_composer = defaultdict(set)
+            self._by_instrument = defaultdict(set)
+            self._unrestricted = set()
+            self._max_id = 0
+
+    def add(self, entry: SearchEntry) -> None:
+        """Добавляет поиск в индекс."""
+        with self._lock:
+            self._entries[entry.id] = entry
+            self._max_id = max(self._max_id, entry.id)
+            for composer_id in entry.composer_ids:
+                self._by_composer[composer_id].add(entry.id)
+            for instrument_id in entry.instrument_ids:
+                self._by_instrument[instrument_id].add(entry.id)
+            if not entry.composer_ids and not entry.instrument_ids:
+                self._unrestricted.add(entry.id)
+
+    def remove(self, search_id: int) -> None:
+        """Удаляет поиск из индекса."""
+        with self._lock:
+            entry = self._entries.pop(search_id, None)
+            if entry is None:
+                return
+            for composer_id in entry.composer_ids:
+                self._by_composer[composer_id].discard(search_id)
+            for instrument_id in entry.instrument_ids:
+                self._by_instrument[instrument_id].discard(search_id)
+            self._unrestricted.discard(search_id)
+
+    def refresh(self, db: Session) -> None:
+        """Догружает поиски, созданные после последней загрузки.
+
+        Args:
+            db (Session): Сессия базы данных
+        """
+        new_searches = db.scalars(
+            select(SavedSearch).where(SavedSearch.id > self._max_id).order_by(SavedSearch.id)
+        ).all()
+        for search in new_searches:
+            self.add(SearchEntry.from_model(search))
+
+    def candidates(self, composer_ids: Iterable[int], instrument_ids: Iterable[int]) -> List[SearchEntry]:
+        """Возвращает поиски, которые могут подойти концерту с таким составом."""
+        with self._lock:
+            search_ids = set(self._unrestricted)
+            for composer_id in composer_ids:
+                search_ids |= self._by_composer.get(composer_id, set())
+            for instrument_id in instrument_ids:
+                search_ids |= self._by_instrument.get(instrument_id, set())
+            return [self._entries[search_id] for search_id in search_ids]
+
+    def match(
+            self,
+            db: Session,
+            composer_ids: Iterable[int],
+            instrument_ids: Iterable[int],
+            date: datetime,
+            price_amount: Optional[int]
+    ) -> List[SearchEntry]:
+        """Находит сохранённые поиски, под которые подходит концерт.
+
+        Args:
+            db (Session): Сессия базы данных
+            composer_ids (Iterable[int]): ID композиторов концерта
+            instrument_ids (Iterable[int]): ID инструментов концерта
+            date (datetime): Дата концерта
+            price_amount (int | None): Цена билета
+
+        Returns:
+            List[SearchEntry]: Подходящие поиски
+        """
+        self.refresh(db)
+        composer_ids, instrument_ids = set(composer_ids), set(instrument_ids)
+        date = _as_utc(date)
+        matched = [
+            entry for entry in self.candidates(composer_ids, instrument_ids)
+            if entry.matches(composer_ids, instrument_ids, date, price_amount)
+        ]
+        if not matched:
+            return []
+
+        existing = set(db.scalars(
+            select(SavedSearch.id).where(SavedSearch.id.in_([entry.id for entry in matched]))
+        ))
+        for entry in matched:
+            if entry.id not in existing:
+                self.remove(entry.id)
+        return [entry for entry in matched if entry.id in existing]
+
+
+subscription_index = SubscriptionIndex()
+
+
+def enqueue_matches(
+        db: Session,
+        concert_id: int,
+        composer_ids: Iterable[int],
+        instrument_ids: Iterable[int],
+        date: datetime,
+        price_amount: Optional[int]
+) -> int:
+    """Ставит в outbox уведомления для всех подходящих поисков.
+
+    Вызывается до commit, чтобы уведомления фиксировались вместе с концертом.
+    Пользователь получает одно уведомление о концерте, даже если концерт
+    подошёл под несколько его поисков.
+
+    Returns:
+        int: Количество поставленных уведомлений
+    """
+    matched = subscription_index.match(db, composer_ids, instrument_ids, date, price_amount)
+    by_user: Dict[int, SearchEntry] = {}
+    for entry in sorted(matched, key=lambda item: item.id):
+        by_user.setdefault(entry.user_id, entry)
+    db.add_all([
+        Notification(user_id=entry.user_id, saved_search_id=entry.id, concert_id=concert_id)
+        for entry in by_user.values()
+    ])
+    return len(by_user)
@@ -0,0 +1,80 @@
+"""Простой реестр метрик процесса в текстовом формате Prometheus."""
+
+# Стандартные библиотеки
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """Счётчики и вычисляемые показатели (gauge) с метками."""
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[Labels, float]] = defaultdict(lambda: defaultdict(float))
+        self._gauges: Dict[str, Callable[[], float]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        """Увеличивает счётчик.
+
+        Args:
+            name (str): Имя метрики
+            amount (float): Приращение
+            **labels (str): Метки
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._counters[name][key] += amount
+
+    def gauge(self, name: str, callback: Callable[[], float], help_text: str = "") -> None:
+        """Регистрирует показатель, значение которого вычисляется при выгрузке.
+
+        Args:
+            name (str): Имя метрики
+            callback (Callable[[], float]): Функция, возвращающая значение
+            help_text (str): Описание
+        """
+        self._gauges[name] = callback
+        if help_text:
+            self._help[name] = help_text
+
+    def describe(self, name: str, help_text: str) -> None:
+        """Задаёт описание метрики."""
+        self._help[name] = help_text
+
+    def value(self, name: str, **labels: str) -> float:
+        """Возвращает текущее значение счётчика."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            return self._counters.get(name, {}).get(key, 0.0)
+
+    def render(self) -> str:
+        """Формирует выгрузку в текстовом формате Prometheus."""
+        lines = []
+        with self._lock:
+            counters = {name: dict(values) for name, values in self._counters.items()}
+        for name in sorted(counters):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(counters[name].items()):
+                lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        for name in sorted(self._gauges):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {self._gauges[name]():g}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{key}="{value}"' for key, value in labels)
+    return "{" + body + "}"
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,101 @@
+"""Фоновая обработка исходящих уведомлений (transactional outbox)."""
+
+# Стандартные библиотеки
+import logging
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+# Сторонние библиотеки
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+# Локальные модули
+from app.config import settings
+from app.core.background import BackgroundWorker
+from app.models.models import Notification
+
+logger = logging.getLogger(__name__)
+
+Deliverer = Callable[[List[Notification]], None]
+
+
+def log_notifications(notifications: List[Notification]) -> None:
+    """Доставка по умолчанию: запись в журнал.
+
+    Args:
+        notifications (List[Notification]): Уведомления пачки
+    """
+    for notification in notifications:
+        logger.info("Уведомление пользователю %s о концерте %s",
+                    notification.user_id, notification.concert_id)
+
+
+def process_pending(
+        db: Session,
+        deliver: Deliverer = log_notifications,
+        batch_size: Optional[int] = None
+) -> int:
+    """Обрабатывает необработанные уведомления пачками.
+
+    Пачка помечается обработанной UPDATE ... RETURNING, доставляется и
+    фиксируется в одной транзакции: при ошибке доставки отметка
+    откатывается и пачка будет обработана повторно, а конкурирующие
+    воркеры не получат одни и те же строки.
+
+    Args:
+        db (Session): Сессия базы данных
+        deliver (Deliverer): Функция доставки пачки
+        batch_size (int | None): Размер пачки
+
+    Returns:
+        int: Количество обработанных уведомлений
+    """
+    batch_size = batch_size or settings.outbox_batch_size
+    total = 0
+    while True:
+        pending_ids = db.scalars(
+            select(Notification.id)
+            .where(Notification.processed_at.is_(None))
+            .order_by(Notification.id)
+            .limit(batch_size)
+        ).all()
+        if not pending_ids:
+            break
+
+        claimed_ids = db.scalars(
+            update(Notification)
+            .where(Notification.id.in_(pending_ids), Notification.processed_at.is_(None))
+            .values(processed_at=datetime.now(timezone.utc))
+            .returning(Notification.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if claimed_ids:
+            try:
+                deliver(db.scalars(
+                    select(Notification).where(Notification.id.in_(claimed_ids))
+                ).all())
+            except Exception:
+                db.rollback()
+                raise
+        db.commit()
+        total += len(claimed_ids)
+        if len(pending_ids) < batch_size:
+            break
+    return total
+
+
+class OutboxProcessor(BackgroundWorker):
+    """Фоновая задача доставки уведомлений; create_concert будит её через notify()."""
+
+    name = "notification-outbox"
+
+    def __init__(self, deliver: Deliverer = log_notifications, **kwargs):
+        super().__init__(**kwargs)
+        self.deliver = deliver
+
+    def run_once(self, db: Session) -> Optional[float]:
+        process_pending(db, self.deliver)
+        return None
+
+
+outbox_processor = OutboxProcessor(max_sleep=settings.outbox_poll_seconds)
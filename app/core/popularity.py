@@ -0,0 +1,185 @@
+"""Учёт просмотров концертов с отложенной записью и рейтинг популярности.
+
+Просмотр в read_concert только увеличивает счётчик в памяти воркера:
+счётчики разбиты на popularity_shards шардов, каждый поток при первом
+просмотре получает свой шард по кругу, у каждого шарда своя блокировка,
+поэтому одновременные запросы не ждут друг друга.
+Фоновая задача раз в popularity_flush_seconds (или раньше, если
+накопилось popularity_flush_max_keys концертов) забирает накопленные
+приращения и записывает их одним пакетным UPSERT. При остановке воркера
+остаток сбрасывается, поэтому при аварийном завершении теряются
+просмотры не более чем за один интервал сброса.
+
+Рейтинг затухает с периодом полураспада popularity_half_life_hours.
+Используется прямое затухание: просмотр в момент t весит exp(t / tau),
+а в таблице хранится логарифм суммы весов. Текущий рейтинг равен
+exp(log_score - now / tau), и порядок по log_score не меняется со
+временем, поэтому GET /concerts/popular читает индекс без пересчёта
+строк. Логарифмы складываются в SQL через ln/exp (SQLite 3.35+).
+После изменения периода полураспада рейтинги нужно обнулить.
+"""
+
+# Стандартные библиотеки
+import asyncio
+import itertools
+import math
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+# Сторонние библиотеки
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+# Локальные модули
+from app.config import settings
+from app.core.background import BackgroundWorker
+from app.core.metrics import metrics
+from app.models.models import ConcertPopularity
+
+
+def _tau() -> float:
+    return settings.popularity_half_life_hours * 3600 / math.log(2)
+
+
+def log_weight(views: int, at: datetime) -> float:
+    """Логарифм веса views просмотров в момент at."""
+    return math.log(views) + at.timestamp() / _tau()
+
+
+def decayed_score(log_score: float, now: Optional[datetime] = None) -> float:
+    """Текущий рейтинг по сохранённому log_score.
+
+    Args:
+        log_score (float): Логарифм рейтинга
+        now (datetime | None): Текущее время
+
+    Returns:
+        float: Рейтинг - число просмотров с учётом затухания
+    """
+    now = now or datetime.now(timezone.utc)
+    return math.exp(log_score - now.timestamp() / _tau())
+
+
+class ViewCounter:
+    """Шардированные счётчики просмотров в памяти воркера."""
+
+    def __init__(self, shards: Optional[int] = None):
+        count = shards or settings.popularity_shards
+        self._shards: List[Tuple[threading.Lock, Counter]] = [
+            (threading.Lock(), Counter()) for _ in range(count)
+        ]
+        self._local = threading.local()
+        self._next_shard = itertools.count()
+
+    def _shard(self) -> Tuple[threading.Lock, Counter]:
+        # get_ident() - выровненный адрес потока, и остаток от деления на
+        # число шардов почти всегда нулевой; поэтому шарды раздаются по кругу.
+        index = getattr(self._local, "index", None)
+        if index is None:
+            index = self._local.index = next(self._next_shard) % len(self._shards)
+        return self._shards[index]
+
+    def hit(self, concert_id: int) -> None:
+        """Учитывает просмотр концерта."""
+        lock, counts = self._shard()
+        with lock:
+            new_key = concert_id not in counts
+            counts[concert_id] += 1
+        if new_key and self.pending_keys() >= settings.popularity_flush_max_keys:
+            view_flusher.notify()
+
+    def drain(self) -> Counter:
+        """Забирает накопленные приращения из всех шардов."""
+        drained: Counter = Counter()
+        for lock, counts in self._shards:
+            with lock:
+                drained.update(counts)
+                counts.clear()
+        return drained
+
+    def restore(self, counts: Dict[int, int]) -> None:
+        """Возвращает несохранённые приращения, чтобы записать их позже."""
+        lock, shard = self._shards[0]
+        with lock:
+            shard.update(counts)
+
+    def pending_keys(self) -> int:
+        """Количество несохранённых записей концертов во всех шардах."""
+        return sum(len(counts) for _, counts in self._shards)
+
+    def pending(self) -> int:
+        """Количество несохранённых просмотров."""
+        total = 0
+        for lock, counts in self._shards:
+            with lock:
+                total += sum(counts.values())
+        return total
+
+    def flush(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Записывает накопленные просмотры одним пакетным UPSERT.
+
+        Args:
+            db (Session): Сессия базы данных
+            now (datetime | None): Время просмотров
+
+        Returns:
+            int: Количество записанных просмотров
+        """
+        counts = self.drain()
+        if not counts:
+            return 0
+        now = now or datetime.now(timezone.utc)
+        statement = insert(ConcertPopularity)
+        current, added = ConcertPopularity.log_score, statement.excluded.log_score
+        high, low = func.max(current, added), func.min(current, added)
+        statement = statement.on_conflict_do_update(
+            index_elements=[ConcertPopularity.concert_id],
+            set_={
+                "views": ConcertPopularity.views + statement.excluded.views,
+                # ln(e^a + e^b) без переполнения.
+                "log_score": high + func.ln(1 + func.exp(low - high)),
+                "updated_at": statement.excluded.updated_at,
+            }
+        )
+        try:
+            db.execute(statement, [
+                {"concert_id": concert_id, "views": views,
+                 "log_score": log_weight(views, now), "updated_at": now}
+                for concert_id, views in sorted(counts.items())
+            ])
+            db.commit()
+        except Exception:
+            db.rollback()
+            self.restore(counts)
+            raise
+        total = sum(counts.values())
+        metrics.inc("concert_views_flushed_total", total)
+        return total
+
+
+view_counter = ViewCounter()
+metrics.gauge("concert_views_pending", view_counter.pending,
+              "Просмотры концертов, ещё не записанные в базу")
+
+
+class ViewFlusher(BackgroundWorker):
+    """Фоновая задача, записывающая накопленные просмотры."""
+
+    name = "view-flusher"
+
+    def run_once(self, db: Session) -> Optional[float]:
+        view_counter.flush(db)
+        return None
+
+    async def stop(self) -> None:
+        """Останавливает задачу и записывает оставшиеся просмотры."""
+        started = self._task is not None
+        await super().stop()
+        if started:
+            await asyncio.to_thread(self._tick)
+
+
+view_flusher = ViewFlusher(max_sleep=settings.popularity_flush_seconds)
@@ -0,0 +1,325 @@
+"""Профилирование запросов по требованию и контроль блокировок цикла событий.
+
+ProfilingMiddleware профилирует запрос, если пришёл заголовок X-Profile
+со значением settings.profiling_token или запрос попал в выборку
+profiling_sample_rate. Профиль собирается сэмплированием стеков: фоновый
+поток раз в profiling_interval_ms снимает стеки потоков, которые сейчас
+выполняют код профилируемого запроса. Поток пула попадает в профиль на
+время каждого вызова, запущенного в контексте запроса: anyio выполняет
+вызов пула через context.run() с копией контекста, и сэмплер находит в
+ней профиль запроса. Поток цикла событий сэмплируется, пока в нём
+выполняется задача запроса; простой цикла и чужие задачи в профиль не
+попадают. Вместе со стеками записываются длительности SQL-запросов.
+Последние profiling_keep профилей доступны в /debug/profiles.
+
+LoopLagMonitor следит за циклом событий и пулом потоков: отдельный поток
+проверяет, что цикл обновляет метку времени не реже loop_lag_threshold_ms,
+иначе пишет в журнал стек потока цикла в момент блокировки; пробная
+задача в пуле потоков, не стартовавшая за тот же порог, означает
+исчерпанный пул, и в журнал пишутся стеки всех потоков.
+"""
+
+# Стандартные библиотеки
+import asyncio
+import hmac
+import itertools
+import logging
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from contextvars import Context, ContextVar
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+# Сторонние библиотеки
+import anyio
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Локальные модули
+from app.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+_MAX_STACK_DEPTH = 64
+
+
+@dataclass
+class RequestProfile:
+    """Профиль одного запроса."""
+
+    id: int
+    method: str
+    path: str
+    started_at: float
+    duration_ms: float = 0.0
+    status_code: Optional[int] = None
+    samples: Counter = field(default_factory=Counter)
+    sql: List[dict] = field(default_factory=list)
+    loop_thread: Optional[int] = None
+    loop: Optional[asyncio.AbstractEventLoop] = None
+    task: Optional[asyncio.Task] = None
+
+    def summary(self) -> dict:
+        """Краткие сведения для списка профилей."""
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "duration_ms": round(self.duration_ms, 2),
+            "samples": sum(self.samples.values()),
+            "sql_count": len(self.sql),
+            "sql_ms": round(sum(item["duration_ms"] for item in self.sql), 2),
+        }
+
+    def render(self) -> str:
+        """Текстовый отчёт: SQL-запросы и стеки в свёрнутом формате flamegraph."""
+        summary = self.summary()
+        lines = [f"# {summary['method']} {summary['path']} -> {summary['status_code']}",
+                 f"# duration_ms={summary['duration_ms']} sql_count={summary['sql_count']}"
+                 f" sql_ms={summary['sql_ms']} samples={summary['samples']}",
+                 "", "## SQL"]
+        for item in sorted(self.sql, key=lambda item: -item["duration_ms"]):
+            lines.append(f"{item['duration_ms']:.2f} ms  {item['statement']}")
+        lines += ["", "## Стеки (свёрнутый формат, интервал "
+                      f"{settings.profiling_interval_ms} мс)"]
+        for stack, count in self.samples.most_common():
+            lines.append(f"{stack} {count}")
+        return "\n".join(lines) + "\n"
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+def _worker_context(frame) -> Optional[Context]:
+    """Возвращает контекст, в котором рабочий поток пула выполняет вызов.
+
+    Рабочий поток anyio вызывает функцию через context.run() из своего
+    метода run - кадра, вызванного непосредственно из _bootstrap_inner.
+    """
+    while frame is not None:
+        back = frame.f_back
+        if back is not None and back.f_code.co_name == "_bootstrap_inner":
+            context = frame.f_locals.get("context")
+            return context if isinstance(context, Context) else None
+        frame = back
+    return None
+
+
+def _format_stack(frame) -> str:
+    names = []
+    while frame is not None and len(names) < _MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class Profiler:
+    """Сэмплирующий профилировщик и хранилище последних профилей."""
+
+    def __init__(self):
+        self._active: Dict[int, RequestProfile] = {}
+        self._finished: Deque[RequestProfile] = deque(maxlen=settings.profiling_keep)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def should_profile(self, scope: dict) -> bool:
+        """Решает, профилировать ли запрос."""
+        if settings.profiling_token:
+            expected = settings.profiling_token.encode("latin-1")
+            for key, value in scope.get("headers", ()):
+                if key == PROFILE_HEADER and hmac.compare_digest(value, expected):
+                    return True
+        return settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate
+
+    def begin(self, method: str, path: str) -> RequestProfile:
+        """Начинает профиль запроса; вызывающий устанавливает его в контекст."""
+        try:
+            loop, task = asyncio.get_running_loop(), asyncio.current_task()
+        except RuntimeError:
+            loop, task = None, None
+        profile = RequestProfile(next(self._ids), method, path, time.perf_counter(),
+                                 loop_thread=threading.get_ident(), loop=loop, task=task)
+        with self._lock:
+            self._active[profile.id] = profile
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._sample, name="profiler", daemon=True)
+                self._thread.start()
+        return profile
+
+    def end(self, profile: RequestProfile) -> None:
+        """Завершает профиль и сохраняет его."""
+        profile.duration_ms = (time.perf_counter() - profile.started_at) * 1000
+        with self._lock:
+            self._active.pop(profile.id, None)
+            profile.loop = profile.task = None
+            self._finished.append(profile)
+        metrics.inc("profiles_captured_total")
+
+    def profiles(self) -> List[RequestProfile]:
+        """Последние сохранённые профили, новые первыми."""
+        with self._lock:
+            return list(reversed(self._finished))
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        """Возвращает сохранённый профиль по ID."""
+        with self._lock:
+            return next((item for item in self._finished if item.id == profile_id), None)
+
+    def _sample(self) -> None:
+        interval = settings.profiling_interval_ms / 1000
+        while True:
+            with self._lock:
+                active = list(self._active.values())
+                if not active:
+                    self._thread = None
+                    return
+            frames = sys._current_frames()  # pylint: disable=protected-access
+            contexts = {thread_id: _worker_context(frame) for thread_id, frame in frames.items()}
+            for profile in active:
+                loop, task = profile.loop, profile.task
+                loop_frame = frames.get(profile.loop_thread)
+                # Задача, шаг которой сейчас выполняет цикл; None - цикл простаивает.
+                if None not in (loop, task, loop_frame) and asyncio.current_task(loop) is task:
+                    profile.samples[_format_stack(loop_frame)] += 1
+                for thread_id, context in contexts.items():
+                    if context is not None and context.get(_current) is profile:
+                        profile.samples[_format_stack(frames[thread_id])] += 1
+            time.sleep(interval)
+
+
+profiler = Profiler()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, _cursor, statement, _parameters, _context, _executemany):
+    profile = _current.get()
+    started = conn.info.get("profile_started")
+    if profile is not None and started:
+        profile.sql.append({
+            "statement": " ".join(statement.split())[:500],
+            "duration_ms": (time.perf_counter() - started.pop()) * 1000,
+        })
+
+
+class ProfilingMiddleware:
+    """ASGI-middleware, включающее профилирование для выбранных запросов."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not profiler.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = profiler.begin(scope["method"], scope["path"])
+        token = _current.set(profile)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", str(profile.id).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _current.reset(token)
+            profiler.end(profile)
+
+
+def _all_stacks() -> str:
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    parts = []
+    for thread_id, frame in sys._current_frames().items():  # pylint: disable=protected-access
+        parts.append(f"Поток {names.get(thread_id, thread_id)}:\n"
+                     + "".join(traceback.format_stack(frame)))
+    return "\n".join(parts)
+
+
+class LoopLagMonitor:
+    """Обнаружение блокировок цикла событий и исчерпания пула потоков."""
+
+    def __init__(self):
+        self._tasks: List[asyncio.Task] = []
+        self._stopped = threading.Event()
+        self._heartbeat = time.monotonic()
+        self._loop_thread: Optional[int] = None
+
+    def start(self) -> None:
+        """Запускает мониторинг в текущем цикле событий."""
+        if self._tasks or not settings.loop_monitor_enabled:
+            return
+        self._stopped.clear()
+        self._heartbeat = time.monotonic()
+        self._loop_thread = threading.get_ident()
+        self._tasks = [
+            asyncio.create_task(self._beat(), name="loop-heartbeat"),
+            asyncio.create_task(self._probe_thread_pool(), name="thread-pool-probe"),
+        ]
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+
+    async def stop(self) -> None:
+        """Останавливает мониторинг."""
+        self._stopped.set()
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def _beat(self) -> None:
+        while True:
+            self._heartbeat = time.monotonic()
+            await asyncio.sleep(settings.loop_lag_threshold_ms / 4000)
+
+    async def _probe_thread_pool(self) -> None:
+        threshold = settings.loop_lag_threshold_ms / 1000
+        while True:
+            await asyncio.sleep(threshold)
+            started = time.monotonic()
+            await anyio.to_thread.run_sync(time.monotonic)
+            waited = time.monotonic() - started
+            if waited > threshold:
+                metrics.inc("threadpool_stall_events_total")
+                logger.warning("Пул потоков занят: пробная задача ждала %.0f мс\n%s",
+                               waited * 1000, _all_stacks())
+
+    def _watch(self) -> None:
+        threshold = settings.loop_lag_threshold_ms / 1000
+        reported = False
+        while not self._stopped.wait(threshold / 2):
+            lag = time.monotonic() - self._heartbeat
+            if lag <= threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+            reported = True
+            metrics.inc("event_loop_blocked_total")
+            frame = sys._current_frames().get(self._loop_thread)  # pylint: disable=protected-access
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            logger.warning("Цикл событий заблокирован дольше %.0f мс:\n%s", lag * 1000, stack)
+
+
+loop_monitor = LoopLagMonitor()
@@ -0,0 +1,271 @@
+"""Ограничение частоты запросов и сброс нагрузки.
+
+RateLimitMiddleware - чистое ASGI-middleware (не буферизует ответы):
+
+* Token bucket на каждую пару (класс маршрута, IP) и (класс маршрута,
+  пользователь). Классы: auth (вход и регистрация), search (поиск
+  концертов), write (изменяющие методы) и read (остальное). Корзины
+  хранятся в LRU-словаре ограниченного размера. При нехватке токенов
+  возвращается 429 с Retry-After. Каждый подзапрос POST /batch
+  списывается с тех же корзин по своему классу (charge).
+* Глобальный лимит одновременно обрабатываемых запросов. Если запрос не
+  получает слот за queue_budget_ms, он отклоняется с 503 и Retry-After.
+
+Потоковые маршруты (SSE, WebSocket) не занимают слоты конкурентности.
+"""
+
+# Стандартные библиотеки
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Hashable, Optional, Tuple
+
+# Сторонние библиотеки
+import jwt
+from jwt.exceptions import InvalidTokenError
+
+# Локальные модули
+from app.config import settings
+from app.core.metrics import metrics
+
+AUTH = "auth"
+SEARCH = "search"
+WRITE = "write"
+READ = "read"
+
+_STREAMING_PREFIXES = ("/concerts/stream",)
+_EXEMPT_PATHS = ("/metrics", "/docs", "/redoc", "/openapi.json")
+
+
+class TokenBucketStore:
+    """LRU-хранилище token bucket с ограниченным числом ключей."""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: Hashable, rate: float, capacity: float, now: Optional[float] = None) -> float:
+        """Пытается взять токен.
+
+        Args:
+            key (Hashable): Ключ корзины
+            rate (float): Скорость пополнения, токенов в секунду
+            capacity (float): Ёмкость корзины
+            now (float | None): Текущее время (monotonic)
+
+        Returns:
+            float: 0, если токен взят, иначе сколько секунд ждать следующего
+        """
+        now = time.monotonic() if now is None else now
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        if tokens >= 1:
+            self._store(key, tokens - 1, now)
+            return 0.0
+        self._store(key, tokens, now)
+        return (1 - tokens) / rate
+
+    def _store(self, key: Hashable, tokens: float, now: float) -> None:
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+            metrics.inc("rate_limit_evictions_total")
+
+    def clear(self) -> None:
+        """Удаляет все корзины."""
+        self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class ConcurrencyLimiter:
+    """Ограничение числа одновременно обрабатываемых запросов с бюджетом ожидания."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self, timeout: float) -> bool:
+        """Занимает слот, ожидая не дольше timeout секунд.
+
+        Returns:
+            bool: True, если слот получен
+        """
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return True
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                return True
+            waiter.cancel()
+            return False
+        except BaseException:
+            # Задачу отменили: слот, который release() уже передал ей,
+            # возвращается, иначе он потерян навсегда.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                waiter.cancel()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        """Освобождает слот, передавая его первому ожидающему."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    @property
+    def queued(self) -> int:
+        """Количество ожидающих запросов."""
+        return len(self._waiters)
+
+
+def route_class(method: str, path: str) -> str:
+    """Определяет класс маршрута для лимитов."""
+    if path.startswith("/auth/"):
+        return AUTH
+    if path.startswith("/concerts/filter"):
+        return SEARCH
+    if method not in ("GET", "HEAD", "OPTIONS"):
+        return WRITE
+    return READ
+
+
+def _limits() -> Dict[str, Tuple[float, float]]:
+    per_minute = {
+        AUTH: settings.rate_limit_auth_per_minute,
+        SEARCH: settings.rate_limit_search_per_minute,
+        WRITE: settings.rate_limit_write_per_minute,
+        READ: settings.rate_limit_read_per_minute,
+    }
+    return {
+        name: (limit / 60.0, max(1.0, limit * settings.rate_limit_burst_seconds / 60.0))
+        for name, limit in per_minute.items()
+    }
+
+
+def _header(scope: dict, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def client_ip(scope: dict) -> str:
+    """Возвращает IP клиента с учётом X-Forwarded-For, если ему доверяем."""
+    if settings.rate_limit_trust_forwarded:
+        forwarded = _header(scope, b"x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def token_subject(scope: dict) -> Optional[str]:
+    """Возвращает email пользователя из валидного Bearer-токена."""
+    authorization = _header(scope, b"authorization")
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    try:
+        payload = jwt.decode(authorization[7:], settings.secret_key, algorithms=[settings.algo])
+    except InvalidTokenError:
+        return None
+    return payload.get("sub")
+
+
+# Корзины общие для middleware и подзапросов POST /batch (app.core.batch).
+buckets = TokenBucketStore(settings.rate_limit_max_keys)
+
+
+def charge(scope: dict, kind: str) -> float:
+    """Списывает токен запроса класса kind с корзин IP и пользователя.
+
+    Args:
+        scope (dict): ASGI scope запроса (IP и заголовок Authorization)
+        kind (str): Класс маршрута (route_class)
+
+    Returns:
+        float: 0, если запрос разрешён, иначе Retry-After в секундах
+    """
+    rate, capacity = _limits()[kind]
+    keys = [(kind, "ip", client_ip(scope))]
+    subject = token_subject(scope)
+    if subject:
+        keys.append((kind, "user", subject))
+    retry_after = max(buckets.take(key, rate, capacity) for key in keys)
+    metrics.inc("rate_limit_rejected_total" if retry_after else "rate_limit_allowed_total",
+                route_class=kind)
+    return retry_after
+
+
+async def _reject(send, status_code: int, retry_after: float, detail: str) -> None:
+    body = json.dumps({"detail": detail}, ensure_ascii=False).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class RateLimitMiddleware:
+    """ASGI-middleware ограничения частоты и конкурентности запросов."""
+
+    def __init__(self, app):
+        self.app = app
+        self.concurrency = ConcurrencyLimiter(settings.max_concurrent_requests)
+        metrics.gauge("rate_limit_tracked_keys", lambda: len(buckets),
+                      "Количество корзин token bucket в памяти")
+        metrics.gauge("http_requests_in_flight", lambda: self.concurrency.in_flight,
+                      "Запросы в обработке")
+        metrics.gauge("http_requests_queued", lambda: self.concurrency.queued,
+                      "Запросы, ожидающие слота обработки")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.rate_limit_enabled:
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        if path in _EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        kind = route_class(scope["method"], path)
+        retry_after = charge(scope, kind)
+        if retry_after:
+            await _reject(send, 429, retry_after, "Слишком много запросов, повторите позже")
+            return
+
+        if path.startswith(_STREAMING_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.concurrency.acquire(settings.queue_budget_ms / 1000):
+            metrics.inc("load_shed_total", route_class=kind)
+            await _reject(send, 503, settings.queue_budget_ms / 1000,
+                          "Сервер перегружен, повторите позже")
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.concurrency.release()
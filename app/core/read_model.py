@@ -0,0 +1,382 @@
+"""Поддержка денормализованной модели чтения концертов.
+
+Строки таблицы concert_read_model пересобираются в обработчике after_flush,
+то есть в той же транзакции, что и изменения концертов, композиторов,
+инструментов и ассоциативных таблиц, а после фиксации транзакции
+сбрасывается кэш "concerts". Вместе со строками обновляются счётчики
+(app.core.counters) и журнал инвалидации кэшей других воркеров
+(app.core.invalidation). Массовые UPDATE/DELETE в обход ORM должны
+вызывать sync_bulk_changes (или sync_concerts и cache.invalidate)
+самостоятельно, а перед удалением концертов - delete_bookmarks.
+
+Восстановление после сбоя:
+    python -m app.core.read_model
+"""
+
+# Стандартные библиотеки
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Iterable, Set, Tuple
+
+# Сторонние библиотеки
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+# Локальные модули
+from app.core import cache, counters, invalidation
+from app.models.models import (ArchivedConcert, ArchivedConcertComposer, Bookmark, Composer,
+                               Concert, ConcertComposer, ConcertCounter, ConcertInstrument,
+                               ConcertReadModel, ConcertReadModelItem, Instrument)
+
+_BATCH_SIZE = 500
+
+
+def _id_list(ids: Iterable[int]) -> str:
+    """Кодирует список ID в строку вида ",1,2,"."""
+    return "," + "".join(f"{item_id}," for item_id in ids)
+
+
+def sync_concerts(connection: Connection, concert_ids: Iterable[int]) -> None:
+    """Пересобирает строки модели чтения для указанных концертов.
+
+    Удалённые концерты удаляются и из модели чтения.
+
+    Args:
+        connection (Connection): Соединение текущей транзакции
+        concert_ids (Iterable[int]): ID концертов
+    """
+    ids = sorted({concert_id for concert_id in concert_ids if concert_id is not None})
+    for start in range(0, len(ids), _BATCH_SIZE):
+        _sync_batch(connection, ids[start:start + _BATCH_SIZE])
+    invalidation.record(connection, invalidation.CONCERTS, ids)
+
+
+def _sync_batch(connection: Connection, ids: list) -> None:
+    concerts = connection.execute(
+        select(Concert.__table__).where(Concert.id.in_(ids))
+    ).mappings().all()
+
+    composers = defaultdict(list)
+    for row in connection.execute(
+        select(ConcertComposer.concert_id, Composer.id, Composer.name,
+               Composer.birth_year, Composer.death_year)
+        .join(Composer, Composer.id == ConcertComposer.composer_id)
+        .where(ConcertComposer.concert_id.in_(ids))
+        .order_by(Composer.id)
+    ):
+        composers[row.concert_id].append({
+            "id": row.id,
+            "name": row.name,
+            "birth_year": row.birth_year,
+            "death_year": row.death_year
+        })
+
+    instruments = defaultdict(list)
+    for row in connection.execute(
+        select(ConcertInstrument.concert_id, Instrument.id, Instrument.name)
+        .join(Instrument, Instrument.id == ConcertInstrument.instrument_id)
+        .where(ConcertInstrument.concert_id.in_(ids))
+        .order_by(Instrument.id)
+    ):
+        instruments[row.concert_id].append({"id": row.id, "name": row.name})
+
+    old_rows = connection.execute(
+        select(ConcertReadModel.id, ConcertReadModel.organization_id,
+               ConcertReadModel.current_status,
+               ConcertReadModel.date, ConcertReadModel.composer_ids)
+        .where(ConcertReadModel.id.in_(ids))
+    ).mappings().all()
+    connection.execute(
+        delete(ConcertReadModelItem).where(ConcertReadModelItem.concert_id.in_(ids))
+    )
+    connection.execute(delete(ConcertReadModel).where(ConcertReadModel.id.in_(ids)))
+
+    rows = []
+    items = []
+    for concert in concerts:
+        concert_composers = composers[concert["id"]]
+        concert_instruments = instruments[concert["id"]]
+        search_parts = [concert["title"], concert["location"]]
+        search_parts += [item["name"] for item in concert_composers]
+        search_parts += [item["name"] for item in concert_instruments]
+        rows.append({
+            "id": concert["id"],
+            "title": concert["title"],
+            "date": concert["date"],
+            "description": concert["description"],
+            "price_type": concert["price_type"],
+            "price_amount": concert["price_amount"],
+            "location": concert["location"],
+            "current_status": concert["current_status"],
+            "organization_id": concert["organization_id"],
+            "venue_id": concert["venue_id"],
+            "composers": concert_composers,
+            "instruments": concert_instruments,
+            "composer_ids": _id_list(item["id"] for item in concert_composers),
+            "instrument_ids": _id_list(item["id"] for item in concert_instruments),
+            "search_text": " ".join(part for part in search_parts if part).casefold(),
+        })
+        items += [{"concert_id": concert["id"], "kind": kind, "item_id": item["id"]}
+                  for kind, kind_items in ((ConcertReadModelItem.COMPOSER, concert_composers),
+                                           (ConcertReadModelItem.INSTRUMENT, concert_instruments))
+                  for item in kind_items]
+    if rows:
+        connection.execute(insert(ConcertReadModel), rows)
+    if items:
+        connection.execute(insert(ConcertReadModelItem), items)
+    deltas = counters.concert_deltas(old_rows, rows)
+    deltas.update(counters.bookmark_status_deltas(connection, old_rows, rows))
+    counters.apply_deltas(connection, deltas)
+
+
+def _affected_concert_ids(session: Session) -> Set[int]:
+    """Собирает ID концертов, затронутых текущим flush."""
+    concert_ids: Set[int] = set()
+    composer_ids: Set[int] = set()
+    instrument_ids: Set[int] = set()
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Concert):
+            concert_ids.add(obj.id)
+        elif isinstance(obj, (ConcertComposer, ConcertInstrument)):
+            concert_ids.add(obj.concert_id)
+        elif isinstance(obj, Composer) and obj not in session.new:
+            composer_ids.add(obj.id)
+        elif isinstance(obj, Instrument) and obj not in session.new:
+            instrument_ids.add(obj.id)
+
+    connection = session.connection()
+    if composer_ids:
+        concert_ids.update(connection.scalars(
+            select(ConcertComposer.concert_id)
+            .where(ConcertComposer.composer_id.in_(composer_ids))
+        ))
+    if instrument_ids:
+        concert_ids.update(connection.scalars(
+            select(ConcertInstrument.concert_id)
+            .where(ConcertInstrument.instrument_id.in_(instrument_ids))
+        ))
+    concert_ids.discard(None)
+    return concert_ids
+
+
+def sync_bulk_changes(session: Session, concert_ids: Iterable[int]) -> None:
+    """Обновляет модель чтения после массового UPDATE/DELETE концертов.
+
+    Кэш концертов сбрасывается после фиксации транзакции, как и для
+    изменений через ORM.
+
+    Args:
+        session (Session): Сессия с изменениями
+        concert_ids (Iterable[int]): ID изменённых концертов
+    """
+    concert_ids = list(concert_ids)
+    if concert_ids:
+        sync_concerts(session.connection(), concert_ids)
+        session.info["concerts_changed"] = True
+
+
+def _bookmark_counter_deltas(connection: Connection,
+                             changes: Iterable[Tuple[int, int, int]]) -> Counter:
+    """Считает изменения счётчиков закладок по тройкам (пользователь, концерт, знак).
+
+    Статус берётся из модели чтения до её пересборки: закладка на концерт,
+    созданный в том же flush, будет учтена пересборкой его строки.
+    """
+    changes = list(changes)
+    deltas: Counter = Counter()
+    if not changes:
+        return deltas
+    statuses = _concert_statuses(connection, [concert_id for _, concert_id, _ in changes])
+    for user_id, concert_id, sign in changes:
+        deltas[(counters.GLOBAL_SCOPE, counters.BOOKMARKED, str(concert_id))] += sign
+        if concert_id in statuses:
+            deltas[(counters.user_scope(user_id), counters.BOOKMARKS, statuses[concert_id])] += sign
+    return deltas
+
+
+def insert_bookmark(connection: Connection, user_id: int, concert_id: int) -> bool:
+    """Добавляет закладку, если её ещё нет, вместе с её вкладом в счётчики.
+
+    INSERT ... ON CONFLICT DO NOTHING не падает, если ту же закладку
+    одновременно добавляет другой запрос.
+
+    Args:
+        connection (Connection): Соединение текущей транзакции
+        user_id (int): ID слушателя
+        concert_id (int): ID концерта
+
+    Returns:
+        bool: True, если закладка добавлена этим вызовом
+    """
+    inserted = connection.execute(
+        sqlite_insert(Bookmark)
+        .values(user_id=user_id, concert_id=concert_id)
+        .on_conflict_do_nothing(index_elements=[Bookmark.user_id, Bookmark.concert_id])
+        .returning(Bookmark.concert_id)
+    ).first() is not None
+    if inserted:
+        counters.apply_deltas(connection, _bookmark_counter_deltas(
+            connection, [(user_id, concert_id, 1)]
+        ))
+    return inserted
+
+
+def delete_bookmarks(connection: Connection, concert_ids: Iterable[int]) -> None:
+    """Удаляет закладки на удаляемые концерты вместе с их вкладом в счётчики.
+
+    Вызывается до удаления концертов и пересборки модели чтения, пока
+    известен статус концертов.
+
+    Args:
+        connection (Connection): Соединение текущей транзакции
+        concert_ids (Iterable[int]): ID концертов
+    """
+    concert_ids = list(concert_ids)
+    if not concert_ids:
+        return
+    removed = connection.execute(
+        delete(Bookmark).where(Bookmark.concert_id.in_(concert_ids))
+        .returning(Bookmark.user_id, Bookmark.concert_id)
+    ).all()
+    counters.apply_deltas(connection, _bookmark_counter_deltas(
+        connection, [(user_id, concert_id, -1) for user_id, concert_id in removed]
+    ))
+
+
+def _concert_statuses(connection: Connection, concert_ids: Iterable[int]) -> dict:
+    concert_ids = set(concert_ids)
+    if not concert_ids:
+        return {}
+    return dict(connection.execute(
+        select(ConcertReadModel.id, ConcertReadModel.current_status)
+        .where(ConcertReadModel.id.in_(concert_ids))
+    ).all())
+
+
+def _bookmark_deltas(session: Session) -> Counter:
+    """Считает изменения счётчиков закладок в текущем flush."""
+    return _bookmark_counter_deltas(session.connection(), [
+        (obj.user_id, obj.concert_id, sign)
+        for objects, sign in ((session.new, 1), (session.deleted, -1))
+        for obj in objects if isinstance(obj, Bookmark)
+    ])
+
+
+def _catalog_deltas(session: Session) -> Counter:
+    """Считает изменения размеров справочников в текущем flush."""
+    deltas: Counter = Counter()
+    for objects, sign in ((session.new, 1), (session.deleted, -1)):
+        for obj in objects:
+            if isinstance(obj, Composer):
+                deltas[(counters.GLOBAL_SCOPE, counters.CATALOG, counters.COMPOSERS_KEY)] += sign
+            elif isinstance(obj, Instrument):
+                deltas[(counters.GLOBAL_SCOPE, counters.CATALOG, counters.INSTRUMENTS_KEY)] += sign
+    return deltas
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_after_flush(session: Session, _flush_context) -> None:
+    """Обновляет модель чтения и счётчики в транзакции текущего flush."""
+    bookmark_deltas = _bookmark_deltas(session)
+    if bookmark_deltas:
+        counters.apply_deltas(session.connection(), bookmark_deltas)
+    concert_ids = _affected_concert_ids(session)
+    if concert_ids:
+        sync_concerts(session.connection(), concert_ids)
+        session.info["concerts_changed"] = True
+    catalog_deltas = _catalog_deltas(session)
+    if catalog_deltas:
+        counters.apply_deltas(session.connection(), catalog_deltas)
+    invalidation.record_catalog(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    """Сбрасывает кэши концертов после фиксации изменений."""
+    if session.info.pop("concerts_changed", False):
+        cache.invalidate("concerts")
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop("concerts_changed", None)
+
+
+def rebuild_all(db: Session) -> int:
+    """Полностью пересобирает модель чтения по нормализованным таблицам.
+
+    Args:
+        db (Session): Сессия базы данных
+
+    Returns:
+        int: Количество пересобранных концертов
+    """
+    connection = db.connection()
+    connection.execute(delete(ConcertReadModelItem))
+    connection.execute(delete(ConcertReadModel))
+    connection.execute(delete(ConcertCounter))
+    concert_ids = list(connection.scalars(select(Concert.id).order_by(Concert.id)))
+    sync_concerts(connection, concert_ids)
+    counters.apply_deltas(connection, {
+        (counters.GLOBAL_SCOPE, counters.CATALOG, key): connection.scalar(
+            select(func.count()).select_from(model)
+        )
+        for key, model in ((counters.COMPOSERS_KEY, Composer),
+                           (counters.INSTRUMENTS_KEY, Instrument))
+    })
+    counters.apply_deltas(connection, counters.archived_deltas(connection.execute(
+        select(ArchivedConcert.organization_id, ArchivedConcert.current_status,
+               ArchivedConcert.date,
+               func.group_concat(ArchivedConcertComposer.composer_id).label("composer_ids"))
+        .outerjoin(ArchivedConcertComposer,
+                   ArchivedConcertComposer.concert_id == ArchivedConcert.id)
+        .group_by(ArchivedConcert.id)
+    ).mappings()))
+    # Закладки пользователей по статусам пересчитаны sync_concerts.
+    counters.apply_deltas(connection, {
+        (counters.GLOBAL_SCOPE, counters.BOOKMARKED, str(concert_id)): count
+        for concert_id, count in connection.execute(
+            select(Bookmark.concert_id, func.count()).group_by(Bookmark.concert_id)
+        )
+    })
+    db.commit()
+    return len(concert_ids)
+
+
+def ensure_populated(db: Session) -> None:
+    """Пересобирает модель чтения, если она рассинхронизирована с концертами.
+
+    Args:
+        db (Session): Сессия базы данных
+    """
+    concerts_count = db.scalar(select(func.count()).select_from(Concert))
+    read_count = db.scalar(select(func.count()).select_from(ConcertReadModel))
+    # Таблица элементов появилась позже модели чтения и в старых базах пуста.
+    items_missing = (
+        db.scalar(select(ConcertReadModelItem.concert_id).limit(1)) is None
+        and any(db.scalar(select(model.concert_id).join(
+            ConcertReadModel, ConcertReadModel.id == model.concert_id
+        ).limit(1)) is not None for model in (ConcertComposer, ConcertInstrument))
+    )
+    has_counters = db.scalar(
+        select(ConcertCounter.scope)
+        .where(ConcertCounter.scope == counters.GLOBAL_SCOPE,
+               ConcertCounter.metric == counters.CATALOG)
+        .limit(1)
+    ) is not None
+    if concerts_count != read_count or items_missing or not has_counters:
+        rebuild_all(db)
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal, init_database
+
+    init_database()
+    session = SessionLocal()
+    try:
+        print(f"Пересобрано концертов: {rebuild_all(session)}")
+    finally:
+        session.close()
@@ -0,0 +1,115 @@
+"""Фоновый планировщик, переводящий прошедшие концерты в статус 'completed'."""
+
+# Стандартные библиотеки
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+# Сторонние библиотеки
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+# Локальные модули
+from app.config import settings
+from app.core import cache
+from app.core.background import BackgroundWorker
+from app.core.read_model import sync_concerts
+from app.models.models import Concert, ConcertStatus
+
+logger = logging.getLogger(__name__)
+
+
+def complete_past_concerts(
+        db: Session,
+        now: Optional[datetime] = None,
+        batch_size: Optional[int] = None
+) -> int:
+    """Переводит прошедшие предстоящие концерты в статус 'completed'.
+
+    Обновление выполняется пачками: один UPDATE по списку ID и пересборка
+    строк модели чтения (вместе со счётчиками) для той же пачки. Каждая
+    пачка фиксируется отдельно, чтобы не держать долгую блокировку записи.
+    Условие по статусу делает операцию идемпотентной, поэтому её можно
+    безопасно запускать одновременно в нескольких воркерах.
+
+    Args:
+        db (Session): Сессия базы данных
+        now (datetime | None): Момент времени, с которым сравнивается дата
+        batch_size (int | None): Размер пачки
+
+    Returns:
+        int: Количество обновлённых концертов
+    """
+    now = now or datetime.now(timezone.utc)
+    batch_size = batch_size or settings.status_scheduler_batch_size
+    total = 0
+
+    while True:
+        batch_ids = db.scalars(
+            select(Concert.id)
+            .where(Concert.current_status == ConcertStatus.UPCOMING.value,
+                   Concert.date < now)
+            .limit(batch_size)
+        ).all()
+        if not batch_ids:
+            break
+
+        result = db.execute(
+            update(Concert)
+            .where(Concert.id.in_(batch_ids),
+                   Concert.current_status == ConcertStatus.UPCOMING.value)
+            .values(current_status=ConcertStatus.COMPLETED.value)
+            .execution_options(synchronize_session=False)
+        )
+        sync_concerts(db.connection(), batch_ids)
+        db.commit()
+        total += result.rowcount
+        if len(batch_ids) < batch_size:
+            break
+
+    if total:
+        db.expire_all()
+        cache.invalidate("concerts")
+        logger.info("Завершено концертов: %s", total)
+    return total
+
+
+def next_concert_date(db: Session) -> Optional[datetime]:
+    """Возвращает дату ближайшего предстоящего концерта.
+
+    Args:
+        db (Session): Сессия базы данных
+
+    Returns:
+        datetime | None: Дата в UTC или None, если предстоящих концертов нет
+    """
+    next_date = db.scalar(
+        select(func.min(Concert.date))
+        .where(Concert.current_status == ConcertStatus.UPCOMING.value)
+    )
+    if next_date is not None and next_date.tzinfo is None:
+        next_date = next_date.replace(tzinfo=timezone.utc)
+    return next_date
+
+
+class ConcertStatusScheduler(BackgroundWorker):
+    """Фоновая задача, которая просыпается к началу ближайшего концерта.
+
+    Вместо периодического опроса планировщик спит до даты ближайшего
+    предстоящего концерта (но не дольше max_sleep секунд). Роутеры вызывают
+    notify(), когда появляется концерт с более ранней датой.
+    """
+
+    name = "concert-status-scheduler"
+
+    def run_once(self, db: Session) -> Optional[float]:
+        complete_past_concerts(db)
+        next_date = next_concert_date(db)
+        if next_date is None:
+            return None
+        return (next_date - datetime.now(timezone.utc)).total_seconds() + 1.0
+
+
+status_scheduler = ConcertStatusScheduler(
+    max_sleep=settings.status_scheduler_max_sleep_seconds
+)
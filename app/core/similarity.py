@@ -0,0 +1,252 @@
+"""Похожие концерты по составу композиторов и инструментов.
+
+Концерт представлен разреженным вектором признаков: композиторы с весом
+similar_composer_weight и инструменты с весом similar_instrument_weight.
+Сходство - косинус между векторами. Матрица концерт x признак хранится
+по столбцам (инвертированный индекс признак -> концерты), поэтому строка
+сходств одного концерта со всеми считается как разреженное произведение:
+обходятся только концерты с общими признаками, а не все пары.
+
+Для каждого предстоящего концерта заранее хранятся similar_concerts_top_k
+соседей. Изменения концертов приходят из журнала инвалидации
+(app.core.invalidation) и применяются фоновой задачей инкрементально:
+у изменённого концерта строка пересчитывается, а у концертов с общими
+признаками меняется только его позиция в списке соседей; строка такого
+концерта пересчитывается целиком, лишь если изменённый концерт выпал из
+списка или его сходство уменьшилось. Индекс строит только фоновая задача
+SimilarityRefresher; пока он не построен, роутер отвечает 503.
+"""
+
+# Стандартные библиотеки
+import heapq
+import math
+import threading
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Сторонние библиотеки
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+# Локальные модули
+from app.config import settings
+from app.core.background import BackgroundWorker
+from app.models.models import ConcertReadModel, ConcertStatus
+
+COMPOSER = "composer"
+INSTRUMENT = "instrument"
+
+Feature = Tuple[str, int]
+Neighbour = Tuple[int, float]
+
+
+def _parse_ids(encoded: Optional[str]) -> List[int]:
+    return [int(item) for item in (encoded or "").split(",") if item]
+
+
+def features(composer_ids: Iterable[int], instrument_ids: Iterable[int]) -> FrozenSet[Feature]:
+    """Возвращает признаки концерта.
+
+    Args:
+        composer_ids (Iterable[int]): ID композиторов
+        instrument_ids (Iterable[int]): ID инструментов
+
+    Returns:
+        FrozenSet[Feature]: Признаки (тип, ID)
+    """
+    return frozenset([(COMPOSER, item_id) for item_id in composer_ids]
+                     + [(INSTRUMENT, item_id) for item_id in instrument_ids])
+
+
+def _weight(feature: Feature) -> float:
+    if feature[0] == COMPOSER:
+        return settings.similar_composer_weight
+    return settings.similar_instrument_weight
+
+
+def _norm(vector: FrozenSet[Feature]) -> float:
+    return math.sqrt(sum(_weight(feature) ** 2 for feature in vector))
+
+
+def _top(scores: Dict[int, float], k: int) -> List[Neighbour]:
+    return heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+class SimilarityIndex:
+    """Разреженная матрица признаков предстоящих концертов и их ближайшие соседи."""
+
+    def __init__(self):
+        self._vectors: Dict[int, FrozenSet[Feature]] = {}
+        self._norms: Dict[int, float] = {}
+        self._postings: Dict[Feature, Set[int]] = defaultdict(set)
+        self._neighbours: Dict[int, List[Neighbour]] = {}
+        self._dirty: Set[int] = set()
+        self._lock = threading.RLock()
+        self.loaded = False
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Строит матрицу и списки соседей, если они ещё не построены.
+
+        Args:
+            db (Session): Сессия базы данных
+        """
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            self._vectors, self._norms = {}, {}
+            self._postings = defaultdict(set)
+            self._dirty = set()
+            for concert_id, vector in self._load(db, None).items():
+                self._put(concert_id, vector)
+            self._neighbours = {
+                concert_id: _top(self._scores(vector, concert_id), settings.similar_concerts_top_k)
+                for concert_id, vector in self._vectors.items()
+            }
+            self.loaded = True
+
+    def reset(self) -> None:
+        """Сбрасывает индекс; следующий запуск построит его заново."""
+        with self._lock:
+            self.loaded = False
+            self._neighbours = {}
+
+    def invalidate(self, concert_ids: Optional[Iterable]) -> None:
+        """Отмечает концерты для пересчёта.
+
+        Args:
+            concert_ids (Iterable | None): ID концертов; None - все концерты
+        """
+        if concert_ids is None:
+            self.reset()
+            return
+        with self._lock:
+            self._dirty.update(int(concert_id) for concert_id in concert_ids)
+
+    def refresh(self, db: Session) -> int:
+        """Применяет отложенные изменения концертов.
+
+        Args:
+            db (Session): Сессия базы данных
+
+        Returns:
+            int: Количество применённых изменений
+        """
+        if not self.loaded:
+            self.ensure_loaded(db)
+            return 0
+        with self._lock:
+            dirty, self._dirty = sorted(self._dirty), set()
+        if not dirty:
+            return 0
+        vectors = self._load(db, dirty)
+        with self._lock:
+            for concert_id in dirty:
+                self._apply(concert_id, vectors.get(concert_id))
+        return len(dirty)
+
+    def neighbours(self, concert_id: int) -> Optional[List[Neighbour]]:
+        """Возвращает заранее посчитанных соседей концерта.
+
+        Returns:
+            List[Neighbour] | None: ID соседей и сходство по убыванию или
+            None, если концерта нет в индексе
+        """
+        with self._lock:
+            neighbours = self._neighbours.get(concert_id)
+            return list(neighbours) if neighbours is not None else None
+
+    def similar_to(self, vector: FrozenSet[Feature], exclude: Optional[int] = None) -> List[Neighbour]:
+        """Считает соседей для концерта вне индекса (прошедшего или отменённого).
+
+        Args:
+            vector (FrozenSet[Feature]): Признаки концерта
+            exclude (int | None): ID самого концерта
+
+        Returns:
+            List[Neighbour]: ID соседей и сходство по убыванию
+        """
+        with self._lock:
+            return _top(self._scores(vector, exclude), settings.similar_concerts_top_k)
+
+    @staticmethod
+    def _load(db: Session, concert_ids: Optional[List[int]]) -> Dict[int, FrozenSet[Feature]]:
+        query = select(ConcertReadModel.id, ConcertReadModel.composer_ids,
+                       ConcertReadModel.instrument_ids).where(
+            ConcertReadModel.current_status == ConcertStatus.UPCOMING.value
+        )
+        if concert_ids is not None:
+            query = query.where(ConcertReadModel.id.in_(concert_ids))
+        return {
+            row.id: features(_parse_ids(row.composer_ids), _parse_ids(row.instrument_ids))
+            for row in db.execute(query)
+        }
+
+    def _put(self, concert_id: int, vector: FrozenSet[Feature]) -> None:
+        self._vectors[concert_id] = vector
+        self._norms[concert_id] = _norm(vector)
+        for feature in vector:
+            self._postings[feature].add(concert_id)
+
+    def _drop(self, concert_id: int) -> FrozenSet[Feature]:
+        vector = self._vectors.pop(concert_id, frozenset())
+        self._norms.pop(concert_id, None)
+        for feature in vector:
+            self._postings[feature].discard(concert_id)
+        return vector
+
+    def _scores(self, vector: FrozenSet[Feature], exclude: Optional[int]) -> Dict[int, float]:
+        """Строка сходств: разреженное произведение вектора на матрицу признаков."""
+        norm = _norm(vector)
+        if not norm:
+            return {}
+        dots: Dict[int, float] = defaultdict(float)
+        for feature in vector:
+            weight = _weight(feature) ** 2
+            for other in self._postings.get(feature, ()):
+                dots[other] += weight
+        dots.pop(exclude, None)
+        return {other: dot / (norm * self._norms[other]) for other, dot in dots.items()}
+
+    def _apply(self, concert_id: int, vector: Optional[FrozenSet[Feature]]) -> None:
+        old_vector = self._drop(concert_id)
+        self._neighbours.pop(concert_id, None)
+        affected = {other for feature in old_vector for other in self._postings.get(feature, ())}
+        scores: Dict[int, float] = {}
+        if vector is not None:
+            self._put(concert_id, vector)
+            scores = self._scores(vector, concert_id)
+            self._neighbours[concert_id] = _top(scores, settings.similar_concerts_top_k)
+            affected.update(scores)
+        affected.discard(concert_id)
+
+        k = settings.similar_concerts_top_k
+        for other in affected:
+            current = self._neighbours.get(other, [])
+            score = scores.get(other, 0.0)
+            old_score = next((value for item_id, value in current if item_id == concert_id), None)
+            if old_score is not None and score < old_score and len(current) >= k:
+                # На освободившееся место может претендовать концерт вне списка.
+                self._neighbours[other] = _top(self._scores(self._vectors[other], other), k)
+                continue
+            updated = {item_id: value for item_id, value in current if item_id != concert_id}
+            if score > 0:
+                updated[concert_id] = score
+            self._neighbours[other] = _top(updated, k)
+
+
+similar_concerts = SimilarityIndex()
+
+
+class SimilarityRefresher(BackgroundWorker):
+    """Фоновая задача, строящая индекс похожих концертов и применяющая изменения."""
+
+    name = "similarity-refresher"
+
+    def run_once(self, db: Session) -> Optional[float]:
+        similar_concerts.refresh(db)
+        return None
+
+
+similarity_refresher = SimilarityRefresher(max_sleep=settings.similar_refresh_seconds)
@@ -0,0 +1,122 @@
+"""Объединение одинаковых одновременных запросов (single-flight).
+
+Синхронные роутеры выполняются в пуле потоков, поэтому объединение
+сделано на потоках: первый запрос с ключом выполняет вычисление, а
+пришедшие во время его выполнения запросы с тем же ключом ждут и
+получают тот же результат (или то же исключение). Если ожидание дольше
+coalesce_timeout_seconds, запрос выполняет вычисление сам.
+
+Результат разделяется между запросами, поэтому вычисление должно
+возвращать неизменяемые данные (pydantic-схемы, словари), а не объекты
+сессии ведущего запроса.
+"""
+
+# Стандартные библиотеки
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Локальные модули
+from app.config import settings
+from app.core.metrics import metrics
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def normalize_key(route: str, **params: Any) -> Tuple:
+    """Строит ключ объединения из маршрута и параметров запроса.
+
+    Списки сортируются и очищаются от повторов, даты приводятся к ISO,
+    отсутствующие параметры пропускаются.
+
+    Args:
+        route (str): Имя маршрута
+        **params (Any): Параметры запроса
+
+    Returns:
+        Tuple: Хешируемый ключ
+    """
+    items = []
+    for name in sorted(params):
+        value = params[name]
+        if value is None:
+            continue
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            value = tuple(sorted(set(value)))
+        items.append((name, value))
+    return (route, tuple(items))
+
+
+class SingleFlight:
+    """Группа объединяемых вычислений."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any], route: str = "",
+           timeout: Optional[float] = None) -> Any:
+        """Выполняет func или присоединяется к уже выполняющемуся вызову.
+
+        Args:
+            key (Hashable): Ключ объединения
+            func (Callable[[], Any]): Вычисление
+            route (str): Метка маршрута для метрик
+            timeout (float | None): Сколько ждать чужой результат
+
+        Returns:
+            Any: Результат вычисления
+        """
+        timeout = settings.coalesce_timeout_seconds if timeout is None else timeout
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+
+        if leader:
+            metrics.inc("singleflight_executions_total", route=route)
+            try:
+                call.result = func()
+            except BaseException as exc:
+                call.error = exc
+                raise
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.done.set()
+            return call.result
+
+        if not call.done.wait(timeout):
+            metrics.inc("singleflight_timeouts_total", route=route)
+            with self._lock:
+                self.executed += 1
+            return func()
+        metrics.inc("singleflight_shared_total", route=route)
+        with self._lock:
+            self.shared += 1
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def ratio(self) -> float:
+        """Доля запросов, получивших чужой результат."""
+        total = self.executed + self.shared
+        return self.shared / total if total else 0.0
+
+
+request_coalescer = SingleFlight()
+metrics.gauge("singleflight_coalescing_ratio", request_coalescer.ratio,
+              "Доля запросов, обслуженных результатом одновременного такого же запроса")
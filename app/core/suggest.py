@@ -0,0 +1,244 @@
+"""Префиксные индексы для подсказок по композиторам и инструментам.
+
+Индекс хранит отсортированный массив пар (ключ, id) и ищет по префиксу
+через bisect. Ключами служат нормализованное имя целиком и его хвосты,
+начинающиеся с каждого слова, поэтому "бах" находит "Иоганн Себастьян Бах".
+Те же хвосты строятся для фонетического ключа имени (app.core.fuzzy),
+общего для кириллицы и латиницы, поэтому "Rachmaninoff" находит
+"Рахманинов". Результаты ранжируются по числу концертов, в которых
+участвует запись.
+"""
+
+# Стандартные библиотеки
+import threading
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Сторонние библиотеки
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+# Локальные модули
+from app.core.fuzzy import normalize, phonetic_key
+from app.models.models import Composer, ConcertComposer, ConcertInstrument, Instrument
+
+ItemsLoader = Callable[[Session], List[dict]]
+# Пары (ID концерта, ID записи): для всех концертов или для переданных ID.
+LinksLoader = Callable[[Session, Optional[List[int]]], Iterable[Tuple[int, int]]]
+
+
+def _suffixes(text: str) -> Set[str]:
+    words = text.split()
+    return {" ".join(words[i:]) for i in range(len(words))}
+
+
+def phonetic_prefixes(text: str) -> Set[str]:
+    """Возвращает фонетические ключи строки для поиска по префиксу.
+
+    Ключ строится и со сворачиванием окончаний слов, и без него: первый
+    совпадает для полностью введённого имени, второй - для недописанного.
+    "ch" дополнительно сворачивается в "h", чтобы немецкое написание "х"
+    (Rachmaninoff) совпало с русским.
+
+    Args:
+        text (str): Имя или введённый префикс
+
+    Returns:
+        Set[str]: Ключи
+    """
+    return {phonetic_key(text, word_endings=endings).replace("ch", "h")
+            for endings in (True, False)}
+
+
+def name_keys(name: str) -> Set[str]:
+    """Возвращает ключи индекса: хвосты имени и его фонетических ключей с каждого слова.
+
+    Args:
+        name (str): Имя композитора или название инструмента
+
+    Returns:
+        Set[str]: Набор ключей
+    """
+    keys = _suffixes(normalize(name))
+    for key in phonetic_prefixes(name):
+        keys |= _suffixes(key)
+    return keys
+
+
+class PrefixIndex:
+    """Внутрипроцессный префиксный индекс с ранжированием по популярности.
+
+    Индекс загружается лениво при первом запросе и затем поддерживается
+    инкрементально: add() при создании записи, sync_concerts() после
+    создания, изменения и удаления концерта. Для популярности индекс
+    помнит записи каждого концерта и пересчитывает вклад только
+    переданных концертов.
+    """
+
+    def __init__(self, load_items: ItemsLoader, load_links: LinksLoader):
+        self._load_items = load_items
+        self._load_links = load_links
+        self._keys: List[Tuple[str, int]] = []
+        self._items: Dict[int, dict] = {}
+        self._usage: Counter = Counter()
+        self._concert_items: Dict[int, FrozenSet[int]] = {}
+        self._lock = threading.RLock()
+        self.loaded = False
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Загружает индекс из базы, если это ещё не сделано.
+
+        Args:
+            db (Session): Сессия базы данных
+        """
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            self._keys = []
+            self._items = {}
+            self._concert_items = self._group_links(self._load_links(db, None))
+            self._usage = Counter()
+            for item_ids in self._concert_items.values():
+                self._usage.update(item_ids)
+            for item in self._load_items(db):
+                self._add(item)
+            self._keys.sort()
+            self.loaded = True
+
+    def reset(self) -> None:
+        """Сбрасывает индекс; следующий запрос загрузит его заново."""
+        with self._lock:
+            self.loaded = False
+            self._keys = []
+            self._items = {}
+            self._usage = Counter()
+            self._concert_items = {}
+
+    @staticmethod
+    def _group_links(links: Iterable[Tuple[int, int]]) -> Dict[int, FrozenSet[int]]:
+        grouped = defaultdict(set)
+        for concert_id, item_id in links:
+            grouped[concert_id].add(item_id)
+        return {concert_id: frozenset(item_ids) for concert_id, item_ids in grouped.items()}
+
+    def _add(self, item: dict) -> None:
+        self._items[item["id"]] = item
+        for key in name_keys(item["name"]):
+            self._keys.append((key, item["id"]))
+
+    def add(self, item: dict) -> None:
+        """Добавляет запись в уже загруженный индекс.
+
+        Args:
+            item (dict): Данные записи, обязательно с ключами "id" и "name"
+        """
+        with self._lock:
+            if not self.loaded:
+                return
+            self._items[item["id"]] = item
+            for key in name_keys(item["name"]):
+                insort(self._keys, (key, item["id"]))
+
+    def remove(self, item_id: int) -> None:
+        """Удаляет запись из индекса.
+
+        Args:
+            item_id (int): ID записи
+        """
+        with self._lock:
+            if self._items.pop(item_id, None) is not None:
+                self._keys = [key for key in self._keys if key[1] != item_id]
+
+    def sync_concerts(self, db: Session, concert_ids: Iterable[int]) -> None:
+        """Пересчитывает вклад концертов в популярность записей.
+
+        Записи концертов перечитываются из базы; удалённые концерты
+        перестают учитываться. Повторный вызов для тех же концертов ничего
+        не меняет.
+
+        Args:
+            db (Session): Сессия базы данных
+            concert_ids (Iterable[int]): ID созданных, изменённых или удалённых концертов
+        """
+        concert_ids = list(concert_ids)
+        if not self.loaded or not concert_ids:
+            return
+        current = self._group_links(self._load_links(db, concert_ids))
+        with self._lock:
+            for concert_id in concert_ids:
+                self._usage.subtract(self._concert_items.pop(concert_id, ()))
+                item_ids = current.get(concert_id)
+                if item_ids:
+                    self._concert_items[concert_id] = item_ids
+                    self._usage.update(item_ids)
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        """Ищет записи, у которых имя или его слово начинается с query.
+
+        Args:
+            query (str): Введённый пользователем префикс
+            limit (int): Максимальное количество результатов
+
+        Returns:
+            List[dict]: Записи, отсортированные по популярности и имени
+        """
+        prefixes = {normalize(query)} | phonetic_prefixes(query)
+        prefixes.discard("")
+        if not prefixes:
+            return []
+        with self._lock:
+            matched = set()
+            for prefix in prefixes:
+                position = bisect_left(self._keys, (prefix,))
+                while position < len(self._keys) and self._keys[position][0].startswith(prefix):
+                    matched.add(self._keys[position][1])
+                    position += 1
+            ranked = sorted(
+                matched,
+                key=lambda item_id: (-self._usage[item_id], self._items[item_id]["name"])
+            )
+            return [self._items[item_id] for item_id in ranked[:limit]]
+
+
+def composer_item(composer: Composer) -> dict:
+    """Преобразует композитора в запись индекса."""
+    return {
+        "id": composer.id,
+        "name": composer.name,
+        "birth_year": composer.birth_year,
+        "death_year": composer.death_year
+    }
+
+
+def instrument_item(instrument: Instrument) -> dict:
+    """Преобразует инструмент в запись индекса."""
+    return {"id": instrument.id, "name": instrument.name}
+
+
+def _load_composers(db: Session) -> List[dict]:
+    return [composer_item(composer) for composer in db.scalars(select(Composer))]
+
+
+def _composer_links(db: Session, concert_ids: Optional[List[int]]) -> Iterable[Tuple[int, int]]:
+    query = select(ConcertComposer.concert_id, ConcertComposer.composer_id)
+    if concert_ids is not None:
+        query = query.where(ConcertComposer.concert_id.in_(concert_ids))
+    return db.execute(query).all()
+
+
+def _load_instruments(db: Session) -> List[dict]:
+    return [instrument_item(instrument) for instrument in db.scalars(select(Instrument))]
+
+
+def _instrument_links(db: Session, concert_ids: Optional[List[int]]) -> Iterable[Tuple[int, int]]:
+    query = select(ConcertInstrument.concert_id, ConcertInstrument.instrument_id)
+    if concert_ids is not None:
+        query = query.where(ConcertInstrument.concert_id.in_(concert_ids))
+    return db.execute(query).all()
+
+
+composer_index = PrefixIndex(_load_composers, _composer_links)
+instrument_index = PrefixIndex(_load_instruments, _instrument_links)
@@ -0,0 +1,269 @@
+"""Площадки концертов и поиск концертов рядом с точкой.
+
+Поле location концерта - свободный текст, поэтому одна площадка
+встречается в разных написаниях. Написания сводятся к ключу venue_key:
+нормализация регистра, "ё" и пунктуации, раскрытие сокращений (кз, бз,
+дк), удаление "им."/"имени" и инициалов и фонетический ключ из
+app.core.fuzzy, общий для кириллицы и латиницы. Концерты с одинаковым
+ключом относятся к одной площадке (Venue). Новые концерты привязываются
+при создании и изменении места проведения, а существующие - проходом
+link_venues, который заодно сливает площадки, чьи ключи совпали после
+изменения правил нормализации.
+
+Координаты площадок хранятся в виртуальной таблице R*Tree venue_rtree
+(обновляется в обработчике after_flush). Поиск рядом с точкой сначала
+отбирает площадки по ограничивающему прямоугольнику через R*Tree, а
+затем считает точное расстояние по формуле гаверсинусов только для них.
+
+Ручной запуск нормализации:
+    python -m app.core.venues
+"""
+
+# Стандартные библиотеки
+import math
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Dict, List, Optional, Set
+
+# Сторонние библиотеки
+from sqlalchemy import delete, event, func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement, Select
+
+# Локальные модули
+from app.core.fuzzy import normalize, phonetic_key
+from app.core.read_model import sync_bulk_changes
+from app.models.models import ArchivedConcert, Concert, Venue, venue_rtree
+
+EARTH_RADIUS_KM = 6371.0088
+_KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+_STOP_WORDS = {"им", "имени"}
+_ABBREVIATIONS = {
+    "кз": "концертный зал",
+    "бз": "большой зал",
+    "мз": "малый зал",
+    "дк": "дом культуры",
+}
+
+
+def venue_key(location: str) -> str:
+    """Возвращает ключ площадки, общий для разных написаний места проведения.
+
+    Args:
+        location (str): Место проведения в свободной форме
+
+    Returns:
+        str: Ключ; пустая строка, если в названии нет слов
+    """
+    words = []
+    for word in normalize(location).split():
+        # Одиночные буквы - инициалы; номера залов остаются в ключе.
+        if word in _STOP_WORDS or (len(word) == 1 and word.isalpha()):
+            continue
+        words.append(_ABBREVIATIONS.get(word, word))
+    return phonetic_key(" ".join(words))
+
+
+def resolve_venue(db: Session, location: str) -> Optional[Venue]:
+    """Находит площадку по месту проведения или создаёт новую.
+
+    Вставка с ON CONFLICT DO NOTHING по name_key не падает, если ту же
+    площадку одновременно создаёт другой запрос.
+
+    Args:
+        db (Session): Сессия базы данных
+        location (str): Место проведения
+
+    Returns:
+        Venue | None: Площадка или None, если в названии нет слов
+    """
+    key = venue_key(location)
+    if not key:
+        return None
+    venue = db.scalar(select(Venue).where(Venue.name_key == key))
+    if venue is None:
+        db.execute(
+            sqlite_insert(Venue)
+            .values(name=location.strip(), name_key=key)
+            .on_conflict_do_nothing(index_elements=[Venue.name_key])
+        )
+        venue = db.scalar(select(Venue).where(Venue.name_key == key))
+    return venue
+
+
+def _repoint(db: Session, venue_ids: List[int], target_id: int) -> List[int]:
+    """Переносит концерты (и архивные) на другую площадку."""
+    moved = db.execute(
+        update(Concert).where(Concert.venue_id.in_(venue_ids))
+        .values(venue_id=target_id).returning(Concert.id)
+    ).scalars().all()
+    db.execute(update(ArchivedConcert).where(ArchivedConcert.venue_id.in_(venue_ids))
+               .values(venue_id=target_id))
+    return moved
+
+
+def _merge_duplicates(db: Session, changed: Set[int]) -> Dict[str, Venue]:
+    """Сливает площадки с одинаковым ключом и возвращает площадки по ключам."""
+    groups: Dict[str, List[Venue]] = defaultdict(list)
+    for venue in db.scalars(select(Venue).order_by(Venue.id)):
+        groups[venue_key(venue.name) or venue.name_key].append(venue)
+
+    venues: Dict[str, Venue] = {}
+    for key, group in groups.items():
+        # Остаётся площадка с координатами, а при равенстве - самая старая.
+        keep = min(group, key=lambda venue: (venue.latitude is None, venue.id))
+        duplicates = [venue for venue in group if venue is not keep]
+        if duplicates:
+            changed.update(_repoint(db, [venue.id for venue in duplicates], keep.id))
+            for duplicate in duplicates:
+                keep.address = keep.address or duplicate.address
+                db.delete(duplicate)
+        venues[key] = keep
+    db.flush()
+
+    renamed = [(key, venue) for key, venue in venues.items() if venue.name_key != key]
+    # Через временные ключи, чтобы обмен ключами не нарушил уникальность.
+    for _, venue in renamed:
+        venue.name_key = f"#{venue.id}"
+    db.flush()
+    for key, venue in renamed:
+        venue.name_key = key
+    db.flush()
+    return venues
+
+
+def link_venues(db: Session) -> int:
+    """Привязывает концерты без площадки к площадкам и сливает дубликаты.
+
+    Площадка для нового ключа получает самое частое написание названия.
+
+    Args:
+        db (Session): Сессия базы данных
+
+    Returns:
+        int: Количество привязанных или перенесённых горячих концертов
+    """
+    changed: Set[int] = set()
+    venues = _merge_duplicates(db, changed)
+
+    spellings: Dict[str, Counter] = defaultdict(Counter)
+    for model in (Concert, ArchivedConcert):
+        for location, count in db.execute(
+            select(model.location, func.count())
+            .where(model.venue_id.is_(None))
+            .group_by(model.location)
+        ):
+            key = venue_key(location)
+            if key:
+                spellings[key][location] += count
+
+    for key, counts in spellings.items():
+        if key not in venues:
+            venues[key] = Venue(name=counts.most_common(1)[0][0].strip(), name_key=key)
+            db.add(venues[key])
+    db.flush()
+
+    for key, counts in spellings.items():
+        for location in counts:
+            changed.update(db.execute(
+                update(Concert)
+                .where(Concert.venue_id.is_(None), Concert.location == location)
+                .values(venue_id=venues[key].id).returning(Concert.id)
+            ).scalars().all())
+            db.execute(
+                update(ArchivedConcert)
+                .where(ArchivedConcert.venue_id.is_(None), ArchivedConcert.location == location)
+                .values(venue_id=venues[key].id)
+            )
+    sync_bulk_changes(db, changed)
+    db.commit()
+    return len(changed)
+
+
+def ensure_linked(db: Session) -> None:
+    """Запускает link_venues, если есть концерты без площадки.
+
+    Args:
+        db (Session): Сессия базы данных
+    """
+    unlinked = db.scalar(select(Concert.id).where(Concert.venue_id.is_(None)).limit(1))
+    if unlinked is not None:
+        link_venues(db)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_rtree(session: Session, _flush_context) -> None:
+    """Обновляет R*Tree для площадок, изменённых в текущем flush."""
+    changed = [obj for obj in chain(session.new, session.dirty) if isinstance(obj, Venue)]
+    removed = [obj.id for obj in session.deleted if isinstance(obj, Venue)]
+    located = [venue for venue in changed
+               if venue.latitude is not None and venue.longitude is not None]
+    removed += [venue.id for venue in changed if venue not in located]
+    if not removed and not located:
+        return
+    connection = session.connection()
+    if removed:
+        connection.execute(delete(venue_rtree).where(venue_rtree.c.id.in_(removed)))
+    if located:
+        connection.execute(insert(venue_rtree).prefix_with("OR REPLACE"), [
+            {"id": venue.id, "min_lat": venue.latitude, "max_lat": venue.latitude,
+             "min_lon": venue.longitude, "max_lon": venue.longitude}
+            for venue in located
+        ])
+
+
+def nearby_venue_ids(lat: float, lon: float, radius_km: float) -> Select:
+    """Строит запрос ID площадок в прямоугольнике, описанном вокруг круга поиска.
+
+    Args:
+        lat (float): Широта центра
+        lon (float): Долгота центра
+        radius_km (float): Радиус в километрах
+
+    Returns:
+        Select: Запрос к R*Tree
+    """
+    delta_lat = radius_km / _KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(lat))
+    if cos_lat < 1e-6 or radius_km / (_KM_PER_DEGREE * cos_lat) >= 180:
+        min_lon, max_lon = -180.0, 180.0
+    else:
+        delta_lon = radius_km / (_KM_PER_DEGREE * cos_lat)
+        min_lon, max_lon = lon - delta_lon, lon + delta_lon
+    return select(venue_rtree.c.id).where(
+        venue_rtree.c.max_lat >= lat - delta_lat,
+        venue_rtree.c.min_lat <= lat + delta_lat,
+        venue_rtree.c.max_lon >= min_lon,
+        venue_rtree.c.min_lon <= max_lon,
+    )
+
+
+def distance_km(lat: float, lon: float) -> ColumnElement:
+    """Расстояние от точки до площадки по формуле гаверсинусов (SQL-выражение).
+
+    Args:
+        lat (float): Широта точки
+        lon (float): Долгота точки
+
+    Returns:
+        ColumnElement: Расстояние в километрах
+    """
+    half_lat = (func.radians(Venue.latitude) - math.radians(lat)) / 2
+    half_lon = (func.radians(Venue.longitude) - math.radians(lon)) / 2
+    haversine = (func.pow(func.sin(half_lat), 2)
+                 + math.cos(math.radians(lat)) * func.cos(func.radians(Venue.latitude))
+                 * func.pow(func.sin(half_lon), 2))
+    return 2 * EARTH_RADIUS_KM * func.asin(func.min(1.0, func.sqrt(haversine)))
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal, init_database
+
+    init_database()
+    session = SessionLocal()
+    try:
+        print(f"Привязано концертов к площадкам: {link_venues(session)}")
+    finally:
+        session.close()
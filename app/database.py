@@ -1,8 +1,12 @@
 """Модуль для работы с базой данных."""
 
+# Стандартные библиотеки
+from contextvars import ContextVar
+from typing import Optional
+
 # Сторонние библиотеки
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from app.config import settings
 
 DATABASE_URL = settings.database_url
@@ -10,9 +14,15 @@ engine = create_engine(DATABASE_URL, echo=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Общая сессия подзапросов POST /batch (см. app.core.batch).
+shared_session: ContextVar[Optional[Session]] = ContextVar("shared_session", default=None)
+
 def get_session():
     """Генератор сессий базы данных.
 
+    Внутри пакетного запроса возвращает общую сессию пакета; закрывает
+    её сам пакет.
+
     Yields:
         Session: Сессия базы данных
 
@@ -20,6 +30,10 @@ def get_session():
         with get_session() as db:
             db.query(...)
     """
+    shared = shared_session.get()
+    if shared is not None:
+        yield shared
+        return
     db = SessionLocal()
     try:
         yield db
@@ -27,6 +41,28 @@ def get_session():
         db.close()
 
 
+# Столбцы, добавленные в уже существующие таблицы: create_all их не
+# создаёт, поэтому init_database добавляет их через ALTER TABLE.
+# (таблица, столбец, определение, индекс или None)
+_ADDED_COLUMNS = (
+    ("concerts", "venue_id", "INTEGER REFERENCES venues(id)", "ix_concerts_venue_id"),
+    ("concerts_archive", "venue_id", "INTEGER", None),
+    ("concert_read_model", "venue_id", "INTEGER", "ix_concert_read_model_venue_id"),
+)
+
+
+def _upgrade_schema(connection) -> None:
+    """Добавляет недостающие столбцы из _ADDED_COLUMNS; повторный вызов ничего не меняет."""
+    for table, column, definition, index in _ADDED_COLUMNS:
+        columns = {row[1] for row in connection.execute(text(f"PRAGMA table_info({table})"))}
+        if column not in columns:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
+        if index is not None:
+            connection.execute(text(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({column})"))
+
+
 def init_database():
-    """Инициализирует базу данных, создавая все таблицы."""
+    """Инициализирует базу данных: создаёт таблицы и добавляет новые столбцы."""
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        _upgrade_schema(connection)
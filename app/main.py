@@ -3,23 +3,87 @@
 Создает и настраивает экземпляр FastAPI, подключает маршруты.
 """
 
+from contextlib import asynccontextmanager
 from typing import Dict
 from fastapi import FastAPI
-from app.database import init_database
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from app.config import settings
+from app.core import read_model, venues
+from app.core.archive import concert_archiver
+from app.core.compression import CompressionMiddleware
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.invalidation import cache_sync
+from app.core.metrics import metrics
+from app.core.outbox import outbox_processor
+from app.core.popularity import view_flusher
+from app.core.profiling import ProfilingMiddleware, loop_monitor
+from app.core.ratelimit import RateLimitMiddleware
+from app.core.scheduler import status_scheduler
+from app.core.similarity import similarity_refresher
+from app.database import SessionLocal, init_database
 from app.routers import (
     auth_router,
+    batch_router,
+    calendar_router,
     concert_router,
+    concert_stream_router,
     composer_route,
+    debug_router,
     instruments_router,
+    me_router,
+    organization_router,
+    saved_search_router,
+    venue_router,
 )
 
+
+def _link_venues() -> None:
+    """Привязывает к площадкам концерты, созданные до появления площадок."""
+    with SessionLocal() as session:
+        venues.ensure_linked(session)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Запускает и останавливает фоновые задачи приложения."""
+    await run_in_threadpool(_link_venues)
+    if settings.status_scheduler_enabled:
+        status_scheduler.start()
+    outbox_processor.start()
+    cache_sync.start()
+    if settings.archive_enabled:
+        concert_archiver.start()
+    similarity_refresher.start()
+    view_flusher.start()
+    loop_monitor.start()
+    yield
+    await loop_monitor.stop()
+    await view_flusher.stop()
+    await similarity_refresher.stop()
+    await concert_archiver.stop()
+    await cache_sync.stop()
+    await outbox_processor.stop()
+    await status_scheduler.stop()
+
+
 app = FastAPI(
     title="Concert API",
     description="API для управления концертами и участниками",
+    lifespan=lifespan,
 )
+# Последний добавленный middleware внешний: лимиты проверяются до
+# обращения к таблице ключей идемпотентности.
+app.add_middleware(IdempotencyMiddleware)
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(ProfilingMiddleware)
 
 init_database()
 
+with SessionLocal() as startup_session:
+    read_model.ensure_populated(startup_session)
+
 
 @app.get("/", tags=["Root"])
 async def root() -> Dict[str, str]:
@@ -31,8 +95,25 @@ async def root() -> Dict[str, str]:
     return {"message": "Hello World"}
 
 
+@app.get("/metrics", tags=["Root"], response_class=PlainTextResponse)
+async def read_metrics() -> str:
+    """Метрики процесса в текстовом формате Prometheus.
+
+    Returns:
+        str: Выгрузка метрик
+    """
+    return metrics.render()
+
 
 app.include_router(auth_router.router)
 app.include_router(concert_router.router)
+app.include_router(concert_stream_router.router)
+app.include_router(calendar_router.router)
 app.include_router(composer_route.router)
 app.include_router(instruments_router.router)
+app.include_router(organization_router.router)
+app.include_router(me_router.router)
+app.include_router(saved_search_router.router)
+app.include_router(venue_router.router)
+app.include_router(batch_router.router)
+app.include_router(debug_router.router)
@@ -2,10 +2,11 @@
 
 # Стандартные библиотеки
 from enum import Enum
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 # Сторонние библиотеки
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (DDL, Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, JSON,
+                        LargeBinary, MetaData, String, Table, Text, event)
 from sqlalchemy.orm import relationship
 
 # Локальные модули
@@ -49,6 +50,55 @@ class ConcertStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class Venue(Base):
+    """Площадка (место проведения концертов).
+
+    Одна площадка объединяет разные написания поля location концертов:
+    name_key - нормализованное название (см. app.core.venues).
+
+    Attributes:
+        id (int): Уникальный идентификатор
+        name (str): Название площадки
+        name_key (str): Нормализованное название (уникальное)
+        address (str): Адрес
+        latitude (float): Широта
+        longitude (float): Долгота
+        created_at (DateTime): Дата создания
+    """
+
+    __tablename__ = "venues"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    name_key = Column(String, nullable=False, unique=True)
+    address = Column(String, nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=_utcnow)
+
+
+# Пространственный индекс площадок с координатами (модуль R*Tree SQLite).
+# Виртуальная таблица создаётся вместе с venues и не входит в Base.metadata.
+venue_rtree = Table(
+    "venue_rtree", MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("min_lat", Float),
+    Column("max_lat", Float),
+    Column("min_lon", Float),
+    Column("max_lon", Float),
+)
+event.listen(Venue.__table__, "after_create", DDL(
+    "CREATE VIRTUAL TABLE IF NOT EXISTS venue_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon)"
+).execute_if(dialect="sqlite"))
+event.listen(Venue.__table__, "before_drop", DDL(
+    "DROP TABLE IF EXISTS venue_rtree"
+).execute_if(dialect="sqlite"))
+
+
 class Concert(Base):
     """Модель концерта.
 
@@ -62,9 +112,14 @@ class Concert(Base):
         location (str): Место проведения
         current_status (ConcertStatus): Текущий статус
         organization_id (int): ID организатора
+        venue_id (int): ID площадки, к которой относится location
     """
 
     __tablename__ = "concerts"
+    __table_args__ = (
+        Index("ix_concerts_status_date", "current_status", "date"),
+        Index("ix_concerts_organization_date", "organization_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String, nullable=False)
@@ -75,6 +130,7 @@ class Concert(Base):
     location = Column(String, nullable=False)
     current_status = Column(String, default=ConcertStatus.UPCOMING)
     organization_id = Column(Integer, ForeignKey("users.id"))
+    venue_id = Column(Integer, ForeignKey("venues.id"), nullable=True, index=True)
 
     organization = relationship("User")
     concert_composers = relationship("ConcertComposer", back_populates="concert")
@@ -122,7 +178,7 @@ class ConcertComposer(Base):
 
     __tablename__ = 'concert_composers'
 
-    concert_id = Column(Integer, ForeignKey('concerts.id'), primary_key=True)
+    concert_id = Column(Integer, ForeignKey('concerts.id', ondelete="CASCADE"), primary_key=True)
     composer_id = Column(Integer, ForeignKey('composers.id'), primary_key=True)
 
     concert = relationship("Concert", back_populates="concert_composers")
@@ -134,9 +190,311 @@ class ConcertInstrument(Base):
 
     __tablename__ = 'concert_instruments'
 
-    concert_id = Column(Integer, ForeignKey('concerts.id'), primary_key=True)
+    concert_id = Column(Integer, ForeignKey('concerts.id', ondelete="CASCADE"), primary_key=True)
     instrument_id = Column(Integer, ForeignKey('instruments.id'), primary_key=True)
 
     concert = relationship("Concert", back_populates="concert_instruments")
     instrument = relationship("Instrument", back_populates="concert_instruments")
 
+
+class ArchivedConcert(Base):
+    """Архивный концерт: завершённый или отменённый концерт прошлых сезонов.
+
+    Строки переносятся из concerts фоновой задачей (см. app.core.archive)
+    с сохранением ID, чтобы горячая таблица и её индексы оставались
+    небольшими.
+
+    Attributes:
+        id (int): ID концерта
+        archived_at (DateTime): Дата переноса в архив
+    """
+
+    __tablename__ = "concerts_archive"
+    __table_args__ = (
+        Index("ix_concerts_archive_date", "date"),
+        Index("ix_concerts_archive_organization_date", "organization_id", "date"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String, nullable=False)
+    date = Column(DateTime, nullable=False)
+    description = Column(Text)
+    price_type = Column(String, nullable=True)
+    price_amount = Column(Integer, nullable=True)
+    location = Column(String, nullable=False)
+    current_status = Column(String, nullable=False)
+    organization_id = Column(Integer, nullable=True)
+    venue_id = Column(Integer, nullable=True)
+    archived_at = Column(DateTime, nullable=False)
+
+
+class ArchivedConcertComposer(Base):
+    """Архивная ассоциативная таблица концерт-композитор."""
+
+    __tablename__ = "concert_composers_archive"
+
+    concert_id = Column(Integer, ForeignKey("concerts_archive.id", ondelete="CASCADE"),
+                        primary_key=True)
+    composer_id = Column(Integer, ForeignKey("composers.id"), primary_key=True)
+
+
+class ArchivedConcertInstrument(Base):
+    """Архивная ассоциативная таблица концерт-инструмент."""
+
+    __tablename__ = "concert_instruments_archive"
+
+    concert_id = Column(Integer, ForeignKey("concerts_archive.id", ondelete="CASCADE"),
+                        primary_key=True)
+    instrument_id = Column(Integer, ForeignKey("instruments.id"), primary_key=True)
+
+
+class ConcertReadModel(Base):
+    """Денормализованное представление концерта для чтения.
+
+    Одна строка на концерт с заранее собранными списками композиторов и
+    инструментов. Поддерживается в той же транзакции, что и запись в
+    нормализованные таблицы (см. app.core.read_model).
+
+    Attributes:
+        id (int): ID концерта
+        composers (JSON): Список композиторов в формате ComposerRead
+        instruments (JSON): Список инструментов в формате InstrumentRead
+        composer_ids (str): ID композиторов в виде ",1,2,"
+        instrument_ids (str): ID инструментов в виде ",1,2,"
+        search_text (str): Название, место, композиторы и инструменты в нижнем регистре
+    """
+
+    __tablename__ = "concert_read_model"
+    __table_args__ = (
+        Index("ix_concert_read_model_status_date", "current_status", "date"),
+        Index("ix_concert_read_model_organization_date", "organization_id", "date", "id"),
+        Index("ix_concert_read_model_date", "date"),
+    )
+
+    id = Column(Integer, ForeignKey("concerts.id", ondelete="CASCADE"), primary_key=True)
+    title = Column(String, nullable=False)
+    date = Column(DateTime, nullable=False)
+    description = Column(Text)
+    price_type = Column(String, nullable=True)
+    price_amount = Column(Integer, nullable=True)
+    location = Column(String, nullable=False)
+    current_status = Column(String, nullable=False)
+    organization_id = Column(Integer, nullable=True)
+    venue_id = Column(Integer, nullable=True, index=True)
+    composers = Column(JSON, nullable=False, default=list)
+    instruments = Column(JSON, nullable=False, default=list)
+    composer_ids = Column(String, nullable=False, default=",")
+    instrument_ids = Column(String, nullable=False, default=",")
+    search_text = Column(Text, nullable=False, default="")
+
+
+class ConcertReadModelItem(Base):
+    """Композиторы и инструменты концертов модели чтения для фильтрации.
+
+    Строка на пару концерт-элемент; поддерживается вместе с моделью чтения
+    (см. app.core.read_model). Фильтр по композиторам и инструментам идёт
+    по индексу (kind, item_id), а не по подстроке в composer_ids.
+
+    Attributes:
+        concert_id (int): ID концерта
+        kind (str): Вид элемента: composer или instrument
+        item_id (int): ID композитора или инструмента
+    """
+
+    __tablename__ = "concert_read_model_items"
+    __table_args__ = (
+        Index("ix_concert_read_model_items_kind_item", "kind", "item_id", "concert_id"),
+    )
+
+    COMPOSER = "composer"
+    INSTRUMENT = "instrument"
+
+    concert_id = Column(Integer, ForeignKey("concert_read_model.id", ondelete="CASCADE"),
+                        primary_key=True)
+    kind = Column(String, primary_key=True)
+    item_id = Column(Integer, primary_key=True)
+
+
+class ConcertCounter(Base):
+    """Инкрементально поддерживаемые счётчики концертов.
+
+    Счётчики меняются вместе с моделью чтения (см. app.core.read_model) и
+    позволяют не агрегировать таблицу концертов при каждом просмотре.
+
+    Attributes:
+        scope (str): Область счётчика, например "org:5"
+        metric (str): Метрика: status, upcoming_month, composer
+        key (str): Значение метрики: статус, месяц YYYY-MM или ID композитора
+        value (int): Текущее значение счётчика
+    """
+
+    __tablename__ = "concert_counters"
+
+    scope = Column(String, primary_key=True)
+    metric = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+
+class ConcertPopularity(Base):
+    """Просмотры концерта и рейтинг популярности с затуханием во времени.
+
+    Строки обновляются пачками из счётчиков в памяти (см.
+    app.core.popularity). log_score - логарифм суммы просмотров, взвешенных
+    множителем, растущим со временем (прямое затухание), поэтому порядок
+    по индексу log_score совпадает с порядком по текущему рейтингу и
+    строки не нужно пересчитывать при течении времени.
+
+    Attributes:
+        concert_id (int): ID концерта
+        views (int): Всего просмотров
+        log_score (float): Логарифм рейтинга популярности
+        updated_at (DateTime): Время последнего сброса просмотров
+    """
+
+    __tablename__ = "concert_popularity"
+    __table_args__ = (
+        Index("ix_concert_popularity_log_score", "log_score"),
+    )
+
+    concert_id = Column(Integer, primary_key=True, autoincrement=False)
+    views = Column(Integer, nullable=False, default=0)
+    log_score = Column(Float, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+
+class SavedSearch(Base):
+    """Сохранённый поиск (подписка) слушателя.
+
+    Концерт подходит под поиск, если в нём есть хотя бы один из композиторов
+    или инструментов поиска (пустые списки не ограничивают состав) и он
+    удовлетворяет ограничениям по дате и цене.
+
+    Attributes:
+        id (int): Уникальный идентификатор
+        user_id (int): ID слушателя
+        composer_ids (JSON): ID композиторов (любой из)
+        instrument_ids (JSON): ID инструментов (любой из)
+        date_from (DateTime): Не раньше этой даты
+        date_to (DateTime): Не позже этой даты
+        max_price (int): Максимальная цена билета
+        created_at (DateTime): Дата создания
+    """
+
+    __tablename__ = "saved_searches"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    composer_ids = Column(JSON, nullable=False, default=list)
+    instrument_ids = Column(JSON, nullable=False, default=list)
+    date_from = Column(DateTime, nullable=True)
+    date_to = Column(DateTime, nullable=True)
+    max_price = Column(Integer, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=_utcnow)
+
+
+class Bookmark(Base):
+    """Закладка слушателя на концерт.
+
+    Составной первичный ключ (user_id, concert_id) служит индексом для
+    ленты закладок пользователя, индекс по concert_id - для пересчёта
+    счётчиков при изменении статуса концерта.
+
+    Attributes:
+        user_id (int): ID слушателя
+        concert_id (int): ID концерта
+        created_at (DateTime): Дата добавления
+    """
+
+    __tablename__ = "bookmarks"
+    __table_args__ = (
+        Index("ix_bookmarks_concert", "concert_id"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    concert_id = Column(Integer, ForeignKey("concerts.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(DateTime, nullable=False, default=_utcnow)
+
+
+class Notification(Base):
+    """Исходящее уведомление о концерте, подошедшем под сохранённый поиск.
+
+    Строки пишутся в транзакции создания концерта (transactional outbox) и
+    обрабатываются фоновой задачей (см. app.core.outbox).
+
+    Attributes:
+        id (int): Уникальный идентификатор
+        user_id (int): ID получателя
+        saved_search_id (int): ID сохранённого поиска
+        concert_id (int): ID концерта
+        created_at (DateTime): Дата постановки в очередь
+        processed_at (DateTime): Дата обработки (NULL - ещё не обработано)
+    """
+
+    __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_pending", "processed_at", "id"),
+        Index("ix_notifications_user", "user_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    saved_search_id = Column(Integer, ForeignKey("saved_searches.id", ondelete="SET NULL"), nullable=True)
+    concert_id = Column(Integer, ForeignKey("concerts.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime, nullable=False, default=_utcnow)
+    processed_at = Column(DateTime, nullable=True)
+
+
+class IdempotencyRecord(Base):
+    """Сохранённый ответ на запрос с заголовком Idempotency-Key.
+
+    Пока запрос выполняется, status_code пустой, а expires_at ограничивает
+    время блокировки ключа; после завершения хранится ответ до expires_at.
+
+    Attributes:
+        scope (str): Метод, путь и пользователь запроса
+        key (str): Значение Idempotency-Key
+        request_hash (str): SHA-256 тела запроса
+        status_code (int): Код сохранённого ответа (NULL - запрос выполняется)
+        content_type (str): Content-Type сохранённого ответа
+        body (bytes): Тело сохранённого ответа
+        expires_at (DateTime): Момент, после которого запись не действует
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    scope = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    request_hash = Column(String, nullable=False)
+    status_code = Column(Integer, nullable=True)
+    content_type = Column(String, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    expires_at = Column(DateTime, nullable=False)
+
+
+class CacheChange(Base):
+    """Журнал изменений для инвалидации кэшей во всех воркерах.
+
+    Строки пишутся в транзакции изменения, воркеры читают строки с ID
+    больше последнего прочитанного (см. app.core.invalidation).
+
+    Attributes:
+        id (int): Монотонно растущая версия
+        namespace (str): Пространство имён кэша (concerts, composers, instruments)
+        key (str): Изменившийся ключ (NULL - всё пространство имён)
+        created_at (DateTime): Время изменения
+    """
+
+    __tablename__ = "cache_changes"
+    __table_args__ = (
+        Index("ix_cache_changes_created_at", "created_at"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    namespace = Column(String, nullable=False)
+    key = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=_utcnow)
@@ -0,0 +1,63 @@
+"""Роутер пакетных запросов."""
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.core import batch
+from app.database import get_session
+from app.schemas import batch as schemas
+from ..auth.auth import get_current_user, resolved_user
+
+router = APIRouter(tags=["Пакетные запросы"])
+
+
+async def _resolve_user(request: Request, db: Session):
+    """Проверяет токен пакета один раз: возвращает пользователя, ошибку или None."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        user = await run_in_threadpool(get_current_user, token, db)
+    except HTTPException as exc:
+        return exc
+    # Пользователь читается из подзапросов в разных сессиях и потоках:
+    # загруженные атрибуты не должны истекать при коммитах пакета.
+    db.expunge(user)
+    return user
+
+
+@router.post("/batch",
+             response_model=schemas.BatchResponse,
+             summary='Выполнить несколько запросов за один вызов')
+async def run_batch(
+        payload: schemas.BatchRequest,
+        request: Request,
+        db: Session = Depends(get_session)
+):
+    """
+    Выполняет подзапросы к остальным маршрутам API по порядку и
+    возвращает статус, заголовки и тело ответа на каждый. Подзапросы
+    используют одну сессию базы данных и одну проверку токена из
+    заголовка Authorization пакета. Подряд идущие GET-подзапросы
+    выполняются одновременно. Ошибка подзапроса не прерывает пакет.
+
+    Args:
+        payload (BatchRequest): Подзапросы.
+        request (Request): Пакетный запрос.
+        db (Session): Сессия базы данных.
+
+    Returns:
+        BatchResponse: Ответы в порядке подзапросов.
+    """
+    token = resolved_user.set(await _resolve_user(request, db))
+    try:
+        # С подменённой get_session (тесты) сессии из пула недоступны.
+        concurrent_reads = get_session not in request.app.dependency_overrides
+        responses = await batch.run_batch(
+            request.app.router, request.scope,
+            [batch.SubRequest(item.id, item.method, item.path, item.body)
+             for item in payload.requests],
+            db, concurrent_reads=concurrent_reads
+        )
+    finally:
+        resolved_user.reset(token)
+    return schemas.BatchResponse(responses=responses)
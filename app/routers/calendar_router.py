@@ -0,0 +1,113 @@
+"""Роутер календаря концертов и ленты iCalendar."""
+import json
+from datetime import date, datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from app.core import cache, ical
+from app.database import get_session
+from app.models.models import ConcertReadModel
+from app.schemas import concert as schemas
+from app.utils.utils import calendar_feed_response
+
+router = APIRouter(prefix="/concerts", tags=["Концерты"])
+
+concerts_cache = cache.get_cache("concerts", ttl=300)
+
+
+def _month_range(month: str):
+    """Возвращает начало месяца и начало следующего месяца."""
+    year, number = (int(part) for part in month.split("-"))
+    start = datetime(year, number, 1)
+    end = datetime(year + number // 12, number % 12 + 1, 1)
+    return start, end
+
+
+@router.get("/calendar",
+            response_model=schemas.CalendarMonth,
+            summary='Календарь концертов на месяц')
+def read_calendar(
+        month: str = Query(pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Месяц в формате YYYY-MM"),
+        organization_id: Optional[int] = Query(default=None, description="Концерты организации"),
+        status_of_concert: schemas.ConcertStatus | None = Query(
+            default=None,
+            description="Фильтр по статусу концерта"
+        ),
+        db: Session = Depends(get_session)
+):
+    """
+    Возвращает концерты месяца, сгруппированные по дням (UTC). Все дни
+    считаются одним запросом с GROUP BY по дню над диапазоном дат,
+    который читается по индексу на дату концерта. Результат кэшируется
+    до изменения любого концерта.
+
+    Args:
+        month (str): Месяц в формате YYYY-MM.
+        organization_id (int | None): ID организации.
+        status_of_concert (ConcertStatus | None): Статус концертов.
+        db (Session): Сессия базы данных.
+
+    Returns:
+        CalendarMonth: Дни месяца с концертами.
+    """
+    key = ("calendar", month, organization_id,
+           status_of_concert.value if status_of_concert else None)
+    cached = concerts_cache.get(key)
+    if cached is not None:
+        return cached
+
+    start, end = _month_range(month)
+    day = func.date(ConcertReadModel.date)
+    query = (
+        select(day.label("day"), func.count().label("count"),
+               func.json_group_array(func.json_object(
+                   "id", ConcertReadModel.id,
+                   "title", ConcertReadModel.title,
+                   "date", ConcertReadModel.date,
+                   "location", ConcertReadModel.location,
+                   "current_status", ConcertReadModel.current_status
+               )).label("concerts"))
+        .where(ConcertReadModel.date >= start, ConcertReadModel.date < end)
+        .group_by(day)
+        .order_by(day)
+    )
+    if organization_id is not None:
+        query = query.where(ConcertReadModel.organization_id == organization_id)
+    if status_of_concert:
+        query = query.where(ConcertReadModel.current_status == status_of_concert.value)
+
+    days = []
+    for row in db.execute(query):
+        concerts = [schemas.CalendarConcert.model_validate(item) for item in json.loads(row.concerts)]
+        concerts.sort(key=lambda item: (item.date, item.id))
+        days.append(schemas.CalendarDay(day=date.fromisoformat(row.day), count=row.count,
+                                        concerts=concerts))
+    calendar = schemas.CalendarMonth(month=month, total=sum(item.count for item in days), days=days)
+    concerts_cache.set(key, calendar)
+    return calendar
+
+
+@router.get("/calendar.ics",
+            summary='Лента предстоящих концертов организации в формате iCalendar')
+def read_calendar_feed(
+        organization_id: int = Query(description="ID организации"),
+        if_modified_since: Optional[str] = Header(default=None)
+):
+    """
+    Возвращает предстоящие концерты организации в формате iCalendar для
+    подписки из календарей. Лента формируется потоком и кэшируется до
+    изменения её концертов; с If-Modified-Since возвращается 304, если
+    лента не менялась.
+
+    Args:
+        organization_id (int): ID организации.
+        if_modified_since (str | None): Заголовок If-Modified-Since.
+
+    Returns:
+        Response: Лента text/calendar или 304.
+    """
+    return calendar_feed_response(
+        (ical.ORGANIZATION, organization_id),
+        ical.feed_query(organization_id=organization_id), if_modified_since
+    )
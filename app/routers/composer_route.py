@@ -1,8 +1,11 @@
 """Роутер для работы с композиторами."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core import counters
+from app.core.fuzzy import composer_matcher
+from app.core.suggest import composer_index, composer_item
 from app.models.models import User
 from app.models.models import Composer
 from app.schemas import composer as schemas
@@ -50,13 +53,20 @@ def create_composer(
     db.add(db_composer)
     db.commit()
     db.refresh(db_composer)
+    composer_index.add(composer_item(db_composer))
+    composer_matcher.add(db_composer.id, db_composer.name)
     return db_composer
 
 @router.get("/", response_model=List[schemas.ComposerRead],
              summary='Получить список всех композиторов')
 def read_composers(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    include_total: bool = Query(
+        default=False,
+        description="Вернуть общее количество композиторов в заголовке X-Total-Count"
+    ),
     db: Session = Depends(get_session)
 ):
     """
@@ -64,16 +74,45 @@ def read_composers(
     указания параметров для пропуска и ограничения количества записей.
 
     Args:
+        response (Response): Ответ, в который добавляется X-Total-Count.
         skip (int): Количество записей для пропуска (по умолчанию 0).
         limit (int): Максимальное количество записей для получения (по умолчанию 100).
+        include_total (bool): Вернуть общее количество из счётчика справочника.
         db (Session): Сессия базы данных.
 
     Returns:
         List[Composer]: Список композиторов.
     """
+    if include_total:
+        response.headers["X-Total-Count"] = str(
+            counters.read_total(db, counters.CATALOG, [counters.COMPOSERS_KEY])
+        )
     composers = db.query(Composer).offset(skip).limit(limit).all()
     return composers
 
+@router.get("/suggest", response_model=List[schemas.ComposerRead],
+            summary='Подсказки по началу имени композитора')
+def suggest_composers(
+    q: str = Query(min_length=1, description="Начало имени, отчества или фамилии"),
+    limit: int = Query(default=10, ge=1, le=50),
+    db: Session = Depends(get_session)
+):
+    """
+    Возвращает композиторов, имя которых (или любое слово в нём) начинается
+    с введённой строки. Поиск не зависит от регистра и различия 'е'/'ё',
+    результаты упорядочены по числу концертов с композитором.
+
+    Args:
+        q (str): Введённый префикс.
+        limit (int): Максимальное количество подсказок.
+        db (Session): Сессия базы данных.
+
+    Returns:
+        List[Composer]: Список подходящих композиторов.
+    """
+    composer_index.ensure_loaded(db)
+    return composer_index.search(q, limit)
+
 @router.get("/{composer_id}", response_model=schemas.ComposerRead,
              summary='Получить композитора по id')
 def read_composer(composer_id: int, db: Session = Depends(get_session),
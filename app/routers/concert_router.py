@@ -1,19 +1,106 @@
 """Роутер для управления концертами."""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List, Optional
+import heapq
+from itertools import islice
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from typing import Dict, List, Optional
 from datetime import datetime, timezone
-from sqlalchemy.orm import joinedload, Session
-from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy import case, delete, func, select, update
+from app.config import settings
+from app.core import archive, cache, counters, events, venues
+from app.core.fuzzy import composer_matcher
+from app.core.matching import enqueue_matches
+from app.core.outbox import outbox_processor
+from app.core.popularity import decayed_score, view_counter
+from app.core.read_model import delete_bookmarks, sync_bulk_changes
+from app.core.scheduler import status_scheduler
+from app.core.similarity import features, similar_concerts, similarity_refresher
+from app.core.singleflight import normalize_key, request_coalescer
+from app.core.suggest import composer_index, instrument_index
 from app.database import get_session
 from app.models.models import (Concert, User, ConcertStatus,
                                Composer, Instrument, ConcertComposer,
-                               ConcertInstrument, UserRole)
+                               ConcertInstrument, ConcertPopularity, ConcertReadModel,
+                               ConcertReadModelItem, Notification, UserRole, Venue)
 from app.schemas import concert as schemas
+from app.utils.utils import check_ids_exist
 from ..auth.auth import get_current_user
 
 
 router = APIRouter(prefix="/concerts", tags=["Концерты"])
 
+concerts_cache = cache.get_cache("concerts", ttl=300)
+
+# Точные количества по фильтрам живут в кэше концертов (сбрасывается при
+# записи), но меньше обычного, чтобы не держать редкие комбинации.
+COUNT_CACHE_TTL = 30
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+FIELDS_DESCRIPTION = "Поля концерта через запятую, например id,title,date"
+INCLUDE_DESCRIPTION = "Связанные данные через запятую: composers, instruments"
+
+
+def _field_selection(fields: Optional[str], include: Optional[str]) -> Optional[tuple]:
+    """Разбирает ?fields= и ?include= в набор полей ответа.
+
+    Без обоих параметров возвращает None (полный ConcertRead). Если задан
+    только include, возвращаются все поля концерта и указанные связи;
+    если задан fields без include, связи не загружаются. Поле id
+    возвращается всегда.
+
+    Raises:
+        HTTPException: Если запрошены неизвестные поля
+
+    Returns:
+        tuple | None: Поля в каноническом порядке ConcertRead
+    """
+    if fields is None and include is None:
+        return None
+    known = list(schemas.ConcertRead.model_fields)
+    scalars = [name for name in known if name not in schemas.CONCERT_RELATIONS]
+
+    requested = set(scalars) if fields is None else {
+        name.strip() for name in fields.split(",") if name.strip()
+    }
+    relations = {name.strip() for name in (include or "").split(",") if name.strip()}
+    unknown = sorted((requested - set(known)) | (relations - set(schemas.CONCERT_RELATIONS)))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Неизвестные поля: {unknown}"
+        )
+    selected = requested | relations | {"id"}
+    return tuple(name for name in known if name in selected)
+
+
+def _sparse_rows(db: Session, query, selection: tuple) -> List[dict]:
+    """Выполняет запрос к модели чтения, выбирая только нужные столбцы."""
+    columns = [getattr(ConcertReadModel, name) for name in selection]
+    return [dict(row) for row in db.execute(query.with_only_columns(*columns)).mappings()]
+
+
+def _sparse_response(rows: List[dict], selection: tuple, response: Response) -> Response:
+    """Сериализует строки схемой для выбранных полей."""
+    adapter = schemas.concert_fields_adapter(selection)
+    headers = {}
+    if TOTAL_COUNT_HEADER in response.headers:
+        headers[TOTAL_COUNT_HEADER] = response.headers[TOTAL_COUNT_HEADER]
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(rows)),
+        media_type="application/json",
+        headers=headers
+    )
+
+
+def _publish(db: Session, event_type: str, concert_id: int) -> None:
+    """Публикует событие об изменении концерта в ленту изменений."""
+    concert = db.get(ConcertReadModel, concert_id)
+    data = None
+    if concert is not None:
+        data = schemas.ConcertRead.model_validate(concert).model_dump(mode="json")
+    events.concert_events.publish(event_type, concert_id, data)
+
 
 @router.post("/",
              response_model=schemas.ConcertRead,
@@ -40,6 +127,7 @@ def create_concert(
             detail="Невозможно создать концерт с прошедшей датой"
         )
 
+    venue = venues.resolve_venue(db, concert_data.location)
     new_concert = Concert(
         title=concert_data.title,
         date=concert_data.date,
@@ -47,7 +135,8 @@ def create_concert(
         price_type=concert_data.price_type,
         price_amount=concert_data.price_amount,
         location=concert_data.location,
-        organization_id=current_user.id
+        organization_id=current_user.id,
+        venue_id=venue.id if venue else None
     )
 
     db.add(new_concert)
@@ -70,9 +159,20 @@ def create_concert(
 
             db.add(concert_instrument)
 
+    notifications = enqueue_matches(
+        db, new_concert.id,
+        concert_data.composers or [], concert_data.instruments or [],
+        concert_data.date, concert_data.price_amount
+    )
 
     db.commit()
     db.refresh(new_concert)
+    status_scheduler.notify()
+    if notifications:
+        outbox_processor.notify()
+    composer_index.sync_concerts(db, [new_concert.id])
+    instrument_index.sync_concerts(db, [new_concert.id])
+    _publish(db, events.CREATED, new_concert.id)
 
     return new_concert
 
@@ -84,6 +184,7 @@ def create_concert(
             summary='Получить концерты с фильтрацией по статусу',
             description="Возвращает список концертов с возможностью фильтрации по статусу")
 def get_concerts(
+        response: Response,
         status_of_concert: schemas.ConcertStatus | None = Query(
             default=None,
             description="Фильтр по статусу концерта",
@@ -91,75 +192,287 @@ def get_concerts(
         ),
         skip: int = 0,
         limit: int = 100,
+        include_total: bool = Query(
+            default=False,
+            description="Вернуть общее количество концертов в заголовке X-Total-Count"
+        ),
+        date_from: Optional[datetime] = Query(
+            default=None,
+            description="Концерты не раньше этой даты; для прошлых сезонов читается и архив"
+        ),
+        date_to: Optional[datetime] = Query(default=None, description="Концерты не позже этой даты"),
+        fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+        include: Optional[str] = Query(default=None, description=INCLUDE_DESCRIPTION),
         db: Session = Depends(get_session)
 ):
-    query = db.query(Concert).options(
-        joinedload(Concert.concert_composers).joinedload(ConcertComposer.composer),
-        joinedload(Concert.concert_instruments).joinedload(ConcertInstrument.instrument)
-    )
+    selection = _field_selection(fields, include)
+    query = select(ConcertReadModel)
 
     if status_of_concert:
-        query = query.filter(Concert.current_status == status_of_concert.value)
-
-    concerts = query.offset(skip).limit(limit).all()
-
-    result = []
-    for concert in concerts:
-        concert_dict = {
-            "id": concert.id,
-            "title": concert.title,
-            "date": concert.date,
-            "description": concert.description,
-            "price_type": concert.price_type,
-            "price_amount": concert.price_amount,
-            "location": concert.location,
-            "current_status": concert.current_status,
-            "organization_id": concert.organization_id,
-            "composers": [
-                {
-                    "id": cc.composer.id,
-                    "name": cc.composer.name,
-                    "birth_year": cc.composer.birth_year,
-                    "death_year": cc.composer.death_year
-                } for cc in concert.concert_composers
-            ],
-            "instruments": [
-                {
-                    "id": ci.instrument.id,
-                    "name": ci.instrument.name
-                } for ci in concert.concert_instruments
-            ]
-        }
-        result.append(concert_dict)
-
-    return result
-
-@router.get("/{concert_id}",
+        query = query.where(ConcertReadModel.current_status == status_of_concert.value)
+    if date_from is not None:
+        query = query.where(ConcertReadModel.date >= date_from)
+    if date_to is not None:
+        query = query.where(ConcertReadModel.date <= date_to)
+
+    archived = None
+    if status_of_concert != ConcertStatus.UPCOMING and archive.covers(db, date_from):
+        archived = archive.archived_query(
+            date_from, date_to, status_of_concert.value if status_of_concert else None
+        )
+
+    if include_total:
+        if date_from is None and date_to is None:
+            statuses = [status_of_concert.value] if status_of_concert else None
+            total = counters.read_total(db, counters.STATUS, statuses)
+        else:
+            total = db.scalar(select(func.count()).select_from(query.subquery()))
+        if archived is not None:
+            total += archive.count_archived(db, archived)
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+
+    query = query.order_by(ConcertReadModel.id)
+    if archived is not None:
+        return _with_archive(db, query, archived, skip, limit, selection, response)
+    query = query.offset(skip).limit(limit)
+    if selection is not None:
+        return _sparse_response(_sparse_rows(db, query, selection), selection, response)
+    return db.scalars(query).all()
+
+
+def _with_archive(db: Session, query, archived, skip: int, limit: int,
+                  selection: Optional[tuple], response: Response):
+    """Возвращает страницу концертов из горячей таблицы и архива по возрастанию ID.
+
+    Из каждой таблицы читается не больше skip + limit строк, страницы
+    сливаются без повторной сортировки.
+    """
+    window = skip + limit
+    archived_rows = archive.load_archived(db, archived.limit(window))
+    if selection is None:
+        hot = db.scalars(query.limit(window)).all()
+        archived_rows = [schemas.ConcertRead.model_validate(row) for row in archived_rows]
+        return list(islice(heapq.merge(hot, archived_rows, key=lambda item: item.id), skip, window))
+    hot = _sparse_rows(db, query.limit(window), selection)
+    rows = list(islice(heapq.merge(hot, archived_rows, key=lambda item: item["id"]), skip, window))
+    return _sparse_response(rows, selection, response)
+
+
+@router.get("/popular",
+            response_model=List[schemas.PopularConcert],
+            summary='Популярные предстоящие концерты')
+def read_popular_concerts(
+        limit: int = Query(default=20, ge=1, le=100),
+        db: Session = Depends(get_session)
+):
+    """
+    Возвращает предстоящие концерты по убыванию рейтинга популярности:
+    числа просмотров с затуханием во времени (см. app.core.popularity).
+    Порядок берётся из индекса по log_score; просмотры последних секунд,
+    ещё не записанные в базу, не учитываются.
+
+    Args:
+        limit (int): Количество концертов.
+        db (Session): Сессия базы данных.
+
+    Returns:
+        List[PopularConcert]: Популярные концерты.
+    """
+    rows = db.execute(
+        select(ConcertReadModel, ConcertPopularity.views, ConcertPopularity.log_score)
+        .join(ConcertPopularity, ConcertPopularity.concert_id == ConcertReadModel.id)
+        .where(ConcertReadModel.current_status == ConcertStatus.UPCOMING.value)
+        .order_by(ConcertPopularity.log_score.desc())
+        .limit(limit)
+    ).all()
+    now = datetime.now(timezone.utc)
+    return [
+        schemas.PopularConcert(
+            **schemas.ConcertRead.model_validate(concert).model_dump(),
+            views=views,
+            popularity=round(decayed_score(log_score, now), 4)
+        )
+        for concert, views, log_score in rows
+    ]
+
+
+@router.get("/nearby",
+            response_model=List[schemas.NearbyConcert],
+            summary='Предстоящие концерты рядом с точкой')
+def read_nearby_concerts(
+        lat: float = Query(ge=-90, le=90, description="Широта"),
+        lon: float = Query(ge=-180, le=180, description="Долгота"),
+        radius: float = Query(default=5.0, gt=0, le=settings.nearby_max_radius_km,
+                              description="Радиус поиска в километрах"),
+        date: Optional[datetime] = None,
+        composer_names: Optional[List[str]] = Query(None),
+        instrument_names: Optional[List[str]] = Query(None),
+        limit: int = Query(default=50, ge=1, le=200),
+        db: Session = Depends(get_session)
+):
+    """
+    Возвращает предстоящие концерты на площадках не дальше radius
+    километров от точки по возрастанию расстояния, затем даты. Площадки
+    отбираются по ограничивающему прямоугольнику через R*Tree, точное
+    расстояние считается только для них (см. app.core.venues). Фильтры
+    date, composer_names и instrument_names работают как в /concerts/filter/.
+
+    Args:
+        lat (float): Широта точки.
+        lon (float): Долгота точки.
+        radius (float): Радиус в километрах.
+        date (datetime | None): Дата концерта.
+        composer_names (List[str] | None): Композиторы.
+        instrument_names (List[str] | None): Инструменты.
+        limit (int): Количество концертов.
+        db (Session): Сессия базы данных.
+
+    Returns:
+        List[NearbyConcert]: Концерты с расстоянием и площадкой.
+    """
+    query = _filtered_concerts(db, date, composer_names, instrument_names)
+    if query is None:
+        return []
+    distance = venues.distance_km(lat, lon)
+    rows = db.execute(
+        query.add_columns(Venue, distance)
+        .join(Venue, Venue.id == ConcertReadModel.venue_id)
+        .where(Venue.id.in_(venues.nearby_venue_ids(lat, lon, radius)), distance <= radius)
+        .order_by(distance, ConcertReadModel.date, ConcertReadModel.id)
+        .limit(limit)
+    ).all()
+    return [
+        schemas.NearbyConcert(
+            **schemas.ConcertRead.model_validate(concert).model_dump(),
+            distance_km=round(distance_value, 3),
+            venue=schemas.VenueRead.model_validate(venue)
+        )
+        for concert, venue, distance_value in rows
+    ]
+
+
+# Конвертер :int, чтобы статические пути вида /concerts/stream из других
+# роутеров не перехватывались этим маршрутом.
+@router.get("/{concert_id:int}",
             response_model=schemas.ConcertRead,
             status_code=status.HTTP_200_OK,
             summary='Получить концерт по concert_id')
 def read_concert(
         concert_id: int,
+        fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+        include: Optional[str] = Query(default=None, description=INCLUDE_DESCRIPTION),
         db: Session = Depends(get_session)
 ):
-    concert = db.query(Concert).options(
-        joinedload(Concert.concert_composers).joinedload(ConcertComposer.composer),
-        joinedload(Concert.concert_instruments).joinedload(ConcertInstrument.instrument)
-    ).filter(Concert.id == concert_id).first()
+    selection = _field_selection(fields, include)
+
+    def load():
+        if selection is None:
+            row = db.get(ConcertReadModel, concert_id)
+        else:
+            rows = _sparse_rows(
+                db, select(ConcertReadModel).where(ConcertReadModel.id == concert_id), selection
+            )
+            row = rows[0] if rows else None
+        if row is None:
+            # Архив читается только для концертов, которых нет в горячей таблице.
+            row = archive.get_archived(db, concert_id)
+        if row is None or selection is not None:
+            return row
+        return schemas.ConcertRead.model_validate(row)
+
+    concert = request_coalescer.do(
+        normalize_key("read_concert", concert_id=concert_id, fields=selection),
+        load, route="read_concert"
+    )
 
     if not concert:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Концерт не найден"
         )
+    view_counter.hit(concert_id)
 
-    # Преобразуем данные в нужный формат
-    concert.composers = [schemas.ComposerRead.from_orm(cc.composer) for cc in concert.concert_composers]
-    concert.instruments = [schemas.InstrumentRead.from_orm(ci.instrument) for ci in concert.concert_instruments]
-
+    if selection is not None:
+        model = schemas.concert_fields_model(selection)
+        return Response(
+            content=model.model_validate(concert).model_dump_json(),
+            media_type="application/json"
+        )
     return concert
 
 
+@router.get("/{concert_id:int}/similar",
+            response_model=List[schemas.SimilarConcert],
+            summary='Похожие предстоящие концерты')
+def read_similar_concerts(
+        concert_id: int,
+        limit: int = Query(default=10, ge=1, le=50),
+        db: Session = Depends(get_session)
+):
+    """
+    Возвращает предстоящие концерты с похожим составом композиторов и
+    инструментов по убыванию сходства.
+
+    Для предстоящих концертов соседи посчитаны заранее фоновой задачей;
+    для прошедших, отменённых и архивных считаются по индексу при запросе.
+    Индекс строит только фоновая задача: пока он не построен, запрос
+    получает 503 с Retry-After.
+
+    Args:
+        concert_id (int): ID концерта.
+        limit (int): Количество похожих концертов.
+        db (Session): Сессия базы данных.
+
+    Raises:
+        HTTPException: Если индекс ещё не построен или концерт не найден.
+
+    Returns:
+        List[SimilarConcert]: Похожие концерты.
+    """
+    if not similar_concerts.loaded:
+        similarity_refresher.notify()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Индекс похожих концертов строится, повторите позже",
+            headers={"Retry-After": "1"}
+        )
+    neighbours = similar_concerts.neighbours(concert_id)
+    if neighbours is None:
+        concert = db.get(ConcertReadModel, concert_id)
+        if concert is not None:
+            concert = schemas.ConcertRead.model_validate(concert)
+        else:
+            concert = archive.get_archived(db, concert_id)
+            concert = schemas.ConcertRead.model_validate(concert) if concert else None
+        if concert is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Концерт не найден"
+            )
+        neighbours = similar_concerts.similar_to(
+            features([item.id for item in concert.composers],
+                     [item.id for item in concert.instruments]),
+            exclude=concert_id
+        )
+
+    neighbours = neighbours[:limit]
+    rows = {
+        row.id: row for row in db.scalars(
+            select(ConcertReadModel).where(
+                ConcertReadModel.id.in_([item_id for item_id, _ in neighbours]),
+                ConcertReadModel.current_status == ConcertStatus.UPCOMING.value
+            )
+        )
+    }
+    return [
+        schemas.SimilarConcert(
+            **schemas.ConcertRead.model_validate(rows[item_id]).model_dump(),
+            similarity=round(score, 4)
+        )
+        for item_id, score in neighbours if item_id in rows
+    ]
+
+
 @router.patch("/{concert_id}",
               response_model=schemas.ConcertUpdateInfo,
               status_code=status.HTTP_200_OK,
@@ -194,14 +507,62 @@ def update_concert(
                 detail="Невозможно установить дату концерта раньше сегодняшней"
             )
 
+    composer_ids = data.pop("composers", None)
+    instrument_ids = data.pop("instruments", None)
+    if composer_ids is not None:
+        check_ids_exist(db, Composer, composer_ids, "Композиторы не найдены")
+    if instrument_ids is not None:
+        check_ids_exist(db, Instrument, instrument_ids, "Инструменты не найдены")
+
     for key, value in data.items():
         setattr(concert, key, value)
+    if "location" in data:
+        venue = venues.resolve_venue(db, concert.location)
+        concert.venue_id = venue.id if venue else None
 
     db.add(concert)
+    added_composers = removed_composers = added_instruments = removed_instruments = set()
+    if composer_ids is not None:
+        added_composers, removed_composers = _apply_link_diff(
+            db, ConcertComposer, ConcertComposer.composer_id, concert_id, composer_ids)
+    if instrument_ids is not None:
+        added_instruments, removed_instruments = _apply_link_diff(
+            db, ConcertInstrument, ConcertInstrument.instrument_id, concert_id, instrument_ids)
+    if added_composers or removed_composers or added_instruments or removed_instruments:
+        db.flush()
+        sync_bulk_changes(db, [concert_id])
+
     db.commit()
     db.refresh(concert)
+    if "date" in data:
+        status_scheduler.notify()
+    if added_composers or removed_composers:
+        composer_index.sync_concerts(db, [concert_id])
+    if added_instruments or removed_instruments:
+        instrument_index.sync_concerts(db, [concert_id])
+    _publish(db, events.UPDATED, concert_id)
 
-    return concert
+    response = schemas.ConcertUpdateInfo.model_validate(concert, from_attributes=True)
+    response.composers = sorted(link.composer_id for link in concert.concert_composers)
+    response.instruments = sorted(link.instrument_id for link in concert.concert_instruments)
+    return response
+
+
+def _apply_link_diff(db: Session, model, column, concert_id: int, wanted: List[int]):
+    """Приводит связи концерта к заданному набору минимальным числом изменений.
+
+    Удаляет лишние связи одним DELETE ... IN и добавляет недостающие.
+
+    Returns:
+        Tuple[Set[int], Set[int]]: Добавленные и удалённые ID
+    """
+    current = set(db.scalars(select(column).where(model.concert_id == concert_id)))
+    wanted = set(wanted)
+    added, removed = wanted - current, current - wanted
+    if removed:
+        db.execute(delete(model).where(model.concert_id == concert_id, column.in_(removed)))
+    db.add_all([model(concert_id=concert_id, **{column.key: item_id}) for item_id in sorted(added)])
+    return added, removed
 
 
 @router.patch(
@@ -245,6 +606,7 @@ def cancel_concert(
 
     db.commit()
     db.refresh(concert)
+    _publish(db, events.CANCELLED, concert_id)
 
     return concert
 
@@ -281,38 +643,412 @@ def delete_concert(
 
     db.query(ConcertInstrument).filter_by(concert_id=concert_id).delete()
 
+    db.query(Notification).filter_by(concert_id=concert_id).delete()
+
+    delete_bookmarks(db.connection(), [concert_id])
     db.delete(concert)
     db.commit()
+    composer_index.sync_concerts(db, [concert_id])
+    instrument_index.sync_concerts(db, [concert_id])
+    _publish(db, events.DELETED, concert_id)
 
     return {"message": "Концерт успешно удален"}
 
 
+def _unique(ids: List[int]) -> List[int]:
+    return list(dict.fromkeys(ids))
+
+
+def _owned_concerts(db: Session, ids: List[int], current_user: User) -> Dict[int, object]:
+    """Загружает концерты одним запросом и отмечает чужие и отсутствующие.
+
+    Returns:
+        Dict[int, object]: Строка концерта или готовый BulkOutcome по каждому ID
+    """
+    rows = {
+        row.id: row for row in db.execute(
+            select(Concert.id, Concert.organization_id, Concert.current_status, Concert.date)
+            .where(Concert.id.in_(ids))
+        )
+    }
+    checked = {}
+    for concert_id in ids:
+        row = rows.get(concert_id)
+        if row is None:
+            checked[concert_id] = schemas.BulkOutcome(
+                id=concert_id, outcome="not_found", detail="Концерт не найден")
+        elif row.organization_id != current_user.id:
+            checked[concert_id] = schemas.BulkOutcome(
+                id=concert_id, outcome="forbidden",
+                detail="Вы не являетесь организатором этого концерта")
+        else:
+            checked[concert_id] = row
+    return checked
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _bulk_result(ids: List[int], checked: Dict[int, object], changed: List[int]) -> schemas.BulkResult:
+    """Собирает результаты по ID в порядке запроса."""
+    changed_ids = set(changed)
+    results = []
+    for concert_id in ids:
+        outcome = checked[concert_id]
+        if isinstance(outcome, schemas.BulkOutcome):
+            results.append(outcome)
+        elif concert_id in changed_ids:
+            results.append(schemas.BulkOutcome(id=concert_id, outcome="ok"))
+        else:
+            results.append(schemas.BulkOutcome(
+                id=concert_id, outcome="invalid", detail="Концерт изменён другим запросом"))
+    return schemas.BulkResult(changed=len(changed_ids), results=results)
+
+
+@router.post("/bulk/cancel",
+             response_model=schemas.BulkResult,
+             summary='Отменить несколько концертов')
+def bulk_cancel_concerts(
+        bulk_data: schemas.BulkConcertIds,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Отменяет концерты организации одним запросом UPDATE.
+
+    Принадлежность концертов проверяется одним запросом; результат
+    возвращается для каждого ID: ok, not_found, forbidden или invalid.
+
+    Args:
+        bulk_data (schemas.BulkConcertIds): ID концертов.
+        db (Session): Сессия базы данных.
+        current_user (User): Текущий авторизованный пользователь.
+
+    Returns:
+        schemas.BulkResult: Результаты по каждому концерту.
+    """
+    ids = _unique(bulk_data.ids)
+    checked = _owned_concerts(db, ids, current_user)
+    now = datetime.now(timezone.utc)
+    to_cancel = []
+    for concert_id, row in checked.items():
+        if isinstance(row, schemas.BulkOutcome):
+            continue
+        if row.current_status == ConcertStatus.CANCELLED:
+            checked[concert_id] = schemas.BulkOutcome(
+                id=concert_id, outcome="invalid", detail="Концерт уже отменен")
+        elif _as_utc(row.date) < now:
+            checked[concert_id] = schemas.BulkOutcome(
+                id=concert_id, outcome="invalid", detail="Нельзя отменить уже прошедший концерт")
+        else:
+            to_cancel.append(concert_id)
+
+    changed = []
+    if to_cancel:
+        changed = db.scalars(
+            update(Concert)
+            .where(Concert.id.in_(to_cancel),
+                   Concert.organization_id == current_user.id,
+                   Concert.current_status != ConcertStatus.CANCELLED)
+            .values(current_status=ConcertStatus.CANCELLED)
+            .returning(Concert.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        sync_bulk_changes(db, changed)
+        db.commit()
+    for concert_id in changed:
+        _publish(db, events.CANCELLED, concert_id)
+
+    return _bulk_result(ids, checked, changed)
+
+
+@router.post("/bulk/reschedule",
+             response_model=schemas.BulkResult,
+             summary='Перенести несколько концертов')
+def bulk_reschedule_concerts(
+        bulk_data: schemas.BulkReschedule,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Переносит предстоящие концерты организации на новые даты одним
+    запросом UPDATE ... SET date = CASE id ... END.
+
+    Args:
+        bulk_data (schemas.BulkReschedule): ID концертов и новые даты.
+        db (Session): Сессия базы данных.
+        current_user (User): Текущий авторизованный пользователь.
+
+    Returns:
+        schemas.BulkResult: Результаты по каждому концерту.
+    """
+    new_dates = {item.id: item.date for item in bulk_data.items}
+    ids = list(new_dates)
+    checked = _owned_concerts(db, ids, current_user)
+    now = datetime.now(timezone.utc)
+    to_move = {}
+    for concert_id, row in checked.items():
+        if isinstance(row, schemas.BulkOutcome):
+            continue
+        if row.current_status != ConcertStatus.UPCOMING:
+            checked[concert_id] = schemas.BulkOutcome(
+                id=concert_id, outcome="invalid", detail="Перенести можно только предстоящий концерт")
+        elif _as_utc(new_dates[concert_id]) < now:
+            checked[concert_id] = schemas.BulkOutcome(
+                id=concert_id, outcome="invalid",
+                detail="Невозможно установить дату концерта раньше сегодняшней")
+        else:
+            to_move[concert_id] = new_dates[concert_id]
+
+    changed = []
+    if to_move:
+        changed = db.scalars(
+            update(Concert)
+            .where(Concert.id.in_(list(to_move)),
+                   Concert.organization_id == current_user.id,
+                   Concert.current_status == ConcertStatus.UPCOMING)
+            .values(date=case(to_move, value=Concert.id))
+            .returning(Concert.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        sync_bulk_changes(db, changed)
+        db.commit()
+    if changed:
+        status_scheduler.notify()
+    for concert_id in changed:
+        _publish(db, events.UPDATED, concert_id)
+
+    return _bulk_result(ids, checked, changed)
+
+
+@router.post("/bulk/delete",
+             response_model=schemas.BulkResult,
+             summary='Удалить несколько концертов')
+def bulk_delete_concerts(
+        bulk_data: schemas.BulkConcertIds,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Удаляет концерты организации одним запросом DELETE.
+
+    Связи с композиторами и инструментами объявлены с ON DELETE CASCADE,
+    но SQLite применяет каскад только при включённых внешних ключах,
+    поэтому они удаляются тем же набором запросов WHERE concert_id IN.
+
+    Args:
+        bulk_data (schemas.BulkConcertIds): ID концертов.
+        db (Session): Сессия базы данных.
+        current_user (User): Текущий авторизованный пользователь.
+
+    Returns:
+        schemas.BulkResult: Результаты по каждому концерту.
+    """
+    ids = _unique(bulk_data.ids)
+    checked = _owned_concerts(db, ids, current_user)
+    to_delete = [
+        concert_id for concert_id, row in checked.items()
+        if not isinstance(row, schemas.BulkOutcome)
+    ]
+
+    changed = []
+    if to_delete:
+        changed = db.scalars(
+            delete(Concert)
+            .where(Concert.id.in_(to_delete), Concert.organization_id == current_user.id)
+            .returning(Concert.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if changed:
+            for model in (ConcertComposer, ConcertInstrument, Notification):
+                db.execute(delete(model).where(model.concert_id.in_(changed)))
+            delete_bookmarks(db.connection(), changed)
+        sync_bulk_changes(db, changed)
+        db.commit()
+    for concert_id in changed:
+        _publish(db, events.DELETED, concert_id)
+
+    return _bulk_result(ids, checked, changed)
+
+
+
+def _has_items(kind: str, item_ids):
+    """Условие: у концерта есть хотя бы один из элементов (по индексу kind, item_id)."""
+    return ConcertReadModel.id.in_(
+        select(ConcertReadModelItem.concert_id)
+        .where(ConcertReadModelItem.kind == kind, ConcertReadModelItem.item_id.in_(item_ids))
+    )
+
+
+def _filtered_concerts(
+    db: Session,
+    date: Optional[datetime],
+    composer_names: Optional[List[str]],
+    instrument_names: Optional[List[str]]
+):
+    """Строит запрос к модели чтения по фильтрам поиска.
+
+    Returns:
+        Select | None: Запрос или None, если фильтр заведомо ничего не найдёт
+    """
+    query = select(ConcertReadModel).where(
+        ConcertReadModel.current_status == ConcertStatus.UPCOMING.value
+    )
+
+    if date:
+        query = query.where(ConcertReadModel.date == date)
+
+    if composer_names:
+        composer_matcher.ensure_loaded(db)
+        composer_ids = sorted(composer_matcher.resolve(composer_names))
+        if not composer_ids:
+            return None
+        query = query.where(_has_items(ConcertReadModelItem.COMPOSER, composer_ids))
+
+    if instrument_names:
+        instrument_ids = db.scalars(
+            select(Instrument.id).where(Instrument.name.in_(instrument_names))
+        ).all()
+        if not instrument_ids:
+            return None
+        query = query.where(_has_items(ConcertReadModelItem.INSTRUMENT, instrument_ids))
+
+    return query
+
 
 @router.get("/filter/", response_model=List[schemas.ConcertRead],
             summary='Найти концерт по дате/инструменту/композитору')
 def filter_concerts(
+    response: Response,
     date: Optional[datetime] = None,
     composer_names: Optional[List[str]] = Query(None),
     instrument_names: Optional[List[str]] = Query(None),
+    include_total: bool = Query(
+        default=False,
+        description="Вернуть общее количество найденных концертов в заголовке X-Total-Count"
+    ),
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+    include: Optional[str] = Query(default=None, description=INCLUDE_DESCRIPTION),
     db: Session = Depends(get_session)
 ):
-    query = db.query(Concert).options(
-        joinedload(Concert.concert_composers).joinedload(ConcertComposer.composer),
-        joinedload(Concert.concert_instruments).joinedload(ConcertInstrument.instrument)
-    ).filter(Concert.current_status == ConcertStatus.UPCOMING)
+    selection = _field_selection(fields, include)
 
-    if date:
-        query = query.filter(Concert.date == date)
+    def load():
+        query = _filtered_concerts(db, date, composer_names, instrument_names)
+        total = None
+        if include_total:
+            total = _filtered_total(db, query, date, composer_names, instrument_names)
+        if query is None:
+            return [], total
+        query = query.order_by(ConcertReadModel.date)
+        if selection is not None:
+            return _sparse_rows(db, query, selection), total
+        return [schemas.ConcertRead.model_validate(row) for row in db.scalars(query)], total
 
-    if composer_names:
-        query = query.join(Concert.concert_composers).join(ConcertComposer.composer).filter(
-            Composer.name.in_(composer_names)
-        )
+    concerts, total = request_coalescer.do(
+        normalize_key("filter_concerts", date=date, composer_names=composer_names,
+                      instrument_names=instrument_names, fields=selection,
+                      include_total=include_total),
+        load, route="filter_concerts"
+    )
+    if total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
+    if selection is not None:
+        return _sparse_response(concerts, selection, response)
+    return concerts
 
-    if instrument_names:
-        query = query.join(Concert.concert_instruments).join(ConcertInstrument.instrument).filter(
-            Instrument.name.in_(instrument_names)
-        )
-    concerts = query.all()
 
-    return concerts
+def _filtered_total(
+    db: Session,
+    query,
+    date: Optional[datetime],
+    composer_names: Optional[List[str]],
+    instrument_names: Optional[List[str]]
+) -> int:
+    """Возвращает количество концертов по фильтрам поиска.
+
+    Без фильтров значение берётся из счётчиков, иначе считается COUNT(*)
+    и кэшируется на COUNT_CACHE_TTL секунд.
+    """
+    if query is None:
+        return 0
+    if not (date or composer_names or instrument_names):
+        return counters.read_total(db, counters.STATUS, [ConcertStatus.UPCOMING.value])
+
+    key = (
+        "count",
+        date.isoformat() if date else None,
+        tuple(sorted(composer_names or ())),
+        tuple(sorted(instrument_names or ())),
+    )
+    total = concerts_cache.get(key)
+    if total is None:
+        total = db.scalar(select(func.count()).select_from(query.subquery()))
+        concerts_cache.set(key, total, ttl=COUNT_CACHE_TTL)
+    return total
+
+
+@router.get("/filter/facets", response_model=schemas.ConcertFacets,
+            summary='Количество концертов по композиторам/инструментам/цене/месяцам')
+def concert_facets(
+    date: Optional[datetime] = None,
+    composer_names: Optional[List[str]] = Query(None),
+    instrument_names: Optional[List[str]] = Query(None),
+    db: Session = Depends(get_session)
+):
+    unfiltered = not (date or composer_names or instrument_names)
+    if unfiltered:
+        cached = concerts_cache.get(("facets", "upcoming"))
+        if cached is not None:
+            return cached
+
+    query = _filtered_concerts(db, date, composer_names, instrument_names)
+    if query is None:
+        return schemas.ConcertFacets(total=0)
+
+    concert_ids = query.with_only_columns(ConcertReadModel.id).scalar_subquery()
+    filtered = query.subquery()
+
+    composers = db.execute(
+        select(Composer.id, Composer.name, func.count().label("count"))
+        .join(ConcertComposer, ConcertComposer.composer_id == Composer.id)
+        .where(ConcertComposer.concert_id.in_(concert_ids))
+        .group_by(Composer.id, Composer.name)
+        .order_by(func.count().desc(), Composer.name)
+    ).all()
+    instruments = db.execute(
+        select(Instrument.id, Instrument.name, func.count().label("count"))
+        .join(ConcertInstrument, ConcertInstrument.instrument_id == Instrument.id)
+        .where(ConcertInstrument.concert_id.in_(concert_ids))
+        .group_by(Instrument.id, Instrument.name)
+        .order_by(func.count().desc(), Instrument.name)
+    ).all()
+    price_types = db.execute(
+        select(filtered.c.price_type, func.count())
+        .group_by(filtered.c.price_type)
+        .order_by(func.count().desc())
+    ).all()
+    month = func.strftime("%Y-%m", filtered.c.date)
+    months = db.execute(
+        select(month, func.count()).group_by(month).order_by(month)
+    ).all()
+
+    facets = schemas.ConcertFacets(
+        total=sum(count for _, count in months),
+        composers=[
+            schemas.NamedFacetCount(id=row.id, name=row.name, count=row.count)
+            for row in composers
+        ],
+        instruments=[
+            schemas.NamedFacetCount(id=row.id, name=row.name, count=row.count)
+            for row in instruments
+        ],
+        price_types=[
+            schemas.FacetCount(value=value, count=count) for value, count in price_types
+        ],
+        months=[schemas.FacetCount(value=value, count=count) for value, count in months],
+    )
+    if unfiltered:
+        concerts_cache.set(("facets", "upcoming"), facets)
+    return facets
@@ -0,0 +1,82 @@
+"""Роутер ленты изменений концертов (SSE и WebSocket)."""
+from typing import AsyncIterator, List, Optional
+from fastapi import APIRouter, Header, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from app.config import settings
+from app.core.events import EVICTED, ChangeEvent, Subscriber, concert_events
+
+router = APIRouter(prefix="/concerts", tags=["Концерты"])
+
+
+async def _event_stream(
+        subscriber: Subscriber,
+        backlog: Optional[List[ChangeEvent]]
+) -> AsyncIterator[str]:
+    try:
+        yield f"retry: {int(settings.event_heartbeat_seconds * 1000)}\n\n"
+        if backlog is None:
+            yield "event: reset\ndata: {}\n\n"
+        for event in backlog or []:
+            yield event.to_sse()
+
+        while True:
+            event = await subscriber.get(settings.event_heartbeat_seconds)
+            if event is None:
+                yield ": keep-alive\n\n"
+            elif event is EVICTED:
+                yield "event: evicted\ndata: {}\n\n"
+                return
+            else:
+                yield event.to_sse()
+    finally:
+        concert_events.unsubscribe(subscriber)
+
+
+@router.get("/stream",
+            summary='Лента изменений концертов (Server-Sent Events)',
+            response_class=StreamingResponse)
+async def stream_concert_changes(
+        last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID")
+):
+    """
+    Отправляет события created/updated/cancelled/deleted по мере изменения
+    концертов. Браузерный EventSource сам переподключается и передаёт
+    Last-Event-ID; пропущенные события досылаются из буфера, а если это
+    невозможно, приходит событие reset. Медленный клиент получает evicted
+    и отключается.
+    """
+    subscriber, backlog = concert_events.subscribe(last_event_id)
+    return StreamingResponse(
+        _event_stream(subscriber, backlog),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/stream/ws")
+async def stream_concert_changes_ws(
+        websocket: WebSocket,
+        last_event_id: Optional[str] = Query(default=None)
+):
+    """WebSocket-вариант ленты изменений: события отправляются как JSON."""
+    await websocket.accept()
+    subscriber, backlog = concert_events.subscribe(last_event_id)
+    try:
+        if backlog is None:
+            await websocket.send_json({"type": "reset"})
+        for event in backlog or []:
+            await websocket.send_json(event.as_dict())
+
+        while True:
+            event = await subscriber.get(settings.event_heartbeat_seconds)
+            if event is None:
+                await websocket.send_json({"type": "keep-alive"})
+            elif event is EVICTED:
+                await websocket.close(code=1013, reason="evicted")
+                return
+            else:
+                await websocket.send_json(event.as_dict())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        concert_events.unsubscribe(subscriber)
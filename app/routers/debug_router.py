@@ -0,0 +1,63 @@
+"""Роутер выгрузки профилей запросов."""
+
+# Стандартные библиотеки
+import hmac
+from typing import List, Optional
+
+# Сторонние библиотеки
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+# Локальные модули
+from app.config import settings
+from app.core.profiling import profiler
+
+
+def require_profiling_token(x_profile: Optional[str] = Header(default=None)) -> None:
+    """Пропускает только запросы с токеном профилирования.
+
+    Raises:
+        HTTPException: Если профилирование выключено или токен неверный
+    """
+    if not settings.profiling_token or x_profile is None or not hmac.compare_digest(
+            x_profile.encode("latin-1"), settings.profiling_token.encode("latin-1")):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
+
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["Debug"],
+    dependencies=[Depends(require_profiling_token)],
+    include_in_schema=False
+)
+
+
+@router.get("/profiles", summary="Последние профили запросов")
+def read_profiles() -> List[dict]:
+    """Возвращает сводку последних сохранённых профилей.
+
+    Returns:
+        List[dict]: Сводки профилей, новые первыми
+    """
+    return [profile.summary() for profile in profiler.profiles()]
+
+
+@router.get("/profiles/{profile_id}",
+            response_class=PlainTextResponse,
+            summary="Скачать профиль запроса")
+def download_profile(profile_id: int) -> str:
+    """Возвращает отчёт профиля: SQL и стеки в свёрнутом формате.
+
+    Raises:
+        HTTPException: Если профиль не найден
+    """
+    profile = profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Профиль не найден"
+        )
+    return profile.render()
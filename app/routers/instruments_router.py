@@ -1,7 +1,9 @@
 """Роутер для работы с инструментами."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core import counters
+from app.core.suggest import instrument_index, instrument_item
 from app.models.models import Instrument
 from app.schemas import instrument as schemas
 from app.database import get_session
@@ -27,18 +29,38 @@ def create_instrument(
     db.add(db_instrument)
     db.commit()
     db.refresh(db_instrument)
+    instrument_index.add(instrument_item(db_instrument))
     return db_instrument
 
 @router.get("/", response_model=List[schemas.InstrumentRead],
              summary = 'Получить список всех инструментов')
 def read_instruments(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    include_total: bool = Query(
+        default=False,
+        description="Вернуть общее количество инструментов в заголовке X-Total-Count"
+    ),
     db: Session = Depends(get_session)
 ):
+    if include_total:
+        response.headers["X-Total-Count"] = str(
+            counters.read_total(db, counters.CATALOG, [counters.INSTRUMENTS_KEY])
+        )
     instruments = db.query(Instrument).offset(skip).limit(limit).all()
     return instruments
 
+@router.get("/suggest", response_model=List[schemas.InstrumentRead],
+            summary = 'Подсказки по началу названия инструмента')
+def suggest_instruments(
+    q: str = Query(min_length=1, description="Начало названия инструмента"),
+    limit: int = Query(default=10, ge=1, le=50),
+    db: Session = Depends(get_session)
+):
+    instrument_index.ensure_loaded(db)
+    return instrument_index.search(q, limit)
+
 @router.get("/{instrument_id}", response_model=schemas.InstrumentRead,
              summary = 'Получить инструмент по id')
 def read_instrument(instrument_id: int, db: Session = Depends(get_session),
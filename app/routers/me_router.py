@@ -0,0 +1,166 @@
+"""Роутер закладок и ленты концертов слушателя."""
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from typing import List, Optional
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, select
+from app.core import counters, read_model
+from app.database import get_session
+from app.models.models import Bookmark, ConcertReadModel, ConcertStatus, User, UserRole
+from app.schemas import bookmark as schemas
+from app.schemas.concert import ConcertRead
+from ..auth.auth import get_current_user
+
+router = APIRouter(prefix="/me", tags=["Закладки"])
+
+
+def _check_listener(current_user: User) -> None:
+    if current_user.role != UserRole.LISTENER:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Закладки доступны только слушателям"
+        )
+
+
+@router.put("/bookmarks/{concert_id}",
+            response_model=schemas.BookmarkRead,
+            summary='Добавить концерт в закладки')
+def add_bookmark(
+        concert_id: int,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Добавляет концерт в закладки. Повторный запрос возвращает уже
+    существующую закладку: вставка идёт через INSERT ... ON CONFLICT DO
+    NOTHING, поэтому одновременные запросы не падают на первичном ключе.
+
+    Args:
+        concert_id (int): ID концерта.
+        db (Session): Сессия базы данных.
+        current_user (User): Текущий авторизованный пользователь.
+
+    Raises:
+        HTTPException: Если пользователь не слушатель или концерт не найден.
+
+    Returns:
+        Bookmark: Закладка.
+    """
+    _check_listener(current_user)
+    if db.get(ConcertReadModel, concert_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Концерт не найден"
+        )
+    if read_model.insert_bookmark(db.connection(), current_user.id, concert_id):
+        db.commit()
+    return db.get(Bookmark, (current_user.id, concert_id))
+
+
+@router.delete("/bookmarks/{concert_id}",
+               status_code=status.HTTP_200_OK,
+               summary='Удалить концерт из закладок')
+def remove_bookmark(
+        concert_id: int,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Удаляет концерт из закладок текущего пользователя.
+
+    Args:
+        concert_id (int): ID концерта.
+        db (Session): Сессия базы данных.
+        current_user (User): Текущий авторизованный пользователь.
+
+    Raises:
+        HTTPException: Если закладки нет.
+
+    Returns:
+        dict: Сообщение об удалении.
+    """
+    bookmark = db.get(Bookmark, (current_user.id, concert_id))
+    if bookmark is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Закладка не найдена"
+        )
+    db.delete(bookmark)
+    db.commit()
+    return {"message": "Закладка удалена"}
+
+
+@router.get("/concerts",
+            response_model=List[schemas.BookmarkedConcert],
+            summary='Мои предстоящие концерты из закладок')
+def read_bookmarked_concerts(
+        response: Response,
+        after_date: Optional[datetime] = Query(
+            default=None,
+            description="Дата последнего концерта предыдущей страницы"
+        ),
+        after_id: Optional[int] = Query(
+            default=None,
+            description="ID последнего концерта предыдущей страницы"
+        ),
+        limit: int = Query(default=50, ge=1, le=200),
+        include_total: bool = Query(
+            default=False,
+            description="Вернуть количество предстоящих концертов в закладках в заголовке X-Total-Count"
+        ),
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Возвращает предстоящие концерты из закладок по возрастанию даты.
+
+    Используется keyset-пагинация по дате и ID концерта. Композиторы и
+    инструменты всей страницы приходят из модели чтения тем же запросом,
+    количество закладок на каждом концерте - одним запросом к счётчикам,
+    а общее количество - из счётчика пользователя, без COUNT по закладкам.
+
+    Args:
+        response (Response): Ответ, в который добавляется X-Total-Count.
+        after_date (datetime | None): Курсор: дата последнего концерта.
+        after_id (int | None): Курсор: ID последнего концерта.
+        limit (int): Размер страницы.
+        include_total (bool): Вернуть общее количество из счётчика.
+        db (Session): Сессия базы данных.
+        current_user (User): Текущий авторизованный пользователь.
+
+    Returns:
+        List[BookmarkedConcert]: Страница концертов.
+    """
+    query = (
+        select(ConcertReadModel, Bookmark.created_at)
+        .join(Bookmark, Bookmark.concert_id == ConcertReadModel.id)
+        .where(Bookmark.user_id == current_user.id,
+               ConcertReadModel.current_status == ConcertStatus.UPCOMING.value)
+    )
+    if after_date is not None:
+        query = query.where(or_(
+            ConcertReadModel.date > after_date,
+            and_(ConcertReadModel.date == after_date,
+                 ConcertReadModel.id > (after_id or 0))
+        ))
+    rows = db.execute(
+        query.order_by(ConcertReadModel.date, ConcertReadModel.id).limit(limit)
+    ).all()
+
+    if include_total:
+        totals = counters.read_counters(db, counters.user_scope(current_user.id),
+                                        counters.BOOKMARKS, [ConcertStatus.UPCOMING.value])
+        response.headers["X-Total-Count"] = str(totals.get(ConcertStatus.UPCOMING.value, 0))
+
+    bookmark_counts = counters.read_counters(
+        db, counters.GLOBAL_SCOPE, counters.BOOKMARKED,
+        [str(concert.id) for concert, _ in rows]
+    )
+    return [
+        schemas.BookmarkedConcert(
+            **ConcertRead.model_validate(concert).model_dump(),
+            bookmarked_at=bookmarked_at,
+            bookmarks=bookmark_counts.get(str(concert.id), 0)
+        )
+        for concert, bookmarked_at in rows
+    ]
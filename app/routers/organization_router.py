@@ -0,0 +1,137 @@
+"""Роутер кабинета организации."""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, select
+from app.core import counters
+from app.database import get_session
+from app.models.models import Composer, ConcertReadModel, User, UserRole
+from app.schemas import concert as concert_schemas
+from app.schemas import organization as schemas
+from ..auth.auth import get_current_user
+
+router = APIRouter(prefix="/organizations", tags=["Организации"])
+
+
+def _get_organization(db: Session, organization_id: int) -> User:
+    organization = db.get(User, organization_id)
+    if not organization or organization.role != UserRole.ORG:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Организация не найдена"
+        )
+    return organization
+
+
+@router.get("/{organization_id}/concerts",
+            response_model=List[concert_schemas.ConcertRead],
+            summary='Концерты организации')
+def read_organization_concerts(
+        organization_id: int,
+        status_of_concert: concert_schemas.ConcertStatus | None = Query(
+            default=None,
+            description="Фильтр по статусу концерта"
+        ),
+        after_date: Optional[datetime] = Query(
+            default=None,
+            description="Дата последнего концерта предыдущей страницы"
+        ),
+        after_id: Optional[int] = Query(
+            default=None,
+            description="ID последнего концерта предыдущей страницы"
+        ),
+        limit: int = Query(default=50, ge=1, le=200),
+        db: Session = Depends(get_session)
+):
+    """
+    Возвращает концерты организации по возрастанию даты.
+
+    Используется keyset-пагинация: для следующей страницы передаются дата и
+    ID последнего концерта текущей страницы, поэтому стоимость запроса не
+    растёт с номером страницы.
+
+    Args:
+        organization_id (int): ID организации.
+        status_of_concert (ConcertStatus | None): Фильтр по статусу.
+        after_date (datetime | None): Курсор: дата последнего концерта.
+        after_id (int | None): Курсор: ID последнего концерта.
+        limit (int): Размер страницы.
+        db (Session): Сессия базы данных.
+
+    Returns:
+        List[ConcertRead]: Страница концертов.
+    """
+    _get_organization(db, organization_id)
+
+    query = select(ConcertReadModel).where(
+        ConcertReadModel.organization_id == organization_id
+    )
+    if status_of_concert:
+        query = query.where(ConcertReadModel.current_status == status_of_concert.value)
+    if after_date is not None:
+        query = query.where(or_(
+            ConcertReadModel.date > after_date,
+            and_(ConcertReadModel.date == after_date,
+                 ConcertReadModel.id > (after_id or 0))
+        ))
+
+    query = query.order_by(ConcertReadModel.date, ConcertReadModel.id).limit(limit)
+    return db.scalars(query).all()
+
+
+@router.get("/{organization_id}/stats",
+            response_model=schemas.OrganizationStats,
+            summary='Статистика концертов организации')
+def read_organization_stats(
+        organization_id: int,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Возвращает статистику концертов организации из счётчиков, которые
+    обновляются при каждой записи, без агрегации таблицы концертов.
+
+    Args:
+        organization_id (int): ID организации.
+        db (Session): Сессия базы данных.
+        current_user (User): Текущий авторизованный пользователь.
+
+    Raises:
+        HTTPException: Если организация не найдена или это чужая организация.
+
+    Returns:
+        OrganizationStats: Статистика.
+    """
+    _get_organization(db, organization_id)
+    if current_user.id != organization_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Статистика доступна только самой организации"
+        )
+
+    scope = counters.organization_scope(organization_id)
+    months = counters.read_counters(db, scope, counters.UPCOMING_MONTH)
+    composer_counts = counters.read_history(db, scope, counters.COMPOSER)
+    composer_names = dict(db.execute(
+        select(Composer.id, Composer.name)
+        .where(Composer.id.in_([int(key) for key in composer_counts]))
+    ).all())
+
+    return schemas.OrganizationStats(
+        by_status=counters.read_history(db, scope, counters.STATUS),
+        upcoming_by_month=[
+            concert_schemas.FacetCount(value=month, count=count)
+            for month, count in sorted(months.items())
+        ],
+        composers=sorted(
+            (
+                concert_schemas.NamedFacetCount(
+                    id=int(key), name=composer_names[int(key)], count=count
+                )
+                for key, count in composer_counts.items()
+                if int(key) in composer_names
+            ),
+            key=lambda item: (-item.count, item.name)
+        ),
+    )
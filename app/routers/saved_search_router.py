@@ -0,0 +1,141 @@
+"""Роутер сохранённых поисков слушателей."""
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from app.core import ical
+from app.core.matching import SearchEntry, subscription_index
+from app.database import get_session
+from app.models.models import (Composer, Instrument, Notification,
+                               SavedSearch, User, UserRole)
+from app.schemas import saved_search as schemas
+from app.utils.utils import calendar_feed_response, check_ids_exist
+from ..auth.auth import get_current_user
+
+router = APIRouter(prefix="/saved-searches", tags=["Подписки"])
+
+
+@router.post("/",
+             response_model=schemas.SavedSearchRead,
+             status_code=status.HTTP_201_CREATED,
+             summary='Сохранить поиск и подписаться на новые концерты')
+def create_saved_search(
+        search_data: schemas.SavedSearchCreate,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Сохраняет поиск слушателя. Когда организация публикует подходящий
+    концерт, слушателю ставится уведомление.
+
+    Args:
+        search_data (schemas.SavedSearchCreate): Условия поиска.
+        db (Session): Сессия базы данных.
+        current_user (User): Текущий авторизованный пользователь.
+
+    Raises:
+        HTTPException: Если пользователь не слушатель или ID не существуют.
+
+    Returns:
+        SavedSearch: Созданный поиск.
+    """
+    if current_user.role != UserRole.LISTENER:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Подписки доступны только слушателям"
+        )
+    check_ids_exist(db, Composer, search_data.composer_ids, "Композиторы не найдены")
+    check_ids_exist(db, Instrument, search_data.instrument_ids, "Инструменты не найдены")
+
+    saved_search = SavedSearch(
+        user_id=current_user.id,
+        composer_ids=sorted(set(search_data.composer_ids)),
+        instrument_ids=sorted(set(search_data.instrument_ids)),
+        date_from=search_data.date_from,
+        date_to=search_data.date_to,
+        max_price=search_data.max_price
+    )
+    db.add(saved_search)
+    db.commit()
+    db.refresh(saved_search)
+    subscription_index.add(SearchEntry.from_model(saved_search))
+    return saved_search
+
+
+@router.get("/",
+            response_model=List[schemas.SavedSearchRead],
+            summary='Мои сохранённые поиски')
+def read_saved_searches(
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    return db.scalars(
+        select(SavedSearch)
+        .where(SavedSearch.user_id == current_user.id)
+        .order_by(SavedSearch.id)
+    ).all()
+
+
+@router.get("/notifications",
+            response_model=List[schemas.NotificationRead],
+            summary='Мои уведомления о концертах')
+def read_notifications(
+        limit: int = Query(default=50, ge=1, le=200),
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    return db.scalars(
+        select(Notification)
+        .where(Notification.user_id == current_user.id)
+        .order_by(Notification.id.desc())
+        .limit(limit)
+    ).all()
+
+
+@router.get("/{search_id}/calendar.ics",
+            summary='Лента подходящих концертов в формате iCalendar')
+def read_saved_search_feed(
+        search_id: int,
+        if_modified_since: Optional[str] = Header(default=None),
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Возвращает предстоящие концерты, подходящие под сохранённый поиск, в
+    формате iCalendar. Лента формируется потоком и кэшируется до изменения
+    подходящего концерта; с If-Modified-Since возвращается 304, если лента
+    не менялась.
+
+    Raises:
+        HTTPException: Если поиск не найден или принадлежит другому пользователю.
+    """
+    saved_search = db.get(SavedSearch, search_id)
+    if not saved_search or saved_search.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Сохранённый поиск не найден"
+        )
+    search = SearchEntry.from_model(saved_search)
+    return calendar_feed_response(
+        (ical.SEARCH, search_id), ical.feed_query(search=search), if_modified_since, search
+    )
+
+
+@router.delete("/{search_id}",
+               status_code=status.HTTP_200_OK,
+               summary='Удалить сохранённый поиск')
+def delete_saved_search(
+        search_id: int,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    saved_search = db.get(SavedSearch, search_id)
+    if not saved_search or saved_search.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Сохранённый поиск не найден"
+        )
+    db.delete(saved_search)
+    db.commit()
+    subscription_index.remove(search_id)
+    return {"message": "Сохранённый поиск удален"}
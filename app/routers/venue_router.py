@@ -0,0 +1,69 @@
+"""Роутер площадок."""
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import List
+from app.database import get_session
+from app.models.models import User, UserRole, Venue
+from app.schemas import venue as schemas
+from ..auth.auth import get_current_user
+
+router = APIRouter(prefix="/venues", tags=["Площадки"])
+
+
+@router.get("/", response_model=List[schemas.VenueRead],
+            summary='Получить список площадок')
+def read_venues(
+        skip: int = 0,
+        limit: int = 100,
+        db: Session = Depends(get_session)
+):
+    return db.scalars(select(Venue).order_by(Venue.name, Venue.id).offset(skip).limit(limit)).all()
+
+
+@router.get("/{venue_id}", response_model=schemas.VenueRead,
+            summary='Получить площадку по id')
+def read_venue(venue_id: int, db: Session = Depends(get_session)):
+    venue = db.get(Venue, venue_id)
+    if not venue:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Площадка не найдена")
+    return venue
+
+
+@router.patch("/{venue_id}", response_model=schemas.VenueRead,
+              summary='Указать адрес и координаты площадки')
+def update_venue(
+        venue_id: int,
+        venue_data: schemas.VenueUpdate,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Сохраняет адрес и координаты площадки; площадка с координатами
+    появляется в поиске концертов рядом (GET /concerts/nearby).
+
+    Args:
+        venue_id (int): ID площадки.
+        venue_data (schemas.VenueUpdate): Адрес и координаты.
+        db (Session): Сессия базы данных.
+        current_user (User): Текущий авторизованный пользователь.
+
+    Raises:
+        HTTPException: Если пользователь не организация или площадка не найдена.
+
+    Returns:
+        Venue: Изменённая площадка.
+    """
+    if current_user.role != UserRole.ORG:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Нет прав на изменение площадки"
+        )
+    venue = db.get(Venue, venue_id)
+    if not venue:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Площадка не найдена")
+    for key, value in venue_data.model_dump(exclude_unset=True).items():
+        setattr(venue, key, value)
+    db.commit()
+    db.refresh(venue)
+    return venue
@@ -0,0 +1,32 @@
+"""Pydantic-схемы для пакетных запросов"""
+
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BatchItem(BaseModel):
+    """Схема подзапроса пакета."""
+    id: Optional[str] = Field(default=None, max_length=64,
+                              description="Идентификатор подзапроса, возвращается в ответе")
+    method: Literal["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str = Field(pattern=r"^/", max_length=2048, description="Путь с query-параметрами")
+    body: Any = Field(default=None, description="Тело подзапроса (JSON)")
+
+
+class BatchRequest(BaseModel):
+    """Схема пакетного запроса."""
+    requests: List[BatchItem] = Field(min_length=1, max_length=20)
+
+
+class BatchItemResult(BaseModel):
+    """Схема ответа на подзапрос."""
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = Field(default_factory=dict)
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    """Схема ответа на пакетный запрос."""
+    responses: List[BatchItemResult]
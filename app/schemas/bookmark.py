@@ -0,0 +1,22 @@
+"""Pydantic-схемы для закладок слушателей"""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.schemas.concert import ConcertRead
+
+
+class BookmarkRead(BaseModel):
+    """Схема для чтения закладки."""
+    concert_id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class BookmarkedConcert(ConcertRead):
+    """Концерт в ленте закладок."""
+    bookmarked_at: datetime = Field(description="Дата добавления в закладки")
+    bookmarks: int = Field(description="Сколько слушателей добавили концерт в закладки")
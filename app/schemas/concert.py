@@ -1,13 +1,15 @@
 """Pydantic-схемы для работы с концертами"""
 
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, create_model
 
 from app.models.models import ConcertStatus
 from app.schemas.instrument import InstrumentRead
 from app.schemas.composer import ComposerRead
+from app.schemas.venue import VenueRead
 
 class ConcertBase(BaseModel):
     """Базовая схема для концерта."""
@@ -43,6 +45,7 @@ class ConcertRead(ConcertBase):
     id: int
     organization_id: int
     current_status: ConcertStatus
+    venue_id: Optional[int] = Field(default=None, description="ID площадки")
     composers: List[ComposerRead] = Field(default_factory=list)
     instruments: List[InstrumentRead] = Field(default_factory=list)
 
@@ -50,6 +53,50 @@ class ConcertRead(ConcertBase):
         from_attributes = True
 
 
+CONCERT_RELATIONS = ("composers", "instruments")
+
+
+@lru_cache(maxsize=256)
+def concert_fields_model(fields: Tuple[str, ...]) -> type:
+    """Возвращает схему концерта только с указанными полями.
+
+    Схемы создаются один раз на комбинацию полей и кэшируются.
+
+    Args:
+        fields (Tuple[str, ...]): Поля ConcertRead в каноническом порядке
+
+    Returns:
+        type: Pydantic-модель с выбранными полями
+    """
+    return create_model(
+        "ConcertFields_" + "_".join(fields),
+        **{name: (ConcertRead.model_fields[name].annotation, ...) for name in fields}
+    )
+
+
+@lru_cache(maxsize=256)
+def concert_fields_adapter(fields: Tuple[str, ...]) -> TypeAdapter:
+    """Возвращает адаптер списка для схемы concert_fields_model(fields)."""
+    return TypeAdapter(List[concert_fields_model(fields)])
+
+
+class SimilarConcert(ConcertRead):
+    """Похожий концерт."""
+    similarity: float = Field(description="Косинусное сходство по композиторам и инструментам (0..1)")
+
+
+class PopularConcert(ConcertRead):
+    """Концерт в рейтинге популярности."""
+    views: int = Field(description="Всего просмотров")
+    popularity: float = Field(description="Просмотры с учётом затухания во времени")
+
+
+class NearbyConcert(ConcertRead):
+    """Концерт рядом с точкой поиска."""
+    distance_km: float = Field(description="Расстояние до площадки в километрах")
+    venue: VenueRead
+
+
 class ConcertUpdateInfo(BaseModel):
     """Схема для обновления информации о концерте."""
     title: Optional[str] = None
@@ -58,3 +105,88 @@ class ConcertUpdateInfo(BaseModel):
     price_type: Optional[str] = None
     price_amount: Optional[int] = None
     location: Optional[str] = None
+    composers: Optional[List[int]] = Field(
+        default=None,
+        description="Новый набор id композиторов (заменяет текущий)"
+    )
+    instruments: Optional[List[int]] = Field(
+        default=None,
+        description="Новый набор id инструментов (заменяет текущий)"
+    )
+
+
+class FacetCount(BaseModel):
+    """Количество концертов для значения фасета."""
+    value: Optional[str] = Field(description="Значение фасета")
+    count: int = Field(description="Количество концертов")
+
+
+class NamedFacetCount(BaseModel):
+    """Количество концертов для композитора или инструмента."""
+    id: int
+    name: str
+    count: int = Field(description="Количество концертов")
+
+
+class ConcertFacets(BaseModel):
+    """Фасеты поиска концертов для текущего набора фильтров."""
+    total: int = Field(description="Всего концертов, подходящих под фильтры")
+    composers: List[NamedFacetCount] = Field(default_factory=list)
+    instruments: List[NamedFacetCount] = Field(default_factory=list)
+    price_types: List[FacetCount] = Field(default_factory=list)
+    months: List[FacetCount] = Field(
+        default_factory=list,
+        description="Количество концертов по месяцам в формате YYYY-MM"
+    )
+
+
+class CalendarConcert(BaseModel):
+    """Концерт в ячейке календаря."""
+    id: int
+    title: str
+    date: datetime
+    location: str
+    current_status: ConcertStatus
+
+
+class CalendarDay(BaseModel):
+    """Концерты одного дня."""
+    day: date = Field(description="День в формате YYYY-MM-DD (UTC)")
+    count: int = Field(description="Количество концертов")
+    concerts: List[CalendarConcert] = Field(default_factory=list)
+
+
+class CalendarMonth(BaseModel):
+    """Календарь концертов на месяц; дни без концертов не возвращаются."""
+    month: str = Field(description="Месяц в формате YYYY-MM")
+    total: int = Field(description="Всего концертов за месяц")
+    days: List[CalendarDay] = Field(default_factory=list)
+
+
+class BulkConcertIds(BaseModel):
+    """Список концертов для массовой операции."""
+    ids: List[int] = Field(min_length=1, max_length=500, description="ID концертов")
+
+
+class BulkRescheduleItem(BaseModel):
+    """Новая дата одного концерта при массовом переносе."""
+    id: int
+    date: datetime = Field(description="Новая дата и время проведения")
+
+
+class BulkReschedule(BaseModel):
+    """Массовый перенос концертов."""
+    items: List[BulkRescheduleItem] = Field(min_length=1, max_length=500)
+
+
+class BulkOutcome(BaseModel):
+    """Результат массовой операции для одного концерта."""
+    id: int
+    outcome: str = Field(description="ok, not_found, forbidden или invalid")
+    detail: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    """Результат массовой операции."""
+    changed: int = Field(description="Количество изменённых концертов")
+    results: List[BulkOutcome] = Field(default_factory=list)
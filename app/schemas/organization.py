@@ -0,0 +1,23 @@
+"""Pydantic-схемы для кабинета организации"""
+
+from typing import Dict, List
+
+from pydantic import BaseModel, Field
+
+from app.schemas.concert import FacetCount, NamedFacetCount
+
+
+class OrganizationStats(BaseModel):
+    """Статистика концертов организации."""
+    by_status: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Количество концертов по статусам"
+    )
+    upcoming_by_month: List[FacetCount] = Field(
+        default_factory=list,
+        description="Предстоящие концерты по месяцам в формате YYYY-MM"
+    )
+    composers: List[NamedFacetCount] = Field(
+        default_factory=list,
+        description="Композиторы в программах неотменённых концертов"
+    )
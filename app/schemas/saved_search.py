@@ -0,0 +1,52 @@
+"""Pydantic-схемы для сохранённых поисков и уведомлений"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class SavedSearchCreate(BaseModel):
+    """Схема для создания сохранённого поиска."""
+    composer_ids: List[int] = Field(
+        default_factory=list,
+        description="ID композиторов: подходит концерт хотя бы с одним из них или с одним из инструментов"
+    )
+    instrument_ids: List[int] = Field(
+        default_factory=list,
+        description="ID инструментов: подходит концерт хотя бы с одним из них или с одним из композиторов"
+    )
+    date_from: Optional[datetime] = Field(default=None, description="Не раньше этой даты")
+    date_to: Optional[datetime] = Field(default=None, description="Не позже этой даты")
+    max_price: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Максимальная стоимость билета в рублях"
+    )
+
+    @model_validator(mode="after")
+    def check_dates(self):
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError("date_from не может быть позже date_to")
+        return self
+
+
+class SavedSearchRead(SavedSearchCreate):
+    """Схема для чтения сохранённого поиска."""
+    id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class NotificationRead(BaseModel):
+    """Схема для чтения уведомления."""
+    id: int
+    concert_id: int
+    saved_search_id: Optional[int] = None
+    created_at: datetime
+    processed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
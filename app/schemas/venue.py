@@ -0,0 +1,30 @@
+"""Pydantic-схемы для площадок"""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class VenueRead(BaseModel):
+    """Схема для чтения площадки."""
+    id: int
+    name: str
+    address: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
+class VenueUpdate(BaseModel):
+    """Схема для изменения адреса и координат площадки."""
+    address: Optional[str] = Field(default=None, description="Адрес площадки")
+    latitude: Optional[float] = Field(default=None, ge=-90, le=90, description="Широта")
+    longitude: Optional[float] = Field(default=None, ge=-180, le=180, description="Долгота")
+
+    @model_validator(mode="after")
+    def check_coordinates(self):
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("Широта и долгота указываются вместе")
+        return self
@@ -0,0 +1,75 @@
+"""Общие вспомогательные функции роутеров."""
+
+# Стандартные библиотеки
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+# Сторонние библиотеки
+from fastapi import HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+# Локальные модули
+from app.core import ical
+from app.core.matching import SearchEntry
+from app.core.metrics import metrics
+
+
+def check_ids_exist(db: Session, model, ids: Iterable[int], detail: str) -> None:
+    """Проверяет существование всех ID одним запросом IN.
+
+    Args:
+        db (Session): Сессия базы данных
+        model: Модель с первичным ключом id
+        ids (Iterable[int]): Проверяемые ID
+        detail (str): Текст ошибки, к которому добавляются отсутствующие ID
+
+    Raises:
+        HTTPException: Если часть ID не найдена
+    """
+    ids = set(ids)
+    if not ids:
+        return
+    found = set(db.scalars(select(model.id).where(model.id.in_(ids))))
+    missing = sorted(ids - found)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{detail}: {missing}"
+        )
+
+
+def calendar_feed_response(
+        key: ical.FeedKey,
+        query: Select,
+        if_modified_since: Optional[str] = None,
+        search: Optional[SearchEntry] = None
+) -> Response:
+    """Отдаёт ленту iCalendar из кэша или отрисовывает её потоком.
+
+    Args:
+        key (FeedKey): Ключ ленты
+        query (Select): Запрос ical.feed_query
+        if_modified_since (str | None): Заголовок If-Modified-Since
+        search (SearchEntry | None): Сохранённый поиск ленты поиска
+
+    Returns:
+        Response: 304, закэшированная лента или StreamingResponse
+    """
+    feed = ical.calendar_feeds.get(key)
+    if feed is not None:
+        metrics.inc("calendar_feed_cache_hits_total")
+        headers = {"Last-Modified": ical.http_date(feed.last_modified), "Cache-Control": "no-cache"}
+        if ical.not_modified(if_modified_since, feed.last_modified):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=feed.body, media_type=ical.MEDIA_TYPE, headers=headers)
+
+    metrics.inc("calendar_feed_renders_total")
+    stamp = datetime.now(timezone.utc).replace(microsecond=0)
+    return StreamingResponse(
+        ical.render_feed(key, query, search, stamp, ical.calendar_feeds.version),
+        media_type=ical.MEDIA_TYPE,
+        headers={"Last-Modified": ical.http_date(stamp), "Cache-Control": "no-cache"}
+    )
@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.auth.auth import create_access_token, get_password_hash
+from app.core import ratelimit
+from app.core.matching import subscription_index
+from app.database import Base, get_session
+from app.main import app
+from app.models.models import (Composer, Concert, ConcertComposer, ConcertInstrument,
+                               ConcertStatus, Instrument, User, UserRole)
+
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture(scope="module")
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+
+    try:
+        org_user = User(
+            full_name="org_user",
+            email="org@example.com",
+            role=UserRole.ORG,
+            user_password=get_password_hash("orgpass"),
+            phone_number=1234567890,
+            verified=False
+        )
+        db.add(org_user)
+        db.flush()
+
+        composer1 = Composer(name="Tchaikovsky")
+        composer2 = Composer(name="Mozart")
+        instrument1 = Instrument(name="Piano")
+        instrument2 = Instrument(name="Violin")
+        db.add_all([composer1, composer2, instrument1, instrument2])
+        db.flush()
+
+        concert1 = Concert(
+            title="Test Concert 1",
+            date=datetime.now(timezone.utc) + timedelta(weeks=2),
+            description="Test description 1",
+            price_type="fixed",
+            price_amount=1000,
+            location="Test Location 1",
+            current_status=ConcertStatus.UPCOMING,
+            organization_id=org_user.id
+        )
+
+        concert2 = Concert(
+            title="Test Concert 2",
+            date=datetime.now(timezone.utc) + timedelta(weeks=3),
+            description="Test description 2",
+            price_type="free",
+            price_amount=0,
+            location="Test Location 2",
+            current_status=ConcertStatus.UPCOMING,
+            organization_id=org_user.id
+        )
+
+        concert3 = Concert(
+            title="Past Concert",
+            date=datetime.now(timezone.utc) - timedelta(weeks=1),
+            description="Completed concert",
+            price_type="fixed",
+            price_amount=500,
+            location="Old Location",
+            current_status=ConcertStatus.COMPLETED,
+            organization_id=org_user.id
+        )
+
+        db.add_all([concert1, concert2, concert3])
+        db.flush()
+
+        db.add_all([
+            ConcertComposer(concert_id=concert1.id, composer_id=composer1.id),
+            ConcertInstrument(concert_id=concert1.id, instrument_id=instrument1.id),
+            ConcertInstrument(concert_id=concert2.id, instrument_id=instrument2.id)
+        ])
+
+        db.commit()
+        yield db
+
+    except Exception as e:
+        db.rollback()
+        raise e
+    finally:
+        db.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture()
+def client(db_session):
+    app.dependency_overrides[get_session] = lambda: db_session
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def auth_client(client, db_session):
+    db_session.rollback()
+
+    test_user = User(
+        full_name="testuser",
+        email="test@example.com",
+        user_password=get_password_hash("testpass"),
+        role=UserRole.ORG,
+        phone_number=9876543210,
+        verified=False
+    )
+
+    try:
+        db_session.add(test_user)
+        db_session.commit()
+
+        access_token = create_access_token(
+            data={"sub": test_user.email},
+            expires_delta=timedelta(minutes=30)
+        )
+
+        client.headers.update({"Authorization": f"Bearer {access_token}"})
+        yield client
+
+    finally:
+        db_session.rollback()
+        db_session.query(User).filter(User.full_name == "testuser").delete()
+        db_session.commit()
+
+
+@pytest.fixture()
+def listener_headers(db_session):
+    subscription_index.reset()
+    listener = User(
+        full_name="listener",
+        email="listener@example.com",
+        user_password=get_password_hash("listenerpass"),
+        role=UserRole.LISTENER,
+        verified=False
+    )
+    db_session.add(listener)
+    db_session.commit()
+    token = create_access_token(data={"sub": listener.email}, expires_delta=timedelta(minutes=30))
+    yield {"Authorization": f"Bearer {token}"}
+    db_session.rollback()
+    db_session.query(User).filter(User.email == listener.email).delete()
+    db_session.commit()
+    subscription_index.reset()
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limits():
+    # Весь набор тестов идёт с одного IP: без сброса корзин поздние тесты
+    # упираются в лимит записи.
+    ratelimit.buckets.clear()
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import status
+from sqlalchemy import select
+from app.auth.auth import create_access_token
+from app.core.archive import archive_old_concerts
+from app.core.read_model import rebuild_all
+from app.models.models import (ArchivedConcert, Composer, Concert, ConcertComposer,
+                               ConcertReadModel, ConcertStatus, Notification, User)
+
+
+def _old_concert(db_session, title, years_ago, current_status):
+    organization = db_session.scalar(select(User).where(User.email == "org@example.com"))
+    composer = db_session.scalar(select(Composer).where(Composer.name == "Mozart"))
+    concert = Concert(
+        title=title,
+        date=datetime.now(timezone.utc) - timedelta(days=365 * years_ago),
+        price_type="free",
+        location="Old Hall",
+        current_status=current_status,
+        organization_id=organization.id
+    )
+    db_session.add(concert)
+    db_session.flush()
+    db_session.add(ConcertComposer(concert_id=concert.id, composer_id=composer.id))
+    db_session.commit()
+    return concert.id
+
+
+def test_old_concerts_move_to_archive(db_session):
+    archived_id = _old_concert(db_session, "Season 2", 2, ConcertStatus.COMPLETED)
+    recent_id = _old_concert(db_session, "Last month", 0.1, ConcertStatus.COMPLETED)
+    organization_id = db_session.scalar(select(User.id).where(User.email == "org@example.com"))
+    db_session.add(Notification(user_id=organization_id, concert_id=archived_id))
+    db_session.commit()
+
+    assert archive_old_concerts(db_session, batch_size=1) == 1
+    assert archive_old_concerts(db_session) == 0
+
+    assert db_session.get(Concert, archived_id) is None
+    assert db_session.get(ConcertReadModel, archived_id) is None
+    assert db_session.get(ArchivedConcert, archived_id) is not None
+    assert db_session.scalars(
+        select(ConcertComposer).where(ConcertComposer.concert_id == archived_id)
+    ).all() == []
+    assert db_session.scalars(
+        select(Notification).where(Notification.concert_id == archived_id)
+    ).all() == []
+    assert db_session.get(Concert, recent_id) is not None
+
+
+def test_archived_concerts_are_read_only_for_historical_ranges(client, db_session):
+    archived_id = db_session.scalar(select(ArchivedConcert.id))
+
+    hot_ids = [item["id"] for item in client.get("/concerts/").json()]
+    assert archived_id not in hot_ids
+
+    date_from = (datetime.now(timezone.utc) - timedelta(days=365 * 3)).isoformat()
+    response = client.get("/concerts/", params={"date_from": date_from, "include_total": True})
+    assert response.status_code == status.HTTP_200_OK
+    ids = [item["id"] for item in response.json()]
+    assert archived_id in ids
+    assert ids == sorted(ids)
+    assert int(response.headers["x-total-count"]) == len(ids)
+
+    upcoming = client.get("/concerts/", params={"date_from": date_from,
+                                                "status_of_concert": "upcoming"})
+    assert archived_id not in [item["id"] for item in upcoming.json()]
+
+
+def test_archived_concert_by_id(client, db_session):
+    archived_id = db_session.scalar(select(ArchivedConcert.id))
+    response = client.get(f"/concerts/{archived_id}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["title"] == "Season 2"
+    assert [item["name"] for item in response.json()["composers"]] == ["Mozart"]
+
+    sparse = client.get(f"/concerts/{archived_id}", params={"fields": "title"})
+    assert sparse.json() == {"id": archived_id, "title": "Season 2"}
+
+
+def test_archiving_keeps_organization_stats(client, db_session):
+    organization_id = db_session.scalar(select(User.id).where(User.email == "org@example.com"))
+    token = create_access_token(data={"sub": "org@example.com"}, expires_delta=timedelta(minutes=30))
+    url = f"/organizations/{organization_id}/stats"
+    headers = {"Authorization": f"Bearer {token}"}
+
+    _old_concert(db_session, "Season 3", 3, ConcertStatus.COMPLETED)
+    _old_concert(db_session, "Season 3 cancelled", 3, ConcertStatus.CANCELLED)
+    before = client.get(url, headers=headers).json()
+    assert archive_old_concerts(db_session) == 2
+    assert client.get(url, headers=headers).json() == before
+
+    rebuild_all(db_session)
+    assert client.get(url, headers=headers).json() == before
@@ -0,0 +1,95 @@
+from fastapi import status
+from sqlalchemy import select
+from app.config import settings
+from app.core.metrics import metrics
+from app.database import get_session
+from app.main import app
+from app.models.models import Composer, Concert, User
+
+
+def test_batch_runs_subrequests(auth_client, db_session):
+    concert_id = db_session.scalar(select(Concert.id).order_by(Concert.id))
+    composer_id = db_session.scalar(select(Composer.id).order_by(Composer.id))
+
+    response = auth_client.post("/batch", json={"requests": [
+        {"id": "concert", "path": f"/concerts/{concert_id}"},
+        {"id": "composer", "path": f"/composers/{composer_id}"},
+        {"id": "missing", "path": "/concerts/999999"},
+        {"id": "created", "method": "POST", "path": "/composers/",
+         "body": {"name": "Batch Composer"}},
+        {"id": "invalid", "method": "POST", "path": "/composers/", "body": {}},
+        {"id": "nested", "method": "POST", "path": "/batch", "body": {"requests": []}},
+    ]})
+    assert response.status_code == status.HTTP_200_OK
+    results = {item["id"]: item for item in response.json()["responses"]}
+    assert [item["id"] for item in response.json()["responses"]] == [
+        "concert", "composer", "missing", "created", "invalid", "nested"
+    ]
+    assert results["concert"]["status"] == status.HTTP_200_OK
+    assert results["concert"]["body"]["id"] == concert_id
+    assert results["composer"]["body"]["id"] == composer_id
+    assert results["missing"]["status"] == status.HTTP_404_NOT_FOUND
+    assert results["created"]["status"] == status.HTTP_201_CREATED
+    assert results["created"]["body"]["name"] == "Batch Composer"
+    assert results["invalid"]["status"] == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert results["nested"]["status"] == status.HTTP_400_BAD_REQUEST
+
+    created_id = results["created"]["body"]["id"]
+    assert db_session.get(Composer, created_id) is not None
+    db_session.delete(db_session.get(Composer, created_id))
+    db_session.commit()
+
+
+def test_batch_forwards_authentication(client):
+    client.headers.pop("Authorization", None)
+    response = client.post("/batch", json={"requests": [
+        {"method": "POST", "path": "/composers/", "body": {"name": "Anonymous"}},
+        {"path": "/instruments/"},
+    ]})
+    first, second = response.json()["responses"]
+    assert first["status"] == status.HTTP_401_UNAUTHORIZED
+    assert second["status"] == status.HTTP_200_OK
+
+    client.headers["Authorization"] = "Bearer invalid"
+    response = client.post("/batch", json={"requests": [
+        {"method": "POST", "path": "/composers/", "body": {"name": "Anonymous"}},
+    ]})
+    assert response.json()["responses"][0]["status"] == status.HTTP_401_UNAUTHORIZED
+    client.headers.pop("Authorization")
+
+
+def test_batch_reads_run_concurrently(auth_client, db_session):
+    # Без подмены get_session одновременные чтения идут в своих сессиях
+    # SessionLocal (та же test.db, что и у тестовой сессии).
+    concert_id = db_session.scalar(select(Concert.id).order_by(Concert.id))
+    composer_id = db_session.scalar(select(Composer.id).order_by(Composer.id))
+    organization_id = db_session.scalar(select(User.id).where(User.email == "test@example.com"))
+    paths = [f"/concerts/{concert_id}", f"/composers/{composer_id}", "/instruments/",
+             "/concerts/?limit=2", f"/organizations/{organization_id}/stats",
+             "/concerts/999999", "/"]
+    override = app.dependency_overrides.pop(get_session)
+    before = metrics.value("batch_concurrent_reads_total")
+    try:
+        response = auth_client.post("/batch", json={"requests": [{"path": path} for path in paths]})
+    finally:
+        app.dependency_overrides[get_session] = override
+
+    statuses = [item["status"] for item in response.json()["responses"]]
+    assert statuses == [status.HTTP_200_OK] * 5 + [status.HTTP_404_NOT_FOUND, status.HTTP_200_OK]
+    assert metrics.value("batch_concurrent_reads_total") == before + len(paths)
+    responses = response.json()["responses"]
+    assert responses[0]["body"]["id"] == concert_id
+    assert "by_status" in responses[4]["body"]
+    assert responses[6]["body"] == {"message": "Hello World"}
+
+
+def test_batch_subrequests_are_rate_limited(client, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_auth_per_minute", 1)
+    credentials = {"username": "nobody@example.com", "password": "wrong"}
+    response = client.post("/batch", json={"requests": [
+        {"method": "POST", "path": "/auth/login", "body": credentials} for _ in range(3)
+    ]})
+    statuses = [item["status"] for item in response.json()["responses"]]
+    assert statuses[0] != status.HTTP_429_TOO_MANY_REQUESTS
+    assert statuses[1:] == [status.HTTP_429_TOO_MANY_REQUESTS] * 2
+    assert "retry-after" in response.json()["responses"][1]["headers"]
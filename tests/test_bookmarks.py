@@ -0,0 +1,67 @@
+from fastapi import status
+from sqlalchemy import select
+from app.core import counters
+from app.core.read_model import rebuild_all
+from app.models.models import Concert
+
+
+def _concert_ids(db_session, *titles):
+    return [db_session.scalar(select(Concert.id).where(Concert.title == title)) for title in titles]
+
+
+def _feed(client, headers, **params):
+    response = client.get("/me/concerts", headers=headers, params={"include_total": True, **params})
+    assert response.status_code == status.HTTP_200_OK
+    return response
+
+
+def test_bookmarks_feed(auth_client, listener_headers, db_session):
+    first, second, past = _concert_ids(db_session, "Test Concert 1", "Test Concert 2", "Past Concert")
+    for concert_id in (second, first, past, first):
+        response = auth_client.put(f"/me/bookmarks/{concert_id}", headers=listener_headers)
+        assert response.status_code == status.HTTP_200_OK
+    assert auth_client.put("/me/bookmarks/999999", headers=listener_headers).status_code \
+        == status.HTTP_404_NOT_FOUND
+
+    page = _feed(auth_client, listener_headers, limit=1)
+    assert page.headers["x-total-count"] == "2"
+    assert [item["id"] for item in page.json()] == [first]
+    assert page.json()[0]["bookmarks"] == 1
+    assert page.json()[0]["composers"][0]["name"] == "Tchaikovsky"
+    cursor = page.json()[-1]
+    page = _feed(auth_client, listener_headers, after_date=cursor["date"], after_id=cursor["id"])
+    assert [item["id"] for item in page.json()] == [second]
+
+    before_rebuild = counters.read_counters(db_session, counters.GLOBAL_SCOPE, counters.BOOKMARKED)
+    rebuild_all(db_session)
+    assert counters.read_counters(db_session, counters.GLOBAL_SCOPE, counters.BOOKMARKED) \
+        == before_rebuild
+
+    auth_client.patch(f"/concerts/{second}/cancel")
+    page = _feed(auth_client, listener_headers)
+    assert page.headers["x-total-count"] == "1"
+    assert [item["id"] for item in page.json()] == [first]
+
+    assert auth_client.delete(f"/me/bookmarks/{first}", headers=listener_headers).status_code \
+        == status.HTTP_200_OK
+    assert auth_client.delete(f"/me/bookmarks/{first}", headers=listener_headers).status_code \
+        == status.HTTP_404_NOT_FOUND
+    page = _feed(auth_client, listener_headers)
+    assert page.headers["x-total-count"] == "0"
+    assert page.json() == []
+
+
+def test_bookmarks_require_listener(auth_client, db_session):
+    first, = _concert_ids(db_session, "Test Concert 1")
+    response = auth_client.put(f"/me/bookmarks/{first}")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_repeated_bookmark_is_inserted_once(auth_client, listener_headers, db_session):
+    first, = _concert_ids(db_session, "Test Concert 1")
+    responses = [auth_client.put(f"/me/bookmarks/{first}", headers=listener_headers) for _ in range(2)]
+    assert [response.status_code for response in responses] == [status.HTTP_200_OK] * 2
+    assert responses[0].json() == responses[1].json()
+    db_session.expire_all()
+    assert counters.read_counters(db_session, counters.GLOBAL_SCOPE, counters.BOOKMARKED)[str(first)] == 1
+    auth_client.delete(f"/me/bookmarks/{first}", headers=listener_headers)
@@ -0,0 +1,97 @@
+from datetime import datetime, timezone
+
+from fastapi import status
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+from app.core import ical
+from app.core.ical import calendar_feeds
+from app.core.invalidation import cache_sync
+from app.models.models import Composer, Concert
+
+
+def test_calendar_month(client, db_session):
+    concert = db_session.scalar(select(Concert).where(Concert.title == "Test Concert 1"))
+    response = client.get("/concerts/calendar", params={"month": concert.date.strftime("%Y-%m")})
+    assert response.status_code == status.HTTP_200_OK
+    days = {day["day"]: day for day in response.json()["days"]}
+    bucket = days[concert.date.strftime("%Y-%m-%d")]
+    assert concert.id in [item["id"] for item in bucket["concerts"]]
+    assert bucket["count"] == len(bucket["concerts"])
+    assert response.json()["total"] == sum(day["count"] for day in days.values())
+
+    assert client.get("/concerts/calendar", params={"month": "2025-13"}).status_code \
+        == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_organization_feed_cached_until_change(client, db_session):
+    calendar_feeds.clear()
+    cache_sync.poll(db_session)
+    concert = db_session.scalar(select(Concert).where(Concert.title == "Test Concert 1"))
+    params = {"organization_id": concert.organization_id}
+
+    response = client.get("/concerts/calendar.ics", params=params)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/calendar")
+    body = response.text
+    assert body.startswith("BEGIN:VCALENDAR\r\n") and body.endswith("END:VCALENDAR\r\n")
+    assert f"UID:concert-{concert.id}@" in body
+    assert "SUMMARY:Test Concert 1" in body
+    assert "Past Concert" not in body
+
+    last_modified = response.headers["last-modified"]
+    cached = client.get("/concerts/calendar.ics", params=params,
+                        headers={"If-Modified-Since": last_modified})
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+
+    concert.title = "Test Concert 1; renamed"
+    db_session.commit()
+    cache_sync.poll(db_session)
+    response = client.get("/concerts/calendar.ics", params=params)
+    assert r"SUMMARY:Test Concert 1\; renamed" in response.text
+
+    concert.title = "Test Concert 1"
+    db_session.commit()
+    cache_sync.poll(db_session)
+
+
+def test_saved_search_feed(client, db_session, listener_headers):
+    composer_id = db_session.scalar(select(Composer.id).where(Composer.name == "Tchaikovsky"))
+    search = client.post("/saved-searches/", json={"composer_ids": [composer_id]},
+                         headers=listener_headers).json()
+
+    response = client.get(f"/saved-searches/{search['id']}/calendar.ics", headers=listener_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert "SUMMARY:Test Concert 1" in response.text
+    assert "Test Concert 2" not in response.text
+    assert "Композиторы: Tchaikovsky" in response.text
+
+    assert client.get(f"/saved-searches/{search['id']}/calendar.ics").status_code \
+        == status.HTTP_401_UNAUTHORIZED
+
+
+def test_feed_render_closes_its_session(db_session):
+    closed = []
+
+    class RecordingSession(Session):
+        def close(self):
+            closed.append(self)
+            super().close()
+
+    factory = sessionmaker(bind=db_session.get_bind(), class_=RecordingSession)
+    organization_id = db_session.scalar(select(Concert.organization_id))
+    stamp = datetime.now(timezone.utc)
+
+    def render():
+        return ical.render_feed((ical.ORGANIZATION, organization_id), ical.feed_query(organization_id),
+                                None, stamp, calendar_feeds.version, session_factory=factory)
+
+    assert b"".join(render()).endswith(b"END:VCALENDAR\r\n")
+    assert len(closed) == 1
+
+    # Клиент отключился посреди ленты.
+    feed = render()
+    next(feed)
+    next(feed)
+    feed.close()
+    assert len(closed) == 2
+    calendar_feeds.clear()
@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+from app.core.fuzzy import composer_matcher
+from app.core.invalidation import CacheSync
+from app.core.suggest import composer_index, instrument_index
+from app.models.models import Composer, ConcertInstrument
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes():
+    composer_index.reset()
+    instrument_index.reset()
+    yield
+    composer_index.reset()
+    instrument_index.reset()
+    composer_matcher.reset()
+
+
+def test_suggest_composers_by_prefix(client):
+    response = client.get("/composers/suggest", params={"q": "tchai"})
+    assert response.status_code == status.HTTP_200_OK
+    assert [c["name"] for c in response.json()] == ["Tchaikovsky"]
+
+
+def test_suggest_composers_matches_any_word(auth_client):
+    auth_client.post("/composers/", json={"name": "Пётр Ильич Чайковский"})
+
+    response = auth_client.get("/composers/suggest", params={"q": "чайк"})
+    assert [c["name"] for c in response.json()] == ["Tchaikovsky", "Пётр Ильич Чайковский"]
+
+    response = auth_client.get("/composers/suggest", params={"q": "петр"})
+    assert [c["name"] for c in response.json()] == ["Пётр Ильич Чайковский"]
+
+
+def test_suggest_instruments_ranked_by_usage(auth_client):
+    auth_client.post("/instruments/", json={"name": "Viola"})
+
+    response = auth_client.get("/instruments/suggest", params={"q": "vi"})
+    assert response.status_code == status.HTTP_200_OK
+    assert [i["name"] for i in response.json()] == ["Violin", "Viola"]
+
+
+def test_suggest_composers_across_scripts(auth_client):
+    auth_client.post("/composers/", json={"name": "Сергей Рахманинов"})
+
+    for query in ("Rachmaninoff", "Rakhmaninov", "rachm", "рахман"):
+        response = auth_client.get("/composers/suggest", params={"q": query})
+        assert "Сергей Рахманинов" in [c["name"] for c in response.json()], query
+
+    response = auth_client.get("/composers/suggest", params={"q": "Чайков"})
+    assert "Tchaikovsky" in [c["name"] for c in response.json()]
+
+
+def test_suggest_usage_follows_deleted_concerts(auth_client):
+    auth_client.get("/instruments/suggest", params={"q": "tub"})
+    auth_client.post("/instruments/", json={"name": "Tuba"})
+    tubax_id = auth_client.post("/instruments/", json={"name": "Tubax"}).json()["id"]
+    concert_ids = [
+        auth_client.post("/concerts/", json={
+            "title": f"Tubax Night {index}",
+            "date": (datetime.now(timezone.utc) + timedelta(days=40 + index)).isoformat(),
+            "price_type": "free",
+            "location": "Tubax Hall",
+            "instruments": [tubax_id],
+        }).json()["id"]
+        for index in range(2)
+    ]
+
+    def suggested():
+        return [i["name"] for i in auth_client.get("/instruments/suggest", params={"q": "tub"}).json()]
+
+    assert suggested() == ["Tubax", "Tuba"]
+    for concert_id in concert_ids:
+        assert auth_client.delete(f"/concerts/{concert_id}").status_code == status.HTTP_200_OK
+    assert suggested() == ["Tuba", "Tubax"]
+
+
+def test_cache_sync_applies_changes_from_other_workers(client, db_session):
+    worker = CacheSync()
+    assert worker.poll(db_session) == 0
+    composer_index.ensure_loaded(db_session)
+    composer_matcher.ensure_loaded(db_session)
+
+    # Запись из "другого воркера": локальные индексы о ней не знают.
+    composer = Composer(name="Rimsky-Korsakov")
+    db_session.add(composer)
+    db_session.commit()
+    assert client.get("/composers/suggest", params={"q": "rimsk"}).json() == []
+
+    assert worker.poll(db_session) >= 1
+    assert [c["name"] for c in client.get("/composers/suggest", params={"q": "rimsk"}).json()] == [
+        "Rimsky-Korsakov"
+    ]
+    assert composer.id in composer_matcher.resolve(["Rimskij Korsakov"])
+
+    composer.name = "Rachmaninoff"
+    db_session.commit()
+    worker.poll(db_session)
+    assert client.get("/composers/suggest", params={"q": "rimsk"}).json() == []
+    assert worker.poll(db_session) == 0
+
+
+def test_cache_sync_updates_usage_from_other_workers(auth_client, db_session):
+    worker = CacheSync()
+    worker.poll(db_session)
+    auth_client.post("/instruments/", json={"name": "Ocarina"})
+    ocarino_id = auth_client.post("/instruments/", json={"name": "Ocarino"}).json()["id"]
+    concert_id = auth_client.post("/concerts/", json={
+        "title": "Ocarino Night",
+        "date": (datetime.now(timezone.utc) + timedelta(days=45)).isoformat(),
+        "price_type": "free",
+        "location": "Ocarino Hall",
+        "instruments": [ocarino_id],
+    }).json()["id"]
+    instrument_index.ensure_loaded(db_session)
+
+    def suggested():
+        return [i["name"] for i in auth_client.get("/instruments/suggest", params={"q": "ocar"}).json()]
+
+    assert suggested() == ["Ocarino", "Ocarina"]
+    # Изменение в "другом воркере": локальный индекс узнаёт о нём из журнала.
+    db_session.delete(db_session.get(ConcertInstrument, (concert_id, ocarino_id)))
+    db_session.commit()
+    assert suggested() == ["Ocarino", "Ocarina"]
+    worker.poll(db_session)
+    assert suggested() == ["Ocarina", "Ocarino"]
@@ -0,0 +1,43 @@
+import gzip
+import zlib
+
+from fastapi import status
+from app.config import settings
+from app.core.compression import StreamCompressor, compress_cached, compressed_cache, negotiate
+
+
+def test_negotiate_respects_quality_values():
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0, identity") is None
+    assert negotiate("*") is not None
+    assert negotiate(None) is None
+
+
+def test_large_json_is_compressed(client, monkeypatch):
+    monkeypatch.setattr(settings, "compression_min_size", 10)
+    response = client.get("/concerts/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()) >= 3
+
+
+def test_small_or_unaccepted_responses_are_not_compressed(client):
+    assert "content-encoding" not in client.get("/", headers={"Accept-Encoding": "gzip"}).headers
+    response = client.get("/concerts/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+
+def test_compressed_variant_is_reused():
+    compressed_cache.clear()
+    body = b'{"title": "Concert"}' * 100
+    first = compress_cached(body, "gzip")
+    assert compress_cached(body, "gzip") is first
+    assert gzip.decompress(first) == body
+
+
+def test_stream_compressor_flushes_each_chunk():
+    compressor = StreamCompressor("gzip")
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert decompressor.decompress(compressor.chunk(b"first ")) == b"first "
+    assert decompressor.decompress(compressor.finish(b"last")) == b"last"
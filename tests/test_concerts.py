@@ -1,141 +1,20 @@
 import pytest
 from faker import Faker
-from fastapi.testclient import TestClient
 from fastapi import status
 from datetime import datetime, timedelta, timezone
 from typing import List
 
-from app.main import app
 from app.models.models import (
     Concert, ConcertStatus, User, UserRole,
-    Composer, Instrument, ConcertComposer, ConcertInstrument
+    Composer, Instrument, ConcertComposer, ConcertInstrument, ConcertReadModel,
+    ConcertReadModelItem
 )
-from app.database import Base, get_session
-from app.auth.auth import get_password_hash, create_access_token
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from app.core.read_model import ensure_populated, rebuild_all
+from app.core.scheduler import complete_past_concerts
+from sqlalchemy import delete, text
 
 fake = Faker()
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-@pytest.fixture(scope="module")
-def db_session():
-    Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
-
-    try:
-        org_user = User(
-            full_name="org_user",
-            email="org@example.com",
-            role=UserRole.ORG,
-            user_password=get_password_hash("orgpass"),
-            phone_number=1234567890,
-            verified=False
-        )
-        db.add(org_user)
-        db.flush()
-
-        composer1 = Composer(name="Tchaikovsky")
-        composer2 = Composer(name="Mozart")
-        instrument1 = Instrument(name="Piano")
-        instrument2 = Instrument(name="Violin")
-        db.add_all([composer1, composer2, instrument1, instrument2])
-        db.flush()
-
-        concert1 = Concert(
-            title="Test Concert 1",
-            date=datetime.now(timezone.utc) + timedelta(weeks=2),
-            description="Test description 1",
-            price_type="fixed",
-            price_amount=1000,
-            location="Test Location 1",
-            current_status=ConcertStatus.UPCOMING,
-            organization_id=org_user.id
-        )
-
-        concert2 = Concert(
-            title="Test Concert 2",
-            date=datetime.now(timezone.utc) + timedelta(weeks=3),
-            description="Test description 2",
-            price_type="free",
-            price_amount=0,
-            location="Test Location 2",
-            current_status=ConcertStatus.UPCOMING,
-            organization_id=org_user.id
-        )
-
-        concert3 = Concert(
-            title="Past Concert",
-            date=datetime.now(timezone.utc) - timedelta(weeks=1),
-            description="Completed concert",
-            price_type="fixed",
-            price_amount=500,
-            location="Old Location",
-            current_status=ConcertStatus.COMPLETED,
-            organization_id=org_user.id
-        )
-
-        db.add_all([concert1, concert2, concert3])
-        db.flush()
-
-        db.add_all([
-            ConcertComposer(concert_id=concert1.id, composer_id=composer1.id),
-            ConcertInstrument(concert_id=concert1.id, instrument_id=instrument1.id),
-            ConcertInstrument(concert_id=concert2.id, instrument_id=instrument2.id)
-        ])
-
-        db.commit()
-        yield db
-
-    except Exception as e:
-        db.rollback()
-        raise e
-    finally:
-        db.close()
-        Base.metadata.drop_all(bind=engine)
-
-
-@pytest.fixture()
-def client(db_session):
-    app.dependency_overrides[get_session] = lambda: db_session
-    yield TestClient(app)
-    app.dependency_overrides.clear()
-
-
-@pytest.fixture()
-def auth_client(client, db_session):
-    db_session.rollback()
-
-    test_user = User(
-        full_name="testuser",
-        email="test@example.com",
-        user_password=get_password_hash("testpass"),
-        role=UserRole.ORG,
-        phone_number=9876543210,
-        verified=False
-    )
-
-    try:
-        db_session.add(test_user)
-        db_session.commit()
-
-        access_token = create_access_token(
-            data={"sub": test_user.email},
-            expires_delta=timedelta(minutes=30)
-        )
-
-        client.headers.update({"Authorization": f"Bearer {access_token}"})
-        yield client
-
-    finally:
-        db_session.rollback()
-        db_session.query(User).filter(User.full_name == "testuser").delete()
-        db_session.commit()
-
 
 def test_get_concerts_without_filter(client):
     response = client.get("/concerts")
@@ -321,6 +200,21 @@ def test_filter_concerts_by_composer(client):
     assert len(response.json()) >= 1
 
 
+@pytest.mark.parametrize("composer_name", [
+    "Чайковский", "Пётр Ильич Чайковский", "tchaikovski", "Tschaikowsky"
+])
+def test_filter_concerts_by_composer_spelling(client, composer_name):
+    response = client.get("/concerts/filter/", params={"composer_names": composer_name})
+    assert response.status_code == status.HTTP_200_OK
+    assert "Test Concert 1" in [c["title"] for c in response.json()]
+
+
+def test_filter_concerts_by_unknown_composer(client):
+    response = client.get("/concerts/filter/", params={"composer_names": "Прокофьев"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
+
+
 def test_filter_concerts_by_instrument(client):
     response = client.get("/concerts/filter/?instrument_names=Violin")
     assert response.status_code == status.HTTP_200_OK
@@ -336,4 +230,228 @@ def test_filter_concerts_multiple_filters(client):
         }
     )
     assert response.status_code == status.HTTP_200_OK
-    assert len(response.json()) >= 1
\ No newline at end of file
+    assert len(response.json()) >= 1
+
+
+def test_complete_past_concerts(db_session):
+    org = db_session.query(User).filter(User.role == UserRole.ORG).first()
+    stale = Concert(
+        title="Stale Concert",
+        date=datetime.now(timezone.utc) - timedelta(hours=2),
+        description="Should be completed",
+        price_type="free",
+        location="Stale Location",
+        current_status=ConcertStatus.UPCOMING,
+        organization_id=org.id
+    )
+    db_session.add(stale)
+    db_session.commit()
+
+    assert complete_past_concerts(db_session, batch_size=1) >= 1
+    db_session.refresh(stale)
+    assert stale.current_status == ConcertStatus.COMPLETED
+    assert complete_past_concerts(db_session) == 0
+
+
+def test_read_model_follows_writes(auth_client, db_session):
+    concert_data = {
+        "title": "Read Model Concert",
+        "date": (datetime.now(timezone.utc) + timedelta(days=12)).isoformat(),
+        "description": "Read model test",
+        "price_type": "fixed",
+        "price_amount": 700,
+        "location": "Read Model Hall",
+        "composers": [2],
+        "instruments": [2]
+    }
+    concert_id = auth_client.post("/concerts/", json=concert_data).json()["id"]
+
+    response = auth_client.get(f"/concerts/{concert_id}")
+    assert [c["name"] for c in response.json()["composers"]] == ["Mozart"]
+    assert [i["name"] for i in response.json()["instruments"]] == ["Violin"]
+
+    auth_client.patch(f"/concerts/{concert_id}", json={"title": "Renamed Concert"})
+    assert auth_client.get(f"/concerts/{concert_id}").json()["title"] == "Renamed Concert"
+
+    auth_client.delete(f"/concerts/{concert_id}")
+    assert db_session.get(ConcertReadModel, concert_id) is None
+
+
+def test_read_model_rebuild(db_session):
+    assert rebuild_all(db_session) == db_session.query(Concert).count()
+    assert db_session.query(ConcertReadModel).count() == db_session.query(Concert).count()
+
+
+def test_read_model_items_filter_by_index(client, db_session):
+    links = db_session.query(ConcertComposer).count() + db_session.query(ConcertInstrument).count()
+    assert db_session.query(ConcertReadModelItem).count() == links
+
+    db_session.execute(delete(ConcertReadModelItem))
+    db_session.commit()
+    ensure_populated(db_session)
+    assert db_session.query(ConcertReadModelItem).count() == links
+
+    response = client.get("/concerts/filter/", params={"composer_names": "Tchaikovsky",
+                                                       "instrument_names": "Piano"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()
+    for concert in response.json():
+        assert "Tchaikovsky" in [c["name"] for c in concert["composers"]]
+        assert "Piano" in [i["name"] for i in concert["instruments"]]
+
+    plan = " ".join(row[-1] for row in db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT concert_id FROM concert_read_model_items "
+        "WHERE kind = 'composer' AND item_id IN (1, 2)"
+    )))
+    assert "ix_concert_read_model_items_kind_item" in plan
+
+
+def test_concert_facets(client):
+    response = client.get("/concerts/filter/facets")
+    assert response.status_code == status.HTTP_200_OK
+    facets = response.json()
+    assert facets["total"] == sum(month["count"] for month in facets["months"])
+    assert {"id": 2, "name": "Violin", "count": 1} in facets["instruments"]
+
+    response = client.get("/concerts/filter/facets", params={"instrument_names": "Piano"})
+    facets = response.json()
+    piano = next(i for i in facets["instruments"] if i["name"] == "Piano")
+    assert piano["count"] == facets["total"]
+
+
+def test_concert_facets_cache_invalidated_on_write(auth_client):
+    before = auth_client.get("/concerts/filter/facets").json()["total"]
+    auth_client.post("/concerts/", json={
+        "title": "Facet Concert",
+        "date": (datetime.now(timezone.utc) + timedelta(days=40)).isoformat(),
+        "price_type": "hat",
+        "location": "Facet Hall"
+    })
+    after = auth_client.get("/concerts/filter/facets").json()
+    assert after["total"] == before + 1
+    assert {"value": "hat", "count": 1} in after["price_types"]
+
+
+def _create_bulk_concerts(auth_client, count, **fields):
+    ids = []
+    for number in range(count):
+        response = auth_client.post("/concerts/", json={
+            "title": f"Bulk Concert {number}",
+            "date": (datetime.now(timezone.utc) + timedelta(days=10 + number)).isoformat(),
+            "price_type": "free",
+            "location": "Bulk Hall",
+            **fields
+        })
+        ids.append(response.json()["id"])
+    return ids
+
+
+def test_bulk_cancel_reports_per_id_outcomes(auth_client, db_session):
+    own_ids = _create_bulk_concerts(auth_client, 2)
+    foreign_id = db_session.query(Concert).filter(Concert.title == "Test Concert 1").one().id
+
+    response = auth_client.post("/concerts/bulk/cancel", json={"ids": own_ids + [foreign_id, 999999]})
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert result["changed"] == 2
+    assert [item["outcome"] for item in result["results"]] == ["ok", "ok", "forbidden", "not_found"]
+    for concert_id in own_ids:
+        assert auth_client.get(f"/concerts/{concert_id}").json()["current_status"] == "cancelled"
+
+    repeat = auth_client.post("/concerts/bulk/cancel", json={"ids": own_ids[:1]}).json()
+    assert repeat["results"][0]["outcome"] == "invalid"
+
+
+def test_bulk_reschedule_concerts(auth_client):
+    concert_ids = _create_bulk_concerts(auth_client, 2)
+    new_date = datetime.now(timezone.utc) + timedelta(days=60)
+    response = auth_client.post("/concerts/bulk/reschedule", json={"items": [
+        {"id": concert_ids[0], "date": new_date.isoformat()},
+        {"id": concert_ids[1], "date": (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()},
+    ]})
+    result = response.json()
+    assert [item["outcome"] for item in result["results"]] == ["ok", "invalid"]
+    moved = auth_client.get(f"/concerts/{concert_ids[0]}").json()
+    assert moved["date"].startswith(new_date.strftime("%Y-%m-%d"))
+
+
+def test_bulk_delete_removes_associations(auth_client, db_session):
+    concert_ids = _create_bulk_concerts(auth_client, 2, composers=[1], instruments=[1])
+    response = auth_client.post("/concerts/bulk/delete", json={"ids": concert_ids})
+    assert response.json()["changed"] == 2
+
+    db_session.expire_all()
+    assert db_session.query(Concert).filter(Concert.id.in_(concert_ids)).count() == 0
+    assert db_session.query(ConcertComposer).filter(ConcertComposer.concert_id.in_(concert_ids)).count() == 0
+    assert db_session.query(ConcertReadModel).filter(ConcertReadModel.id.in_(concert_ids)).count() == 0
+    assert auth_client.get(f"/concerts/{concert_ids[0]}").status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_update_concert_composers_and_instruments(auth_client, db_session):
+    concert_id = _create_bulk_concerts(auth_client, 1, composers=[1], instruments=[1, 2])[0]
+
+    response = auth_client.patch(f"/concerts/{concert_id}", json={"composers": [2], "instruments": [2]})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["composers"] == [2]
+    assert response.json()["instruments"] == [2]
+
+    concert = auth_client.get(f"/concerts/{concert_id}").json()
+    assert [composer["id"] for composer in concert["composers"]] == [2]
+    assert [instrument["id"] for instrument in concert["instruments"]] == [2]
+
+
+def test_update_concert_with_unknown_composer(auth_client):
+    concert_id = _create_bulk_concerts(auth_client, 1, composers=[1])[0]
+    response = auth_client.patch(f"/concerts/{concert_id}", json={"composers": [1, 999]})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "999" in response.json()["detail"]
+    concert = auth_client.get(f"/concerts/{concert_id}").json()
+    assert [composer["id"] for composer in concert["composers"]] == [1]
+
+
+def test_concert_total_counts(client, db_session):
+    response = client.get("/concerts/", params={"include_total": True, "limit": 1})
+    assert int(response.headers["X-Total-Count"]) == db_session.query(Concert).count()
+
+    response = client.get("/concerts/", params={"include_total": True, "status_of_concert": "completed"})
+    expected = db_session.query(Concert).filter(Concert.current_status == ConcertStatus.COMPLETED).count()
+    assert int(response.headers["X-Total-Count"]) == expected
+
+    response = client.get("/concerts/filter/", params={"include_total": True, "instrument_names": "Piano"})
+    assert int(response.headers["X-Total-Count"]) == len(response.json())
+    assert "X-Total-Count" not in client.get("/concerts/").headers
+
+
+def test_catalog_total_counts(client, db_session):
+    response = client.get("/composers/", params={"include_total": True})
+    assert int(response.headers["X-Total-Count"]) == db_session.query(Composer).count()
+    response = client.get("/instruments/", params={"include_total": True})
+    assert int(response.headers["X-Total-Count"]) == db_session.query(Instrument).count()
+
+
+def test_concerts_sparse_fields(client):
+    response = client.get("/concerts/", params={"fields": "title,date"})
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.json()[0]) == {"id", "title", "date"}
+
+    response = client.get("/concerts/", params={"fields": "title", "include": "composers"})
+    assert set(response.json()[0]) == {"id", "title", "composers"}
+
+    concert_id = response.json()[0]["id"]
+    concert = client.get(f"/concerts/{concert_id}", params={"include": "instruments"}).json()
+    assert "instruments" in concert and "composers" not in concert and "location" in concert
+
+
+def test_filter_concerts_sparse_fields(client):
+    response = client.get("/concerts/filter/", params={
+        "instrument_names": "Piano", "fields": "title", "include_total": True
+    })
+    assert response.json()
+    assert all(set(item) == {"id", "title"} for item in response.json())
+    assert int(response.headers["X-Total-Count"]) == len(response.json())
+
+
+def test_concerts_unknown_fields(client):
+    response = client.get("/concerts/", params={"fields": "title,secret"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert client.get("/concerts/1", params={"include": "venue"}).status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+from app.config import settings
+from app.core.events import EVICTED, EventBus, concert_events
+
+
+def test_event_bus_delivers_and_resumes():
+    bus = EventBus(history_size=10, queue_size=10)
+
+    async def scenario():
+        subscriber, backlog = bus.subscribe()
+        assert backlog == []
+        publisher = threading.Thread(target=bus.publish, args=("created", 1))
+        publisher.start()
+        publisher.join()
+        first = await subscriber.get(timeout=1)
+        assert (first.type, first.concert_id) == ("created", 1)
+
+        second = bus.publish("updated", 1)
+        _, resumed = bus.subscribe(first.id)
+        assert resumed == [second]
+
+        _, reset = bus.subscribe("other-1")
+        assert reset is None
+
+    asyncio.run(scenario())
+
+
+def test_event_bus_evicts_slow_subscriber():
+    bus = EventBus(history_size=10, queue_size=2)
+
+    async def scenario():
+        subscriber, _ = bus.subscribe()
+        for concert_id in range(3):
+            bus.publish("created", concert_id)
+        await asyncio.sleep(0)
+        assert subscriber.evicted
+        assert await subscriber.get(timeout=1) is EVICTED
+
+    asyncio.run(scenario())
+
+
+def test_concert_writes_are_published(auth_client, monkeypatch):
+    monkeypatch.setattr(settings, "event_heartbeat_seconds", 0.05)
+    concert_id = auth_client.post("/concerts/", json={
+        "title": "Streamed Concert",
+        "date": (datetime.now(timezone.utc) + timedelta(days=9)).isoformat(),
+        "price_type": "free",
+        "location": "Stream Hall"
+    }).json()["id"]
+    created = concert_events.history()[-1]
+    assert (created.type, created.concert_id) == ("created", concert_id)
+    assert created.data["title"] == "Streamed Concert"
+
+    auth_client.patch(f"/concerts/{concert_id}/cancel")
+
+    with auth_client.websocket_connect(
+        f"/concerts/stream/ws?last_event_id={created.id}"
+    ) as websocket:
+        message = websocket.receive_json()
+    assert message["type"] == "cancelled"
+    assert message["concert_id"] == concert_id
@@ -0,0 +1,56 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import status
+from app.core.idempotency import claim, complete
+from app.models.models import Composer
+
+
+def _concert():
+    return {
+        "title": "Idempotent Concert",
+        "date": (datetime.now(timezone.utc) + timedelta(days=5)).isoformat(),
+        "price_type": "free",
+        "location": "Idempotent Hall"
+    }
+
+
+def test_create_concert_replays_stored_response(auth_client):
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    payload = _concert()
+    first = auth_client.post("/concerts/", json=payload, headers=headers)
+    second = auth_client.post("/concerts/", json=payload, headers=headers)
+
+    assert first.status_code == status.HTTP_201_CREATED
+    assert second.status_code == status.HTTP_201_CREATED
+    assert second.json() == first.json()
+    assert second.headers["idempotent-replayed"] == "true"
+    titles = [concert["title"] for concert in auth_client.get("/concerts/").json()]
+    assert titles.count("Idempotent Concert") == 1
+
+
+def test_reused_key_with_other_body_is_rejected(auth_client, db_session):
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    assert auth_client.post("/composers/", json={"name": "Idempotent Bach"},
+                            headers=headers).status_code == status.HTTP_201_CREATED
+    response = auth_client.post("/composers/", json={"name": "Idempotent Handel"}, headers=headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert db_session.query(Composer).filter(Composer.name == "Idempotent Handel").count() == 0
+
+
+def test_in_flight_key_is_not_claimed_twice(db_session):
+    key = str(uuid.uuid4())
+    assert claim(db_session, "POST /concerts/ test", key, "hash") is None
+    in_flight = claim(db_session, "POST /concerts/ test", key, "hash")
+    assert in_flight is not None and in_flight.status_code is None
+
+    complete(db_session, "POST /concerts/ test", key, 201, "application/json", b"{}")
+    stored = claim(db_session, "POST /concerts/ test", key, "hash")
+    assert stored.status_code == 201 and stored.body == b"{}"
+
+
+def test_expired_key_is_claimed_again(db_session):
+    key = str(uuid.uuid4())
+    assert claim(db_session, "POST /concerts/ test", key, "hash") is None
+    later = datetime.now(timezone.utc) + timedelta(days=2)
+    assert claim(db_session, "POST /concerts/ test", key, "other", now=later) is None
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import status
+from app.models.models import User
+
+
+def _create_concert(auth_client, days, title):
+    return auth_client.post("/concerts/", json={
+        "title": title,
+        "date": (datetime.now(timezone.utc) + timedelta(days=days)).isoformat(),
+        "price_type": "free",
+        "location": "Org Hall",
+        "composers": [1]
+    }).json()["id"]
+
+
+def _current_user(db_session):
+    return db_session.query(User).filter(User.email == "test@example.com").one()
+
+
+def test_organization_concerts_keyset_pagination(auth_client, db_session):
+    ids = [_create_concert(auth_client, days, f"Org Concert {days}") for days in (3, 1, 2)]
+    organization_id = _current_user(db_session).id
+
+    first_page = auth_client.get(
+        f"/organizations/{organization_id}/concerts", params={"limit": 2}
+    ).json()
+    assert [c["id"] for c in first_page] == [ids[1], ids[2]]
+
+    last = first_page[-1]
+    second_page = auth_client.get(
+        f"/organizations/{organization_id}/concerts",
+        params={"limit": 2, "after_date": last["date"], "after_id": last["id"]}
+    ).json()
+    assert [c["id"] for c in second_page] == [ids[0]]
+
+
+def test_organization_stats_follow_writes(auth_client, db_session):
+    organization_id = _current_user(db_session).id
+    url = f"/organizations/{organization_id}/stats"
+    before = auth_client.get(url).json()
+    composers_before = {c["id"]: c["count"] for c in before["composers"]}
+
+    concert_id = _create_concert(auth_client, 5, "Stats Concert")
+    kept_id = _create_concert(auth_client, 6, "Kept Concert")
+
+    stats = auth_client.get(url).json()
+    assert stats["by_status"]["upcoming"] == before["by_status"].get("upcoming", 0) + 2
+    composers = {c["id"]: c["count"] for c in stats["composers"]}
+    assert composers[1] == composers_before.get(1, 0) + 2
+
+    auth_client.patch(f"/concerts/{concert_id}/cancel")
+    auth_client.delete(f"/concerts/{kept_id}")
+
+    stats = auth_client.get(url).json()
+    assert stats["by_status"].get("upcoming", 0) == before["by_status"].get("upcoming", 0)
+    assert stats["by_status"]["cancelled"] == before["by_status"].get("cancelled", 0) + 1
+    assert stats["upcoming_by_month"] == before["upcoming_by_month"]
+    assert {c["id"]: c["count"] for c in stats["composers"]} == composers_before
+
+
+def test_organization_stats_forbidden_for_others(auth_client, db_session):
+    other = db_session.query(User).filter(User.email == "org@example.com").one()
+    response = auth_client.get(f"/organizations/{other.id}/stats")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,72 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+from sqlalchemy import select
+from app.core.popularity import ViewCounter, decayed_score, view_counter
+from app.models.models import Concert, ConcertPopularity
+
+
+def _concert_ids(db_session, *titles):
+    return [db_session.scalar(select(Concert.id).where(Concert.title == title)) for title in titles]
+
+
+def test_views_are_counted_in_memory_and_flushed_in_batches(client, db_session):
+    view_counter.drain()
+    first, second = _concert_ids(db_session, "Test Concert 1", "Test Concert 2")
+    for _ in range(3):
+        client.get(f"/concerts/{first}")
+    client.get(f"/concerts/{second}")
+    client.get("/concerts/999999")
+
+    assert db_session.get(ConcertPopularity, first) is None
+    assert view_counter.pending() == 4
+    assert view_counter.flush(db_session) == 4
+    assert view_counter.pending() == 0
+
+    client.get(f"/concerts/{first}")
+    view_counter.flush(db_session)
+    db_session.expire_all()
+    assert db_session.get(ConcertPopularity, first).views == 4
+
+    response = client.get("/concerts/popular")
+    assert response.status_code == status.HTTP_200_OK
+    popular = response.json()
+    assert [item["id"] for item in popular[:2]] == [first, second]
+    assert popular[0]["views"] == 4
+    assert popular[0]["popularity"] == pytest.approx(4, rel=0.01)
+
+
+def test_popularity_decays_over_time(db_session):
+    counter = ViewCounter(shards=2)
+    old, fresh = _concert_ids(db_session, "Test Concert 1", "Test Concert 2")
+    now = datetime.now(timezone.utc)
+    db_session.query(ConcertPopularity).delete()
+    db_session.commit()
+
+    for _ in range(10):
+        counter.hit(old)
+    counter.flush(db_session, now=now - timedelta(days=30))
+    for _ in range(2):
+        counter.hit(fresh)
+    counter.flush(db_session, now=now)
+
+    ranked = db_session.scalars(
+        select(ConcertPopularity).order_by(ConcertPopularity.log_score.desc())
+    ).all()
+    assert [row.concert_id for row in ranked] == [fresh, old]
+    assert decayed_score(ranked[0].log_score, now) == pytest.approx(2)
+    assert decayed_score(ranked[1].log_score, now) < 0.01
+
+
+def test_threads_write_to_different_shards():
+    counter = ViewCounter(shards=4)
+    threads = [threading.Thread(target=counter.hit, args=(concert_id,)) for concert_id in (1, 2)]
+    for thread in threads:
+        thread.start()
+        thread.join()
+
+    assert sum(1 for _, counts in counter._shards if counts) == 2
+    assert counter.pending_keys() == 2
+    assert counter.drain() == {1: 1, 2: 1}
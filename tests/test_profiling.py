@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+from fastapi import status
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.core.metrics import metrics
+from app.core.profiling import LoopLagMonitor, Profiler, _current
+
+
+def test_request_with_token_is_profiled(client, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_token", "secret")
+    response = client.get("/concerts/", headers={"X-Profile": "secret"})
+    assert response.status_code == status.HTTP_200_OK
+    profile_id = response.headers["x-profile-id"]
+
+    listing = client.get("/debug/profiles", headers={"X-Profile": "secret"})
+    assert listing.status_code == status.HTTP_200_OK
+    summary = next(item for item in listing.json() if str(item["id"]) == profile_id)
+    assert summary["path"] == "/concerts/"
+    assert summary["sql_count"] > 0
+
+    report = client.get(f"/debug/profiles/{profile_id}", headers={"X-Profile": "secret"})
+    assert report.status_code == status.HTTP_200_OK
+    assert "## SQL" in report.text
+    assert "SELECT" in report.text
+
+
+def test_requests_without_token_are_not_profiled(client, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_token", "secret")
+    assert "x-profile-id" not in client.get("/concerts/").headers
+    assert "x-profile-id" not in client.get("/concerts/", headers={"X-Profile": "wrong"}).headers
+    assert client.get("/debug/profiles").status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_profiles_are_hidden_when_disabled(client, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_token", "")
+    response = client.get("/debug/profiles", headers={"X-Profile": ""})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_profile_samples_request_pool_calls_and_loop(monkeypatch):
+    monkeypatch.setattr(settings, "profiling_interval_ms", 1)
+    profiler = Profiler()
+
+    def handler():
+        time.sleep(0.05)
+
+    def unrelated_call():
+        time.sleep(0.1)
+
+    def busy_loop():
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+
+    async def run():
+        # Задача создана до начала профиля: её вызов пула не относится к запросу.
+        unrelated = asyncio.create_task(run_in_threadpool(unrelated_call))
+        profile = profiler.begin("GET", "/test")
+        token = _current.set(profile)
+        try:
+            await run_in_threadpool(handler)
+            busy_loop()
+            await asyncio.sleep(0.05)
+            await unrelated
+        finally:
+            _current.reset(token)
+            profiler.end(profile)
+        return profile
+
+    stacks = asyncio.run(run()).samples
+    assert sum(count for stack, count in stacks.items() if "handler" in stack) > 0
+    assert sum(count for stack, count in stacks.items() if "busy_loop" in stack) > 0
+    assert not any("unrelated_call" in stack for stack in stacks)
+    # Простой цикла в asyncio.sleep не сэмплируется.
+    assert not any("select (selectors.py" in stack for stack in stacks)
+
+
+def test_loop_monitor_reports_blocked_loop(monkeypatch):
+    monkeypatch.setattr(settings, "loop_lag_threshold_ms", 40)
+    monkeypatch.setattr(settings, "loop_monitor_enabled", True)
+    before = metrics.value("event_loop_blocked_total")
+
+    async def run():
+        monitor = LoopLagMonitor()
+        monitor.start()
+        await asyncio.sleep(0.05)
+        time.sleep(0.3)
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+    asyncio.run(run())
+    assert metrics.value("event_loop_blocked_total") > before
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from fastapi import status
+from app.core.ratelimit import ConcurrencyLimiter, TokenBucketStore, route_class
+
+
+def test_token_bucket_refills_and_limits():
+    store = TokenBucketStore(max_keys=10)
+    assert store.take("ip", rate=1.0, capacity=2, now=0.0) == 0
+    assert store.take("ip", rate=1.0, capacity=2, now=0.0) == 0
+    assert store.take("ip", rate=1.0, capacity=2, now=0.0) == 1.0
+    assert store.take("ip", rate=1.0, capacity=2, now=1.0) == 0
+
+
+def test_token_bucket_store_is_bounded():
+    store = TokenBucketStore(max_keys=2)
+    for key in ("a", "b", "c"):
+        store.take(key, rate=1.0, capacity=1, now=0.0)
+    assert len(store) == 2
+    assert store.take("a", rate=1.0, capacity=1, now=0.0) == 0
+
+
+def test_concurrency_limiter_sheds_after_budget():
+    async def scenario():
+        limiter = ConcurrencyLimiter(limit=1)
+        assert await limiter.acquire(timeout=0.01)
+        assert not await limiter.acquire(timeout=0.01)
+
+        waiter = asyncio.create_task(limiter.acquire(timeout=1))
+        await asyncio.sleep(0)
+        limiter.release()
+        assert await waiter
+        limiter.release()
+        assert limiter.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_returns_handed_over_slot():
+    async def scenario():
+        limiter = ConcurrencyLimiter(limit=1)
+        assert await limiter.acquire(timeout=0.01)
+
+        waiter = asyncio.create_task(limiter.acquire(timeout=1))
+        await asyncio.sleep(0)
+        # Слот передаётся ожидающему, но тот отменён раньше, чем проснулся.
+        waiter.cancel()
+        limiter.release()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.in_flight == 0
+        assert limiter.queued == 0
+        assert await limiter.acquire(timeout=0.01)
+
+    asyncio.run(scenario())
+
+
+def test_route_classes():
+    assert route_class("POST", "/auth/login") == "auth"
+    assert route_class("GET", "/concerts/filter/") == "search"
+    assert route_class("DELETE", "/concerts/1") == "write"
+    assert route_class("GET", "/concerts/1") == "read"
+
+
+def test_metrics_exported(client):
+    client.get("/concerts/filter/")
+    response = client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert 'rate_limit_allowed_total{route_class="search"}' in response.text
+    assert "http_requests_in_flight" in response.text
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import status
+from app.core.outbox import process_pending
+from app.models.models import Notification
+
+
+def _create_concert(auth_client, **fields):
+    concert = {
+        "title": "Subscription Concert",
+        "date": (datetime.now(timezone.utc) + timedelta(days=8)).isoformat(),
+        "price_type": "fixed",
+        "price_amount": 500,
+        "location": "Subscription Hall",
+        **fields
+    }
+    return auth_client.post("/concerts/", json=concert).json()["id"]
+
+
+def test_saved_search_requires_listener(auth_client):
+    response = auth_client.post("/saved-searches/", json={"composer_ids": [1]})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_saved_search_rejects_unknown_ids(auth_client, listener_headers):
+    response = auth_client.post(
+        "/saved-searches/", json={"composer_ids": [999]}, headers=listener_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_matching_concert_is_queued_and_processed(auth_client, listener_headers, db_session):
+    response = auth_client.post(
+        "/saved-searches/",
+        json={"composer_ids": [2], "instrument_ids": [2], "max_price": 600},
+        headers=listener_headers
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    matching_id = _create_concert(auth_client, composers=[2])
+    _create_concert(auth_client, composers=[1], instruments=[1])
+    _create_concert(auth_client, instruments=[2], price_amount=5000)
+
+    delivered = []
+    assert process_pending(db_session, deliver=delivered.extend) == 1
+    assert [n.concert_id for n in delivered] == [matching_id]
+    assert process_pending(db_session, deliver=delivered.extend) == 0
+
+    notifications = auth_client.get(
+        "/saved-searches/notifications", headers=listener_headers
+    ).json()
+    assert [n["concert_id"] for n in notifications] == [matching_id]
+    assert notifications[0]["processed_at"] is not None
+
+    assert auth_client.delete(f"/concerts/{matching_id}").status_code == status.HTTP_200_OK
+    assert db_session.query(Notification).filter_by(concert_id=matching_id).count() == 0
+
+    db_session.query(Notification).delete()
+    db_session.commit()
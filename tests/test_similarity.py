@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+from sqlalchemy import select
+from app.core.similarity import similar_concerts
+from app.models.models import Composer, Concert, ConcertReadModel, Instrument
+
+
+def _ids(db_session, model, *names):
+    return [db_session.scalar(select(model.id).where(model.name == name)) for name in names]
+
+
+def _create(auth_client, title, composers, instruments):
+    response = auth_client.post("/concerts/", json={
+        "title": title,
+        "date": (datetime.now(timezone.utc) + timedelta(days=20)).isoformat(),
+        "price_type": "free",
+        "location": "Similar Hall",
+        "composers": composers,
+        "instruments": instruments,
+    })
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()["id"]
+
+
+def _similar(client, concert_id):
+    response = client.get(f"/concerts/{concert_id}/similar")
+    assert response.status_code == status.HTTP_200_OK
+    return [(item["id"], item["similarity"]) for item in response.json()]
+
+
+def test_similar_concerts_follow_overlap_and_refresh(auth_client, db_session):
+    tchaikovsky, mozart = _ids(db_session, Composer, "Tchaikovsky", "Mozart")
+    piano, violin = _ids(db_session, Instrument, "Piano", "Violin")
+    source = db_session.scalar(select(Concert.id).where(Concert.title == "Test Concert 1"))
+    same = _create(auth_client, "Same", [tchaikovsky], [piano])
+    partial = _create(auth_client, "Partial", [tchaikovsky, mozart], [violin])
+    similar_concerts.reset()
+    response = auth_client.get(f"/concerts/{source}/similar")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["retry-after"] == "1"
+    # Индекс строит фоновая задача, а не запрос.
+    assert similar_concerts.refresh(db_session) == 0
+
+    similar = _similar(auth_client, source)
+    assert [item_id for item_id, _ in similar] == [same, partial]
+    assert similar[0][1] == 1.0
+    assert similar[1][1] == pytest.approx(4 / (3 * 5 ** 0.5), abs=1e-4)
+
+    auth_client.patch(f"/concerts/{same}", json={"composers": [mozart]})
+    similar_concerts.invalidate([same])
+    assert similar_concerts.refresh(db_session) == 1
+    similar = _similar(auth_client, source)
+    assert [item_id for item_id, _ in similar] == [partial, same]
+    assert similar[1][1] == pytest.approx(0.2)
+
+    incremental = {concert_id: similar_concerts.neighbours(concert_id)
+                   for concert_id in db_session.scalars(select(ConcertReadModel.id))}
+    similar_concerts.reset()
+    similar_concerts.ensure_loaded(db_session)
+    assert incremental == {concert_id: similar_concerts.neighbours(concert_id)
+                           for concert_id in incremental}
+
+
+def test_similar_concerts_for_past_or_missing_concert(client, db_session):
+    similar_concerts.refresh(db_session)
+    past = db_session.scalar(select(Concert.id).where(Concert.title == "Past Concert"))
+    assert _similar(client, past) == []
+    response = client.get("/concerts/999999/similar")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,58 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from app.core.singleflight import SingleFlight, normalize_key
+
+
+def test_concurrent_calls_share_one_execution():
+    group = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return ["result"]
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(group.do, "key", compute)
+        started.wait()
+        followers = [pool.submit(group.do, "key", compute) for _ in range(4)]
+        results = [leader.result()] + [future.result() for future in followers]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert group.ratio() == pytest.approx(0.8)
+
+
+def test_error_is_shared_and_key_released():
+    group = SingleFlight()
+    with pytest.raises(ValueError):
+        group.do("key", lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert group.do("key", lambda: 42) == 42
+
+
+def test_follower_falls_back_after_timeout():
+    group = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait()
+        return "slow"
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(group.do, "key", slow)
+        started.wait()
+        assert group.do("key", lambda: "own", timeout=0.01) == "own"
+        release.set()
+        assert leader.result() == "slow"
+
+
+def test_normalize_key_sorts_lists():
+    first = normalize_key("filter", composer_names=["Mozart", "Bach"], date=None)
+    second = normalize_key("filter", composer_names=["Bach", "Mozart", "Bach"])
+    assert first == second
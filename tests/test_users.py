@@ -4,7 +4,7 @@ from faker import Faker
 from app.models.models import UserRole
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from tests.test_concerts import db_session, client, SQLALCHEMY_DATABASE_URL
+from tests.conftest import SQLALCHEMY_DATABASE_URL
 fake = Faker()
 
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import status
+from sqlalchemy import select
+from app.core.venues import link_venues, venue_key
+from app.models.models import (Concert, ConcertComposer, ConcertReadModel, ConcertStatus,
+                               User, Venue, venue_rtree)
+
+TCHAIKOVSKY_HALL = (55.7700, 37.5950)
+ZARYADYE = (55.7510, 37.6290)
+
+
+def test_venue_key_merges_spellings():
+    assert venue_key("КЗ им. П.И. Чайковского") == venue_key("Концертный зал имени Чайковского")
+    assert venue_key("Большой зал консерватории") != venue_key("Малый зал консерватории")
+    assert venue_key("...") == ""
+
+
+def test_venue_key_keeps_hall_numbers():
+    assert venue_key("Дом музыки, зал 1") != venue_key("Дом музыки, зал 2")
+    assert venue_key("Дом музыки, зал 1") == venue_key("дом музыки зал 1")
+
+
+def _add_concerts(db_session, *locations):
+    organization_id = db_session.scalar(select(User.id).where(User.email == "org@example.com"))
+    concerts = [
+        Concert(title=f"Venue Concert {index}", location=location,
+                date=datetime.now(timezone.utc) + timedelta(days=20 + index),
+                price_type="free", current_status=ConcertStatus.UPCOMING,
+                organization_id=organization_id)
+        for index, location in enumerate(locations)
+    ]
+    db_session.add_all(concerts)
+    db_session.commit()
+    return [concert.id for concert in concerts]
+
+
+def test_link_venues_and_nearby(auth_client, db_session):
+    first, second, third = _add_concerts(
+        db_session, "КЗ им. П.И. Чайковского", "Концертный зал имени Чайковского", "Зарядье"
+    )
+    db_session.add(ConcertComposer(concert_id=third, composer_id=1))
+    db_session.commit()
+    assert link_venues(db_session) >= 3
+
+    venue_ids = dict(db_session.execute(
+        select(ConcertReadModel.id, ConcertReadModel.venue_id)
+        .where(ConcertReadModel.id.in_([first, second, third]))
+    ).all())
+    assert venue_ids[first] == venue_ids[second] != venue_ids[third]
+    assert link_venues(db_session) == 0
+
+    created = auth_client.post("/concerts/", json={
+        "title": "Venue Concert API",
+        "date": (datetime.now(timezone.utc) + timedelta(days=30)).isoformat(),
+        "price_type": "free",
+        "location": "кз Чайковского",
+    })
+    assert created.json()["venue_id"] == venue_ids[first]
+
+    for venue_id, (lat, lon) in ((venue_ids[first], TCHAIKOVSKY_HALL), (venue_ids[third], ZARYADYE)):
+        response = auth_client.patch(f"/venues/{venue_id}", json={"latitude": lat, "longitude": lon})
+        assert response.status_code == status.HTTP_200_OK
+
+    lat, lon = TCHAIKOVSKY_HALL
+    near = auth_client.get("/concerts/nearby", params={"lat": lat, "lon": lon, "radius": 1})
+    assert near.status_code == status.HTTP_200_OK
+    assert {item["id"] for item in near.json()} == {first, second, created.json()["id"]}
+    assert near.json()[0]["venue"]["id"] == venue_ids[first]
+
+    wide = auth_client.get("/concerts/nearby", params={"lat": lat, "lon": lon, "radius": 5})
+    assert wide.json()[-1]["id"] == third
+    assert 2 < wide.json()[-1]["distance_km"] < 4
+
+    filtered = auth_client.get("/concerts/nearby", params={
+        "lat": lat, "lon": lon, "radius": 5, "composer_names": ["Tchaikovsky"]
+    })
+    assert [item["id"] for item in filtered.json()] == [third]
+
+    auth_client.patch(f"/venues/{venue_ids[third]}", json={"latitude": None, "longitude": None})
+    assert db_session.scalar(select(venue_rtree.c.id).where(venue_rtree.c.id == venue_ids[third])) is None
+    assert db_session.scalar(select(Venue.latitude).where(Venue.id == venue_ids[third])) is None
+
+
+def test_nearby_validates_radius(client):
+    response = client.get("/concerts/nearby", params={"lat": 55.75, "lon": 37.62, "radius": 500})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_upgrade_schema_adds_venue_columns(tmp_path):
+    from sqlalchemy import create_engine, text
+    from app.database import _upgrade_schema
+
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as connection:
+        for table in ("concerts", "concerts_archive", "concert_read_model"):
+            connection.execute(text(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY)"))
+        _upgrade_schema(connection)
+        _upgrade_schema(connection)
+        columns = {row[1] for row in connection.execute(text("PRAGMA table_info(concerts)"))}
+        indexes = {row[1] for row in connection.execute(text("PRAGMA index_list(concerts)"))}
+    assert "venue_id" in columns
+    assert "ix_concerts_venue_id" in indexes